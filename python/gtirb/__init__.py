@@ -2,10 +2,17 @@ __all__ = [
     "AuxData",
     "AuxDataContainer",
     "Block",
+    "CallGraph",
+    "CFG",
+    "CFGAnalysis",
     "DataObject",
     "Edge",
     "ImageByteMap",
+    "ImageByteMapReader",
+    "ImageByteMapSnapshot",
+    "ImageByteMapStatistics",
     "IR",
+    "LinkedCFG",
     "Module",
     "Node",
     "Offset",
@@ -20,10 +27,16 @@ __all__ = [
 
 from .auxdata import AuxData, AuxDataContainer
 from .block import Block, ProxyBlock
+from .cfganalysis import CallGraph, CFGAnalysis
 from .dataobject import DataObject
-from .imagebytemap import ImageByteMap
-from .ir import IR
-from .module import Module, Edge
+from .imagebytemap import (
+    ImageByteMap,
+    ImageByteMapReader,
+    ImageByteMapSnapshot,
+    ImageByteMapStatistics,
+)
+from .ir import IR, LinkedCFG
+from .module import CFG, Module, Edge
 from .node import Node
 from .offset import Offset
 from .section import Section
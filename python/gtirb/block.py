@@ -4,6 +4,7 @@ import typing
 from uuid import UUID
 
 from .node import Node
+from .util import ObservedAttribute
 
 
 class Block(Node):
@@ -16,6 +17,9 @@ class Block(Node):
         (e.g. differentiating blocks written in ARM and Thumb).
     """
 
+    address = ObservedAttribute("address")
+    size = ObservedAttribute("size")
+
     def __init__(
         self,
         address,  # type: int
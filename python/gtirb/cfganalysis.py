@@ -0,0 +1,1034 @@
+from array import array
+import random
+import typing
+from uuid import UUID
+
+from .block import Block, ProxyBlock
+
+CfgNode = typing.Union[Block, ProxyBlock]
+Callee = typing.Union[UUID, ProxyBlock]
+"""A type hint for the callees in a :class:`gtirb.CallGraph`."""
+_Numbers = typing.List[int]
+
+
+class _CompactGraph:
+    """A directed graph whose nodes are numbered from zero, with the
+    successors of each node stored in compressed sparse row form: the
+    successors of node ``i`` are ``targets[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, offsets, targets):
+        # type: (array, array) -> None
+        self.offsets = offsets  # type: array
+        self.targets = targets  # type: array
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.offsets) - 1
+
+    @classmethod
+    def build(cls, successors):
+        # type: (typing.Iterable[typing.Iterable[int]]) -> _CompactGraph
+        """Build a graph from the successors of each node, in order."""
+
+        offsets = array("l", [0])
+        targets = array("l")
+        for node_successors in successors:
+            targets.extend(node_successors)
+            offsets.append(len(targets))
+        return cls(offsets, targets)
+
+    def postorder(self, roots):
+        # type: (typing.Iterable[int]) -> typing.List[int]
+        """Get the nodes reachable from the roots in depth-first postorder."""
+
+        offsets, targets = self.offsets, self.targets
+        visited = bytearray(len(self))
+        order = []
+        for root in roots:
+            if visited[root]:
+                continue
+            visited[root] = 1
+            stack = [(root, offsets[root])]
+            while stack:
+                node, index = stack[-1]
+                end = offsets[node + 1]
+                while index < end:
+                    target = targets[index]
+                    index += 1
+                    if not visited[target]:
+                        visited[target] = 1
+                        stack[-1] = (node, index)
+                        stack.append((target, offsets[target]))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        return order
+
+    def reversed(self):
+        # type: () -> _CompactGraph
+        """Get the graph with the direction of every edge reversed."""
+
+        offsets, targets = self.offsets, self.targets
+        starts = [0] * (len(offsets))
+        for target in targets:
+            starts[target + 1] += 1
+        for node in range(1, len(starts)):
+            starts[node] += starts[node - 1]
+        sources = array("l", bytes(targets.itemsize * len(targets)))
+        positions = starts[:-1]
+        for node in range(len(self)):
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                sources[positions[target]] = node
+                positions[target] += 1
+        return _CompactGraph(array("l", starts), sources)
+
+
+def _immediate_dominators(graph, predecessors, roots):
+    # type: (_CompactGraph, _CompactGraph, _Numbers) -> _Numbers
+    """Find the immediate dominator of each node of a graph, using the
+    iterative algorithm of Cooper, Harvey and Kennedy.
+
+    The roots are treated as the successors of a virtual root, numbered
+    ``len(graph)``, which is its own immediate dominator and that of each
+    root. Nodes unreachable from the roots are given -1.
+    """
+
+    root = len(graph)
+    order = graph.postorder(roots)
+    position = [-1] * (root + 1)
+    for index, node in enumerate(order):
+        position[node] = index
+    position[root] = len(order)
+    idom = [-1] * (root + 1)
+    idom[root] = root
+    is_root = bytearray(root + 1)
+    for node in roots:
+        is_root[node] = 1
+
+    offsets, sources = predecessors.offsets, predecessors.targets
+    changed = True
+    while changed:
+        changed = False
+        for node in reversed(order):
+            new = root if is_root[node] else -1
+            for other in sources[offsets[node] : offsets[node + 1]]:
+                if idom[other] == -1:
+                    continue
+                if new == -1:
+                    new = other
+                    continue
+                # Walk both up the tree to their nearest common ancestor
+                while other != new:
+                    while position[other] < position[new]:
+                        other = idom[other]
+                    while position[new] < position[other]:
+                        new = idom[new]
+            if idom[node] != new:
+                idom[node] = new
+                changed = True
+    return idom
+
+
+def _number_tree(parents):
+    # type: (_Numbers) -> typing.Tuple[_Numbers, _Numbers]
+    """Number the nodes of a tree, given the parent of each node, in
+    preorder. The root is the last node, and is its own parent; nodes
+    outside the tree have the parent -1 and are numbered -1.
+
+    :returns: The number of each node, and the highest number among its
+        descendants.
+    """
+
+    root = len(parents) - 1
+    children = [[] for _ in parents]  # type: typing.List[typing.List[int]]
+    for node in range(root):
+        if parents[node] != -1:
+            children[parents[node]].append(node)
+    number = [-1] * len(parents)
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        number[node] = len(order)
+        order.append(node)
+        stack.extend(children[node])
+    last = list(number)
+    for node in reversed(order):
+        if node != root and last[node] > last[parents[node]]:
+            last[parents[node]] = last[node]
+    return number, last
+
+
+def _strongly_connected_components(graph):
+    # type: (_CompactGraph) -> typing.Tuple[_Numbers, int]
+    """Find the strongly connected components of a graph, using an
+    iterative form of Tarjan's algorithm.
+
+    :returns: The component of each node, with components numbered in a
+        topological order of the graph they condense to, and the number of
+        components.
+    """
+
+    offsets, targets = graph.offsets, graph.targets
+    count = len(graph)
+    index = [-1] * count
+    low = [0] * count
+    on_stack = bytearray(count)
+    stack = []  # type: typing.List[int]
+    # Tarjan's algorithm completes components in reverse topological order
+    completed = [-1] * count
+    components = 0
+    next_index = 0
+    for start in range(count):
+        if index[start] != -1:
+            continue
+        index[start] = low[start] = next_index
+        next_index += 1
+        stack.append(start)
+        on_stack[start] = 1
+        work = [(start, offsets[start])]
+        while work:
+            node, position = work[-1]
+            end = offsets[node + 1]
+            while position < end:
+                target = targets[position]
+                position += 1
+                if index[target] == -1:
+                    work[-1] = (node, position)
+                    index[target] = low[target] = next_index
+                    next_index += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append((target, offsets[target]))
+                    break
+                if on_stack[target] and index[target] < low[node]:
+                    low[node] = index[target]
+            else:
+                work.pop()
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        completed[member] = components
+                        if member == node:
+                            break
+                    components += 1
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+    return [components - 1 - c for c in completed], components
+
+
+class _ReachabilityIndex:
+    """Labels the nodes of a directed acyclic graph, in which every edge
+    goes from a node to a higher numbered node and the successors of each
+    node are in ascending order, so that most questions of whether one
+    node reaches another are answered by comparing labels. This is the
+    GRAIL method of Yildirim, Chaoji and Zaki.
+
+    Each labelling numbers the nodes in the postorder of a depth-first
+    search taking successors in its own order, and labels each node with
+    the interval from the lowest number among the nodes it reaches to its
+    own number. A node can only reach nodes whose intervals are within
+    its own in every labelling. Each node also reaches its descendants in
+    the tree of the first labelling's search. Other questions are
+    answered by a search which skips nodes whose labels rule them out.
+    """
+
+    def __init__(self, graph, labellings):
+        # type: (_CompactGraph, int) -> None
+        """
+        :param graph: The graph.
+        :param labellings: The number of labellings, each of which takes
+            two numbers per node.
+        """
+
+        self._graph = graph
+        count = len(graph)
+        offsets, targets = graph.offsets, graph.targets
+        # The lowest number in the first labelling of each node's
+        # descendants in the search tree
+        self._first = array("l", [0]) * count
+        self._labels = []  # type: typing.List[typing.Tuple[array, array]]
+        shuffle = random.Random(0).shuffle
+        for labelling in range(labellings):
+            order = targets
+            if labelling:
+                order = array("l", targets)
+                for node in range(count):
+                    start, stop = offsets[node], offsets[node + 1]
+                    if stop - start > 1:
+                        successors = order[start:stop].tolist()
+                        shuffle(successors)
+                        order[start:stop] = array("l", successors)
+
+            number = array("l", [0]) * count
+            visited = bytearray(count)
+            numbered = 0
+            starts = range(count) if labelling % 2 == 0 else range(count)[::-1]
+            for start in starts:
+                if visited[start]:
+                    continue
+                visited[start] = 1
+                if labelling == 0:
+                    self._first[start] = numbered
+                stack = [(start, offsets[start])]
+                while stack:
+                    node, index = stack[-1]
+                    stop = offsets[node + 1]
+                    while index < stop:
+                        successor = order[index]
+                        index += 1
+                        if not visited[successor]:
+                            visited[successor] = 1
+                            if labelling == 0:
+                                self._first[successor] = numbered
+                            stack[-1] = (node, index)
+                            stack.append((successor, offsets[successor]))
+                            break
+                    else:
+                        stack.pop()
+                        number[node] = numbered
+                        numbered += 1
+
+            # Nodes only reach higher numbered nodes, so the lowest number
+            # each reaches can be found in descending order
+            lowest = array("l", number)
+            for node in range(count - 1, -1, -1):
+                low = lowest[node]
+                for successor in targets[offsets[node] : offsets[node + 1]]:
+                    if lowest[successor] < low:
+                        low = lowest[successor]
+                lowest[node] = low
+            self._labels.append((lowest, number))
+
+    def _may_reach(self, source, target):
+        # type: (int, int) -> bool
+        for lowest, number in self._labels:
+            if not (
+                lowest[source] <= lowest[target]
+                and number[target] <= number[source]
+            ):
+                return False
+        return True
+
+    def _tree_reaches(self, source, target):
+        # type: (int, int) -> bool
+        number = self._labels[0][1]
+        return self._first[source] <= number[target] <= number[source]
+
+    def reaches(self, source, target):
+        # type: (int, int) -> bool
+        """Check whether there is a path from one node to another."""
+
+        if source >= target:
+            return source == target
+        if self._tree_reaches(source, target):
+            return True
+        if not self._may_reach(source, target):
+            return False
+        offsets, targets = self._graph.offsets, self._graph.targets
+        visited = {source}
+        work = [source]
+        while work:
+            node = work.pop()
+            for successor in targets[offsets[node] : offsets[node + 1]]:
+                if successor > target:
+                    break
+                if self._tree_reaches(successor, target):
+                    return True
+                if successor not in visited and self._may_reach(
+                    successor, target
+                ):
+                    visited.add(successor)
+                    work.append(successor)
+        return False
+
+
+class CFGAnalysis:
+    """Analyses of a control flow graph: its dominator and post-dominator
+    trees, its strongly connected components, and its natural loops.
+    Get one from :meth:`gtirb.Module.cfg_analysis`.
+
+    The nodes are numbered and their edges stored in compact arrays when
+    the ``CFGAnalysis`` is created. Each analysis is computed from those
+    arrays on first use, and then kept. The ``CFGAnalysis`` is not
+    updated when the graph changes.
+
+    :ivar nodes: The nodes of the graph, in the order given.
+    :ivar entries: The roots of the dominator tree: the given entries,
+        and the first node of each strongly connected component without
+        edges from other components that holds none of them. These include
+        every node without predecessors, and every node is reachable from
+        some entry.
+    :ivar exits: The roots of the post-dominator tree: the first node of
+        each strongly connected component without edges to other
+        components, including every node without successors.
+    """
+
+    class Loop:
+        """A natural loop in a control flow graph.
+
+        :ivar header: The node every path into the loop passes through.
+        :ivar nodes: The nodes of the loop, including its header: those
+            dominated by the header from which the header can be reached.
+        :ivar parent: The innermost loop containing this loop, or None.
+        :ivar children: The loops this loop is the parent of.
+        """
+
+        def __init__(
+            self,
+            header,  # type: CfgNode
+            nodes,  # type: typing.FrozenSet[CfgNode]
+            parent,  # type: typing.Optional[CFGAnalysis.Loop]
+        ):
+            # type: (...) -> None
+            self.header = header  # type: CfgNode
+            self.nodes = nodes  # type: typing.FrozenSet[CfgNode]
+            self.parent = parent  # type: typing.Optional[CFGAnalysis.Loop]
+            self.children = []  # type: typing.List[CFGAnalysis.Loop]
+
+        @property
+        def depth(self):
+            # type: () -> int
+            """The number of loops containing this loop, including itself."""
+
+            depth = 1
+            loop = self.parent
+            while loop is not None:
+                depth += 1
+                loop = loop.parent
+            return depth
+
+        def __repr__(self):
+            # type: () -> str
+            return "CFGAnalysis.Loop(header={!r}, nodes=<{} nodes>)".format(
+                self.header, len(self.nodes)
+            )
+
+    def __init__(
+        self,
+        nodes,  # type: typing.Iterable[CfgNode]
+        successors,  # type: typing.Callable
+        entries=(),  # type: typing.Iterable[CfgNode]
+    ):
+        # type: (...) -> None
+        """
+        :param nodes: The nodes of the graph. Their order is kept in
+            :attr:`nodes`, and decides the first node of each component.
+        :param successors: A function giving the successors of a node.
+            Successors which are not nodes of the graph are ignored.
+        :param entries: The nodes to root the dominator tree at, in
+            addition to the nodes without predecessors.
+        """
+
+        self.nodes = list(nodes)  # type: typing.List[CfgNode]
+        self._numbers = {
+            node: number for number, node in enumerate(self.nodes)
+        }  # type: typing.Dict[CfgNode, int]
+        numbers = self._numbers
+        self._graph = _CompactGraph.build(
+            [numbers[s] for s in successors(node) if s in numbers]
+            for node in self.nodes
+        )
+        self._predecessors = self._graph.reversed()
+
+        self._dominator_tree = (
+            None
+        )  # type: typing.Optional[typing.Tuple[_Numbers, ...]]
+        self._post_dominator_tree = (
+            None
+        )  # type: typing.Optional[typing.Tuple[_Numbers, ...]]
+        self._component_numbers = (
+            None
+        )  # type: typing.Optional[typing.Tuple[_Numbers, int]]
+        self._components = (
+            None
+        )  # type: typing.Optional[typing.List[typing.List[CfgNode]]]
+        self._condensation = None  # type: typing.Optional[_CompactGraph]
+
+        seen = set()  # type: typing.Set[int]
+        roots = [
+            numbers[node]
+            for node in entries
+            if node in numbers and not (node in seen or seen.add(node))
+        ]
+        condensed = self._condensed()
+        self._entries = self._roots(roots, condensed.reversed())
+        self._exits = self._roots([], condensed)
+        self.entries = [
+            self.nodes[number] for number in self._entries
+        ]  # type: typing.List[CfgNode]
+        self.exits = [
+            self.nodes[number] for number in self._exits
+        ]  # type: typing.List[CfgNode]
+
+        self._reachability = None  # type: typing.Optional[_ReachabilityIndex]
+        self._loops = (
+            None
+        )  # type: typing.Optional[typing.List[CFGAnalysis.Loop]]
+        self._innermost_loops = (
+            dict()
+        )  # type: typing.Dict[CfgNode, CFGAnalysis.Loop]
+
+    def __contains__(self, node):
+        # type: (typing.Any) -> bool
+        return node in self._numbers
+
+    def _component_range(self, source, target):
+        # type: (CfgNode, CfgNode) -> typing.Tuple[int, int]
+        """Get the indexes in :attr:`components` of two nodes' components."""
+
+        numbers = self._components_by_node()[0]
+        return (
+            numbers[self._numbers[source]],
+            numbers[self._numbers[target]],
+        )
+
+    def _components_by_node(self):
+        # type: () -> typing.Tuple[_Numbers, int]
+        """Get the index in :attr:`components` of the component of each
+        node, in the order of :attr:`nodes`, and the number of components.
+        """
+
+        if self._component_numbers is None:
+            self._component_numbers = _strongly_connected_components(
+                self._graph
+            )
+        return self._component_numbers
+
+    def _condensed(self):
+        # type: () -> _CompactGraph
+        """Get the graph of the components, in which there is an edge
+        from one component to another if there is an edge from any node of
+        one to any node of the other. Successors are in ascending order.
+        """
+
+        if self._condensation is None:
+            numbers, count = self._components_by_node()
+            members = [
+                [] for _ in range(count)
+            ]  # type: typing.List[typing.List[int]]
+            for node, component in enumerate(numbers):
+                members[component].append(node)
+            offsets, targets = self._graph.offsets, self._graph.targets
+
+            def successors(component):
+                # type: (int) -> typing.List[int]
+                found = set()
+                for node in members[component]:
+                    for target in targets[offsets[node] : offsets[node + 1]]:
+                        found.add(numbers[target])
+                found.discard(component)
+                return sorted(found)
+
+            self._condensation = _CompactGraph.build(
+                successors(component) for component in range(count)
+            )
+        return self._condensation
+
+    def _dominators(self, post):
+        # type: (bool) -> typing.Tuple[_Numbers, ...]
+        """Get the immediate dominator or post-dominator of each node,
+        followed by the preorder numbering of the tree they form.
+        """
+
+        if post:
+            if self._post_dominator_tree is None:
+                idom = _immediate_dominators(
+                    self._predecessors, self._graph, self._exits
+                )
+                self._post_dominator_tree = (idom,) + _number_tree(idom)
+            return self._post_dominator_tree
+        if self._dominator_tree is None:
+            idom = _immediate_dominators(
+                self._graph, self._predecessors, self._entries
+            )
+            self._dominator_tree = (idom,) + _number_tree(idom)
+        return self._dominator_tree
+
+    def _find_loops(self):
+        # type: () -> None
+        """Find the natural loops, and the innermost loop of each node."""
+
+        idom, number, last = self._dominators(False)
+        offsets, sources = (
+            self._predecessors.offsets,
+            self._predecessors.targets,
+        )
+        # The header whose loop each node was last found in
+        marks = [-1] * len(self.nodes)
+        bodies = []
+        for header in range(len(self.nodes)):
+            if idom[header] == -1:
+                continue
+            # The sources of back edges, the edges to a node from a node it
+            # dominates, are the latches of the header's loop
+            work = [
+                source
+                for source in sources[offsets[header] : offsets[header + 1]]
+                if idom[source] != -1
+                and number[header] <= number[source] <= last[header]
+            ]
+            if not work:
+                continue
+            marks[header] = header
+            body = [header]
+            for source in work:
+                marks[source] = header
+            while work:
+                node = work.pop()
+                if node == header:
+                    continue
+                body.append(node)
+                for index in range(offsets[node], offsets[node + 1]):
+                    source = sources[index]
+                    if marks[source] != header and idom[source] != -1:
+                        marks[source] = header
+                        work.append(source)
+            bodies.append(body)
+
+        # Loops are nested or disjoint, and contain more nodes than the
+        # loops nested in them, so the innermost loop containing a header
+        # when larger loops have been placed is its loop's parent.
+        bodies.sort(key=len, reverse=True)
+        innermost = [None] * len(self.nodes)  # type: typing.List[typing.Any]
+        loops = []
+        for body in bodies:
+            parent = innermost[body[0]]
+            loop = CFGAnalysis.Loop(
+                self.nodes[body[0]],
+                frozenset(self.nodes[node] for node in body),
+                parent,
+            )
+            if parent is not None:
+                parent.children.append(loop)
+            for node in body:
+                innermost[node] = loop
+            loops.append(loop)
+        self._innermost_loops = {
+            self.nodes[node]: loop
+            for node, loop in enumerate(innermost)
+            if loop is not None
+        }
+        self._loops = loops
+
+    def _immediate(self, post):
+        # type: (bool) -> typing.Dict[CfgNode, typing.Optional[CfgNode]]
+        idom = self._dominators(post)[0]
+        root = len(self.nodes)
+        return {
+            node: (None if idom[number] == root else self.nodes[idom[number]])
+            for number, node in enumerate(self.nodes)
+            if idom[number] != -1
+        }
+
+    def _roots(self, roots, condensed):
+        # type: (_Numbers, _CompactGraph) -> _Numbers
+        """Add to some roots the first node of each component without
+        successors in a condensed graph that holds none of the roots.
+        """
+
+        numbers, count = self._components_by_node()
+        offsets = condensed.offsets
+        covered = bytearray(count)
+        for root in roots:
+            covered[numbers[root]] = 1
+        roots = list(roots)
+        for node, component in enumerate(numbers):
+            if (
+                not covered[component]
+                and offsets[component] == offsets[component + 1]
+            ):
+                covered[component] = 1
+                roots.append(node)
+        return roots
+
+    def _tree_contains(self, post, ancestor, descendant):
+        # type: (bool, CfgNode, CfgNode) -> bool
+        a = self._numbers.get(ancestor)
+        d = self._numbers.get(descendant)
+        if a is None or d is None:
+            return False
+        idom, number, last = self._dominators(post)
+        if idom[a] == -1 or idom[d] == -1:
+            return False
+        return number[a] <= number[d] <= last[a]
+
+    @property
+    def components(self):
+        # type: () -> typing.List[typing.List[CfgNode]]
+        """The strongly connected components of the graph, in a
+        topological order: for every edge between two components, the
+        source's component comes first.
+        """
+
+        if self._components is None:
+            numbers, count = self._components_by_node()
+            components = [
+                [] for _ in range(count)
+            ]  # type: typing.List[typing.List[CfgNode]]
+            for node, component in zip(self.nodes, numbers):
+                components[component].append(node)
+            self._components = components
+        return self._components
+
+    def component_of(self, node):
+        # type: (CfgNode) -> int
+        """Get the index in :attr:`components` of a node's component.
+
+        :raises KeyError: if the node is not in the graph.
+        """
+
+        return self._components_by_node()[0][self._numbers[node]]
+
+    def count_paths(self, source, target):
+        # type: (CfgNode, CfgNode) -> int
+        """Count the paths from one node to another, counting paths which
+        differ only in how they pass through cycles once. That is, count
+        the distinct sequences of :attr:`components` that paths from the
+        source to the target pass through.
+
+        The count is found by dynamic programming over the components in
+        topological order, in time proportional to the number of components
+        between the source's and the target's, and the edges between them.
+
+        :returns: 1 if the nodes are in the same component, or 0 if the
+            target cannot be reached from the source.
+        :raises KeyError: if either node is not in the graph.
+        """
+
+        first, last = self._component_range(source, target)
+        if first > last:
+            return 0
+        condensed = self._condensed()
+        offsets, targets = condensed.offsets, condensed.targets
+        counts = [0] * (last - first + 1)
+        counts[0] = 1
+        for component in range(first, last):
+            paths = counts[component - first]
+            if not paths:
+                continue
+            for successor in targets[
+                offsets[component] : offsets[component + 1]
+            ]:
+                if successor > last:
+                    break
+                counts[successor - first] += paths
+        return counts[-1]
+
+    def dominates(self, dominator, node):
+        # type: (CfgNode, CfgNode) -> bool
+        """Check whether every path from the entries to a node passes
+        through another node. Each node dominates itself.
+
+        :param dominator: The node which may dominate ``node``.
+        :param node: The node which may be dominated.
+        :returns: False if either node is not reachable from the entries.
+        """
+
+        return self._tree_contains(False, dominator, node)
+
+    @property
+    def immediate_dominators(self):
+        # type: () -> typing.Dict[CfgNode, typing.Optional[CfgNode]]
+        """A ``dict`` mapping each node reachable from the entries to its
+        immediate dominator, or to None if no other node dominates it, as
+        for the entries.
+        """
+
+        return self._immediate(False)
+
+    @property
+    def immediate_post_dominators(self):
+        # type: () -> typing.Dict[CfgNode, typing.Optional[CfgNode]]
+        """A ``dict`` mapping each node from which an exit is reachable to
+        its immediate post-dominator, or to None if no other node
+        post-dominates it, as for the exits.
+        """
+
+        return self._immediate(True)
+
+    def index_reachability(self, labellings=None):
+        # type: (typing.Optional[int]) -> None
+        """Build an index making :meth:`reaches` faster, unless one has
+        been built already with the given number of labellings.
+
+        Each labelling gives every component two numbers, bounding the
+        memory taken to ``16 * labellings`` bytes per component, and is
+        built in time proportional to the size of the graph. Most checks
+        then take constant time, by comparing the labels of the two
+        components; the rest search the graph, skipping components whose
+        labels show they cannot reach the target. More labellings rule out
+        more components.
+
+        :param labellings: The number of labellings, or None to keep an
+            existing index or else to use two labellings.
+        :raises ValueError: if ``labellings`` is less than one.
+        """
+
+        index = self._reachability
+        if labellings is None:
+            if index is not None:
+                return
+            labellings = 2
+        if labellings < 1:
+            raise ValueError("at least one labelling is required")
+        if index is None or len(index._labels) != labellings:
+            self._reachability = _ReachabilityIndex(
+                self._condensed(), labellings
+            )
+
+    def loop_of(self, node):
+        # type: (CfgNode) -> typing.Optional[CFGAnalysis.Loop]
+        """Get the innermost loop containing a node, or None."""
+
+        if self._loops is None:
+            self._find_loops()
+        return self._innermost_loops.get(node)
+
+    @property
+    def loops(self):
+        # type: () -> typing.List[CFGAnalysis.Loop]
+        """The natural loops of the graph, with each loop before the loops
+        it contains. Loops sharing a header are merged. Cycles entered at
+        more than one node are not natural loops; they can be found among
+        the :attr:`components`.
+        """
+
+        if self._loops is None:
+            self._find_loops()
+        assert self._loops is not None
+        return self._loops
+
+    def paths(
+        self,
+        source,  # type: CfgNode
+        target,  # type: CfgNode
+        limit=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> typing.Iterator[typing.List[CfgNode]]
+        """Iterate over the paths from one node to another which visit no
+        node twice, as lists of nodes from the source to the target.
+
+        Paths are found by a depth-first search as they are requested,
+        which never visits nodes the target cannot be reached from. There
+        may be exponentially many paths, so consider setting a limit, or
+        counting them first with :meth:`count_paths`.
+
+        :param source: The node the paths start at.
+        :param target: The node the paths end at.
+        :param limit: The most paths to produce, or None for no limit.
+        :raises KeyError: if either node is not in the graph.
+        """
+
+        start = self._numbers[source]
+        end = self._numbers[target]
+        if limit is not None and limit <= 0:
+            return
+        if start == end:
+            yield [source]
+            return
+
+        # Mark the nodes the target can be reached from
+        offsets, sources = (
+            self._predecessors.offsets,
+            self._predecessors.targets,
+        )
+        useful = bytearray(len(self.nodes))
+        useful[end] = 1
+        work = [end]
+        while work:
+            node = work.pop()
+            for other in sources[offsets[node] : offsets[node + 1]]:
+                if not useful[other]:
+                    useful[other] = 1
+                    work.append(other)
+        if not useful[start]:
+            return
+
+        offsets, targets = self._graph.offsets, self._graph.targets
+        found = 0
+        # The path so far, and the position in the successors of each of
+        # its nodes to continue the search from
+        path = [start]
+        positions = [offsets[start]]
+        useful[start] = 0
+        while path:
+            node = path[-1]
+            position = positions[-1]
+            stop = offsets[node + 1]
+            while position < stop:
+                other = targets[position]
+                position += 1
+                if other == end:
+                    yield [self.nodes[n] for n in path] + [target]
+                    found += 1
+                    if found == limit:
+                        return
+                elif useful[other]:
+                    positions[-1] = position
+                    path.append(other)
+                    positions.append(offsets[other])
+                    # Nodes on the path may not be visited again
+                    useful[other] = 0
+                    break
+            else:
+                useful[path.pop()] = 1
+                positions.pop()
+
+    def post_dominates(self, post_dominator, node):
+        # type: (CfgNode, CfgNode) -> bool
+        """Check whether every path from a node to the exits passes through
+        another node. Each node post-dominates itself.
+
+        :param post_dominator: The node which may post-dominate ``node``.
+        :param node: The node which may be post-dominated.
+        :returns: False if no exit is reachable from either node.
+        """
+
+        return self._tree_contains(True, post_dominator, node)
+
+    def reaches(self, source, target):
+        # type: (CfgNode, CfgNode) -> bool
+        """Check whether there is a path from one node to another. Each
+        node reaches itself.
+
+        The components between the source's and the target's, in the
+        topological order of :attr:`components`, are searched iteratively,
+        unless an index has been built by :meth:`index_reachability`.
+
+        :raises KeyError: if either node is not in the graph.
+        """
+
+        first, last = self._component_range(source, target)
+        if self._reachability is not None:
+            return self._reachability.reaches(first, last)
+        if first >= last:
+            return first == last
+        condensed = self._condensed()
+        offsets, targets = condensed.offsets, condensed.targets
+        visited = bytearray(last - first)
+        work = [first]
+        while work:
+            component = work.pop()
+            for successor in targets[
+                offsets[component] : offsets[component + 1]
+            ]:
+                if successor >= last:
+                    if successor == last:
+                        return True
+                    break
+                if not visited[successor - first]:
+                    visited[successor - first] = 1
+                    work.append(successor)
+        return False
+
+
+class CallGraph:
+    """The calls between the functions of a module, derived from the
+    :class:`gtirb.Edge`\\s of type ``Call`` in its CFG. Get one from
+    :meth:`gtirb.Module.call_graph`.
+
+    Functions are identified by their UUIDs in the ``functionBlocks`` and
+    ``functionEntries`` aux data tables. A call is from the function
+    containing the block it is made from, to the function with the target
+    block among its entries or, failing that, its blocks. Calls to
+    :class:`gtirb.ProxyBlock`\\s, which stand for code outside the module,
+    are calls to the ``ProxyBlock``. Calls from or to blocks in no function
+    are left out.
+
+    :ivar functions: The UUIDs of the functions.
+    """
+
+    def __init__(
+        self,
+        calls,  # type: typing.Iterable[typing.Tuple[CfgNode, CfgNode]]
+        function_blocks,  # type: typing.Mapping[UUID, typing.Set[Block]]
+        function_entries,  # type: typing.Mapping[UUID, typing.Set[Block]]
+    ):
+        # type: (...) -> None
+        """
+        :param calls: The source and target of each call edge.
+        :param function_blocks: The ``functionBlocks`` table.
+        :param function_entries: The ``functionEntries`` table.
+        """
+
+        self.functions = set(function_blocks) | set(
+            function_entries
+        )  # type: typing.Set[UUID]
+        # The function of each block, and the function each block is an
+        # entry of, which is preferred as the function a call enters
+        self._functions = {
+            block: function
+            for function, blocks in function_blocks.items()
+            for block in blocks
+        }  # type: typing.Dict[CfgNode, UUID]
+        targets = dict(self._functions)
+        targets.update(
+            (block, function)
+            for function, blocks in function_entries.items()
+            for block in blocks
+        )
+
+        # For each caller and callee, the callees and callers it has calls
+        # to and from, each mapped to a list of the blocks making the calls.
+        # Both maps share the lists.
+        self._callees = (
+            dict()
+        )  # type: typing.Dict[UUID, typing.Dict[Callee, typing.List[Block]]]
+        self._callers = (
+            dict()
+        )  # type: typing.Dict[Callee, typing.Dict[UUID, typing.List[Block]]]
+        for source, target in calls:
+            caller = self._functions.get(source)
+            if caller is None:
+                continue
+            if isinstance(target, ProxyBlock):
+                callee = target  # type: Callee
+            else:
+                found = targets.get(target)
+                if found is None:
+                    continue
+                callee = found
+            callees = self._callees.setdefault(caller, dict())
+            sites = callees.get(callee)
+            if sites is None:
+                sites = callees[callee] = []
+                self._callers.setdefault(callee, dict())[caller] = sites
+            sites.append(source)
+
+    def call_sites(self, caller, callee):
+        # type: (UUID, Callee) -> typing.List[Block]
+        """Get the blocks from which one function calls another function
+        or a :class:`gtirb.ProxyBlock`.
+        """
+
+        return list(self._callees.get(caller, {}).get(callee, ()))
+
+    def callees(self, caller):
+        # type: (UUID) -> typing.Iterator[Callee]
+        """Iterate over the functions and :class:`gtirb.ProxyBlock`\\s a
+        function calls.
+        """
+
+        return iter(self._callees.get(caller, {}))
+
+    def callers(self, callee):
+        # type: (Callee) -> typing.Iterator[UUID]
+        """Iterate over the functions calling a function or a
+        :class:`gtirb.ProxyBlock`.
+        """
+
+        return iter(self._callers.get(callee, {}))
+
+    def function_of(self, block):
+        # type: (Block) -> typing.Optional[UUID]
+        """Get the UUID of the function containing a block, or None. A
+        block in more than one function gives one of them.
+        """
+
+        return self._functions.get(block)
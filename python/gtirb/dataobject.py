@@ -3,6 +3,7 @@ import typing
 from uuid import UUID
 
 from .node import Node
+from .util import ObservedAttribute
 
 
 class DataObject(Node):
@@ -14,6 +15,9 @@ class DataObject(Node):
     :ivar size: The size of the data object in bytes.
     """
 
+    address = ObservedAttribute("address")
+    size = ObservedAttribute("size")
+
     def __init__(self, address, size, uuid=None):
         # type: (int, int, typing.Optional[UUID]) -> None
         """
@@ -1,10 +1,445 @@
-from bisect import bisect_right, bisect_left, insort
+from bisect import bisect_right
+from enum import Enum
 import ByteMap_pb2
 import ImageByteMap_pb2
+import array
+import hashlib
+import io
+import re
+import string
+import struct
 import typing
 from uuid import UUID
+from weakref import WeakSet
 
 from .node import Node
+from .util import SortedList
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+Pattern = typing.Union[bytes, bytearray, str]
+"""A type hint for byte patterns searched for by
+:func:`gtirb.ImageByteMap.find_all`: either a literal byte sequence, or a
+string of hexadecimal byte values in which ``??`` matches any byte
+(for example, ``"48 8b ?? ?? 00"``).
+"""
+
+
+# Content hashes are kept for a tree of aligned blocks of addresses. The
+# leaves are chunks of _HASH_CHUNK_SIZE bytes, and each level of the tree
+# groups _HASH_FANOUT blocks of the level below, up to the whole 64-bit
+# address space.
+_HASH_CHUNK_SIZE = 4096
+_HASH_FANOUT = 64
+_HASH_BLOCK_SIZES = [
+    _HASH_CHUNK_SIZE * _HASH_FANOUT**level for level in range(10)
+]
+_HASH_PREFIX = struct.Struct("<QQ")
+
+
+def _new_hash():
+    # type: () -> typing.Any
+    return hashlib.blake2b(digest_size=32)
+
+
+def _require_numpy():
+    # type: () -> None
+    if numpy is None:
+        raise ImportError(
+            "numpy is required for array access to an ImageByteMap"
+        )
+
+
+# Bytes are counted into windows by ImageByteMap.statistics this many at a
+# time, bounding the size of the temporary arrays it needs.
+_STATISTICS_BATCH = 1 << 18
+
+_PRINTABLE = string.printable.encode()
+"""The bytes considered printable by :func:`ImageByteMap.statistics`."""
+
+
+_STRING_UNITS = {
+    "ascii": (rb"[\t\x20-\x7e]", 1),
+    "utf-16le": (rb"[\t\x20-\x7e]\x00", 2),
+}  # type: typing.Dict[str, typing.Tuple[bytes, int]]
+"""For each encoding supported by :func:`ImageByteMap.strings`, a regular
+expression matching one printable character and its size in bytes.
+"""
+
+
+def _entropy(counts):
+    # type: ("numpy.ndarray") -> "numpy.ndarray"
+    """Get the Shannon entropy, in bits per byte, of byte histograms
+    stored along the last axis of an array.
+    """
+
+    totals = counts.sum(axis=-1, keepdims=True)
+    p = counts / numpy.maximum(totals, 1)
+    logs = numpy.log2(p, out=numpy.zeros_like(p), where=p > 0)
+    # Adding zero turns the -0.0 of uniform histograms into 0.0
+    return -(p * logs).sum(axis=-1) + 0.0
+
+
+def _parse_pattern(pattern):
+    # type: (Pattern) -> typing.List[typing.Optional[int]]
+    """Parse a byte pattern into a list of byte values,
+    with None standing for a wildcard.
+    """
+
+    if isinstance(pattern, str):
+        digits = "".join(pattern.split())
+        if len(digits) % 2 != 0:
+            raise ValueError("odd number of digits in pattern %r" % pattern)
+        parsed = []  # type: typing.List[typing.Optional[int]]
+        for i in range(0, len(digits), 2):
+            pair = digits[i : i + 2]
+            if pair == "??":
+                parsed.append(None)
+                continue
+            try:
+                parsed.append(int(pair, 16))
+            except ValueError:
+                raise ValueError("bad byte %r in pattern %r" % (pair, pattern))
+    elif isinstance(pattern, (bytes, bytearray)):
+        parsed = list(pattern)
+    else:
+        raise TypeError("pattern must be bytes or str, not %r" % pattern)
+    if len(parsed) == 0:
+        raise ValueError("empty pattern")
+    return parsed
+
+
+def _token_regex(token):
+    # type: (typing.Optional[int]) -> bytes
+    return b"." if token is None else re.escape(bytes((token,)))
+
+
+def _longest_literal(tokens):
+    # type: (typing.List[typing.Optional[int]]) -> typing.Tuple[int, bytes]
+    """Find the longest run of literal bytes in a parsed pattern.
+
+    :returns: The offset of the run in the pattern and its bytes, which
+        are empty if the pattern consists only of wildcards.
+    """
+
+    best_start, best_stop = 0, 0
+    start = 0
+    for stop, token in enumerate(tokens + [None]):
+        if token is None:
+            if stop - start > best_stop - best_start:
+                best_start, best_stop = start, stop
+            start = stop + 1
+    return best_start, bytes(tokens[best_start:best_stop])
+
+
+# Regions at least two pages long are stored as a _PagedRegion once they
+# are written to, or compacted; see _compact.
+_PAGE_SIZE = 0x10000
+
+_fill_pages = dict()  # type: typing.Dict[int, bytes]
+
+
+def _fill(value, size):
+    # type: (int, int) -> typing.Union[bytes, memoryview]
+    """Get a page of ``size`` bytes filled with ``value``, sharing memory
+    with every other such page.
+    """
+
+    page = _fill_pages.get(value)
+    if page is None:
+        page = _fill_pages[value] = bytes((value,)) * _PAGE_SIZE
+    return page if size == _PAGE_SIZE else memoryview(page)[:size]
+
+
+def _fill_value(page):
+    # type: (typing.Any) -> typing.Optional[int]
+    """Get the value a page returned by :func:`_fill` is filled with,
+    or None if the page is not a fill page.
+    """
+
+    buffer = page.obj if isinstance(page, memoryview) else page
+    if (
+        type(buffer) is bytes
+        and len(buffer) == _PAGE_SIZE
+        and _fill_pages.get(buffer[0]) is buffer
+    ):
+        return buffer[0]
+    return None
+
+
+def _compact(region, release=False):
+    # type: (_Region, bool) -> _Region
+    """Store a region of at least two pages as a :class:`_PagedRegion`, in
+    which pages filled with a single repeated byte share memory.
+
+    Without ``release``, the other pages are views of ``region``, so that
+    nothing is copied, but its buffer lives as long as any of them does.
+    With ``release``, they are copied so that the buffer can be freed, and
+    regions without fill pages are returned unchanged. Smaller regions are
+    always returned unchanged.
+    """
+
+    if isinstance(region, _PagedRegion):
+        if release:
+            region.detach()
+        return region
+    if len(region) < 2 * _PAGE_SIZE:
+        return region
+    fills = dict()  # type: typing.Dict[int, int]
+    for start in range(0, len(region) - _PAGE_SIZE + 1, _PAGE_SIZE):
+        stop = start + _PAGE_SIZE
+        value = region[start]
+        if (
+            region[stop - 1] == value
+            and region.count(value, start, stop) == _PAGE_SIZE
+        ):
+            fills[start] = value
+    if release and not fills:
+        return region
+
+    view = memoryview(region)
+    pages = []  # type: typing.List[memoryview]
+    for start in range(0, len(region), _PAGE_SIZE):
+        if start in fills:
+            page = memoryview(_fill(fills[start], _PAGE_SIZE))
+        else:
+            page = view[start : start + _PAGE_SIZE]
+            if release:
+                page = memoryview(bytes(page))
+        pages.append(page)
+    return _PagedRegion(pages)
+
+
+def _region_views(region, start, stop):
+    # type: (_Region, int, int) -> typing.List[memoryview]
+    """Get views of the bytes in ``range(start, stop)`` of a region.
+    If the region is a :class:`_PagedRegion`, there is one view per page.
+    """
+
+    if isinstance(region, _PagedRegion):
+        return region.views(start, stop)
+    return [memoryview(region)[start:stop]]
+
+
+class _PagedRegion:
+    """The contents of a region of an :class:`ImageByteMap`, stored as a
+    list of pages of ``_PAGE_SIZE`` bytes (except the last, which may be
+    shorter), so that pages filled with a single repeated byte can be
+    shared with each other. This keeps large runs of zeros, as found in
+    ``.bss`` sections and padding, from taking space.
+
+    Supports the operations of ``bytearray`` that :class:`ImageByteMap`
+    uses to modify regions. Pages are copied into a ``bytearray`` the
+    first time they are modified; pages which are ``bytes`` or read-only
+    views of ``bytes`` are never modified in place.
+    """
+
+    __slots__ = ("_length", "_pages")
+
+    def __init__(self, views=()):
+        # type: (typing.Iterable[memoryview]) -> None
+        """
+        :param views: Views of the initial contents. Views of fill pages
+            are stored as fill pages and views of ``bytes`` are shared;
+            other contents are copied.
+        """
+
+        self._length = 0  # type: int
+        self._pages = []  # type: typing.List[typing.Any]
+        self.extend(views)
+
+    def __bytes__(self):
+        # type: () -> bytes
+        return b"".join(self._pages)
+
+    def __delitem__(self, key):
+        # type: (slice) -> None
+        start = 0 if key.start is None else key.start
+        if key.stop is not None and key.stop < self._length:
+            # Views of modified pages are copied, as those pages cannot be
+            # truncated while they are viewed
+            rest = self.views(key.stop, self._length)
+            for index, view in enumerate(rest):
+                if not isinstance(view.obj, bytes):
+                    rest[index] = memoryview(bytes(view))
+            del self[start:]
+            self.extend(rest)
+            return
+        if start >= self._length:
+            return
+        index, offset = divmod(start, _PAGE_SIZE)
+        pages = self._pages
+        del pages[index + 1 :]
+        if offset == 0:
+            del pages[index]
+        else:
+            page = pages[index]
+            value = _fill_value(page)
+            if value is not None:
+                pages[index] = _fill(value, offset)
+            elif isinstance(page, bytearray):
+                del page[offset:]
+            else:
+                pages[index] = memoryview(page)[:offset]
+        self._length = start
+
+    def __eq__(self, other):
+        # type: (typing.Any) -> bool
+        if not isinstance(other, (bytes, bytearray, _PagedRegion)):
+            return NotImplemented
+        if len(other) != self._length:
+            return False
+        offset = 0
+        for page in self._pages:
+            size = len(page)
+            theirs = b"".join(_region_views(other, offset, offset + size))
+            if bytes(page) != theirs:
+                return False
+            offset += size
+        return True
+
+    __hash__ = None  # type: ignore
+
+    @typing.overload
+    def __getitem__(self, key):
+        # type: (int) -> int
+        pass
+
+    @typing.overload
+    def __getitem__(self, key):
+        # type: (slice) -> _PagedRegion
+        pass
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            if key < 0:
+                key += self._length
+            return self._pages[key // _PAGE_SIZE][key % _PAGE_SIZE]
+        start, stop, _ = key.indices(self._length)
+        return _PagedRegion(self.views(start, stop))
+
+    def __iadd__(self, data):
+        # type: (_Region) -> _PagedRegion
+        self.extend(_region_views(data, 0, len(data)))
+        return self
+
+    def __iter__(self):
+        # type: () -> typing.Iterator[int]
+        for page in self._pages:
+            yield from page
+
+    def __len__(self):
+        # type: () -> int
+        return self._length
+
+    def __setitem__(self, key, value):
+        # type: (typing.Union[int, slice], typing.Any) -> None
+        if isinstance(key, int):
+            page = self._mutable_page(key // _PAGE_SIZE)
+            page[key % _PAGE_SIZE] = value
+            return
+
+        # Overwrite the bytes up to the end of the region, then append
+        # the rest, as with bytearray.
+        data = memoryview(value).cast("B")
+        start = key.start
+        stop = min(start + len(data), self._length)
+        position = 0
+        while start < stop:
+            index, offset = divmod(start, _PAGE_SIZE)
+            size = min(_PAGE_SIZE - offset, stop - start)
+            page = self._mutable_page(index)
+            page[offset : offset + size] = data[position : position + size]
+            start += size
+            position += size
+        if position < len(data):
+            self.extend([data[position:]])
+
+    def _mutable_page(self, index):
+        # type: (int) -> bytearray
+        """Get a page for modification, copying it if it is shared."""
+
+        page = self._pages[index]
+        if not isinstance(page, bytearray):
+            page = self._pages[index] = bytearray(page)
+        return page
+
+    def append(self, value):
+        # type: (int) -> None
+        self.extend([memoryview(bytes((value,)))])
+
+    def detach(self):
+        # type: () -> None
+        """Copy the pages which are views of larger buffers, so that the
+        buffers can be freed.
+        """
+
+        for index, page in enumerate(self._pages):
+            if (
+                isinstance(page, memoryview)
+                and len(page) != len(page.obj)
+                and _fill_value(page) is None
+            ):
+                self._pages[index] = memoryview(bytes(page))
+
+    def extend(self, views):
+        # type: (typing.Iterable[memoryview]) -> None
+        """Append the contents of some views.
+
+        :param views: The views to append. See :meth:`__init__`.
+        """
+
+        pages = self._pages
+        for view in views:
+            size = len(view)
+            value = _fill_value(view)
+            position = 0
+            if pages and len(pages[-1]) < _PAGE_SIZE:
+                last = pages[-1]
+                position = min(_PAGE_SIZE - len(last), size)
+                if value is not None and _fill_value(last) == value:
+                    pages[-1] = _fill(value, len(last) + position)
+                else:
+                    if not isinstance(last, bytearray):
+                        last = pages[-1] = bytearray(last)
+                    last += view[:position]
+            while position < size:
+                page = view[position : position + _PAGE_SIZE]
+                if value is not None:
+                    page = _fill(value, len(page))
+                elif not isinstance(page.obj, bytes):
+                    page = bytearray(page)
+                pages.append(page)
+                position += len(page)
+            self._length += size
+
+    def views(self, start, stop):
+        # type: (int, int) -> typing.List[memoryview]
+        """Get views of the bytes in ``range(start, stop)``,
+        one for each page they are in.
+        """
+
+        views = []
+        while start < stop:
+            index, offset = divmod(start, _PAGE_SIZE)
+            page = memoryview(self._pages[index])
+            size = min(len(page) - offset, stop - start)
+            views.append(page[offset : offset + size])
+            start += size
+        return views
+
+    def __repr__(self):
+        # type: () -> str
+        # Represented as bytes, so that reprs of maps stay expressions
+        return repr(bytes(self))
+
+
+_Region = typing.Union[bytes, bytearray, _PagedRegion]
+"""The types of values in ``ImageByteMap._byte_map``."""
 
 
 class ImageByteMap(Node):
@@ -22,6 +457,21 @@ class ImageByteMap(Node):
         loaded file in memory.
     """
 
+    class Change(Enum):
+        """The kind of difference between two :class:`gtirb.ImageByteMap`\\s
+        reported for a range of addresses by
+        :meth:`gtirb.ImageByteMap.diff`.
+        """
+
+        Added = "added"
+        """The addresses are only mapped in the other map."""
+
+        Changed = "changed"
+        """The addresses are mapped in both maps, to different bytes."""
+
+        Removed = "removed"
+        """The addresses are only mapped in this map."""
+
     def __init__(
         self,
         *,
@@ -40,6 +490,8 @@ class ImageByteMap(Node):
         :param byte_map: A sparse mapping such that a key-value pair
             ``(A, S)`` indicates that the byte sequence ``S`` reflects the
             contents of addresses ``A`` through ``A+len(S)-1``.
+            Mutable sequences are copied. Immutable ``bytes`` are shared
+            instead, and only copied the first time they are modified.
         :param entry_point_address: The entry point address of the
             loaded file in memory.
         :param uuid: The UUID of this ``ImageByteMap``,
@@ -54,28 +506,24 @@ class ImageByteMap(Node):
         self.base_address = base_address  # type: int
         self.entry_point_address = entry_point_address  # type: int
 
-        # Deep copy of the byte map
-        self._byte_map = {
-            k: bytearray(v) for k, v in byte_map.items()
-        }  # type: typing.Dict[int, bytearray]
-        # Validate/coalesce address ranges
-        self._start_addresses = list()  # type: typing.List[int]
-        addresses = sorted(byte_map.keys())
-        if len(addresses) != 0 and addresses[0] < addr_min:
-            raise ValueError("address in byte map out of range")
-        max_addr = None
-        for addr in addresses:
-            if max_addr is None or max_addr < addr:
-                self._start_addresses.append(addr)
-                min_addr = addr
-            elif max_addr == addr:
-                self._byte_map[min_addr] += self._byte_map[addr]
-                del self._byte_map[addr]
-            else:
-                raise ValueError("address ranges in byte map overlap")
-            max_addr = min_addr + len(self._byte_map[min_addr])
-        if max_addr is not None and max_addr - 1 > addr_max:
-            raise ValueError("address in byte map out of range")
+        self._byte_map = dict()  # type: typing.Dict[int, _Region]
+        self._start_addresses = SortedList()  # type: SortedList[int]
+        # Incremented on every modification, so that objects caching
+        # regions (such as readers) can tell when their cache is stale
+        self._version = 0  # type: int
+        # Snapshots which have not been dropped or invalidated
+        self._snapshots = WeakSet()  # type: WeakSet
+        self._snapshot_count = 0  # type: int
+        # Cached content hashes, keyed by level in the hash tree and the
+        # index of the block at that level; see content_hash
+        self._hashes = dict()  # type: typing.Dict[tuple, bytes]
+
+        # Deep copy of the byte map. Immutable regions are copied lazily,
+        # the first time they are written to; see _mutable_region.
+        self._load_regions(
+            (k, v if isinstance(v, bytes) else bytearray(v))
+            for k, v in byte_map.items()
+        )
 
     def __contains__(self, key):
         # type: (typing.Any) -> bool
@@ -101,6 +549,8 @@ class ImageByteMap(Node):
             specified are not mapped to a byte.
         """
 
+        self._version += 1
+
         # The only legal accesses are single indices or slices
         if not isinstance(key, (int, slice)):
             raise TypeError("index must be address or slice")
@@ -114,40 +564,9 @@ class ImageByteMap(Node):
             raise IndexError("reverse slicing unsupported")
         if key.step is not None:
             raise IndexError("step size unsupported")
-        if key.start not in self:
-            raise IndexError("start address not in map")
-        if key.stop - 1 not in self:
-            raise IndexError("stop address not in map")
-        start_range_address = self._find_start(key.start)
-        index = bisect_left(self._start_addresses, start_range_address)
-        if start_range_address != self._find_start(key.stop):
-            raise IndexError("gap in bytes in range")
-        region = self._byte_map[start_range_address]
-        start_offset = key.start - start_range_address
-        stop_offset = key.stop - start_range_address
-
-        # If the slice is the whole region, delete the whole region
-        if len(region) == stop_offset - start_offset:
-            del self._byte_map[start_range_address]
-            del self._start_addresses[index]
-
-        # If the slice stops at the last byte of the region, delete it
-        elif stop_offset == len(region):
-            del self._byte_map[start_range_address][start_offset:]
-
-        # If the slice starts at the first byte of a region
-        # there is no need to split
-        elif start_offset == 0:
-            new_region = region[stop_offset:]
-            del self._byte_map[start_range_address]
-            self._byte_map[key.stop] = new_region
-            self._start_addresses[index] = key.stop
-
-        # Otherwise split the region
-        else:
-            self._byte_map[start_range_address] = region[:start_offset]
-            self._byte_map[key.stop] = region[stop_offset:]
-            insort(self._start_addresses, key.stop)
+        start_range_address = self._find_range(key.start, key.stop)
+        self._before_change(key.start, key.stop)
+        self._delete(start_range_address, key.start, key.stop)
 
     @typing.overload
     def __getitem__(self, key):
@@ -187,18 +606,13 @@ class ImageByteMap(Node):
                 raise IndexError("reverse slicing unsupported")
             if key.step is not None:
                 raise IndexError("step size unsupported")
-            if key.start not in self:
-                raise IndexError("start address not in map")
-            if key.stop - 1 not in self:
-                raise IndexError("stop address not in map")
-            start_address = self._find_start(key.start)
-            stop_address = self._find_start(key.stop)
-            if start_address != stop_address:
-                raise IndexError("gap in bytes in range")
+            start_address = self._find_range(key.start, key.stop)
             region = self._byte_map[start_address]
             start_offset = key.start - start_address
             stop_offset = key.stop - start_address
-            return region[start_offset:stop_offset]
+            return bytearray().join(
+                _region_views(region, start_offset, stop_offset)
+            )
 
         # Other accesses are illegal
         raise TypeError("index must be address or slice")
@@ -245,16 +659,19 @@ class ImageByteMap(Node):
             or stop address.
         """
 
+        self._version += 1
+
         # address is an integer
         if isinstance(address, int):
             if not self._in_range(address):
                 raise IndexError("address out of range")
+            self._before_change(address, address + 1)
 
             # If a byte at this address exists, set it
             if address in self:
                 start = self._find_start(address)
                 offset = address - start
-                array = self._byte_map[start]
+                array = self._mutable_region(start)
                 array[offset] = data
                 return
 
@@ -264,7 +681,7 @@ class ImageByteMap(Node):
                 start_of_previous = self._find_start(address)
                 end_of_previous = self._find_end(start_of_previous)
                 if end_of_previous == address - 1:
-                    array = self._byte_map[start_of_previous]
+                    array = self._mutable_region(start_of_previous)
             except IndexError:
                 pass
 
@@ -275,19 +692,15 @@ class ImageByteMap(Node):
                 new_array = bytearray(1)
                 new_array[0] = data
                 self._byte_map[address] = new_array
-                insort(self._start_addresses, address)
+                self._start_addresses.add(address)
 
             # Check if the next address is the start of a new array and
             # combine the two if needed
             previous_start = self._find_start(address)
             next_start = self._find_start(address + 1)
             if previous_start != next_start:
-                previous_array = self._byte_map[previous_start]
-                next_array = self._byte_map[next_start]
-                previous_array += next_array
-                del self._byte_map[next_start]
-                old_index = bisect_left(self._start_addresses, next_start)
-                del self._start_addresses[old_index]
+                self._append(previous_start, self._byte_map.pop(next_start))
+                self._start_addresses.remove(next_start)
 
         # address is a slice
         if isinstance(address, slice):
@@ -302,32 +715,117 @@ class ImageByteMap(Node):
                     raise ValueError("slice size and data length do not match")
             if address.start + len(data) - 1 > self.addr_max:
                 raise IndexError("attempt to write past maximum address")
-            # Write each byte one-at-a-time
-            current_address = address.start
-            for byte in data:
+            if len(data) == 0:
+                return
+            if address.start < self.addr_min:
+                raise IndexError("attempt to write before minimum address")
+            if not isinstance(data, (bytes, bytearray)):
                 try:
-                    self[current_address] = byte
+                    data = bytearray(data)
                 except TypeError:
                     raise TypeError("data is not iterable of bytes")
-                current_address += 1
+            self._before_change(address.start, address.start + len(data))
+            self._write(address.start, data)
+
+    def _append(self, start, data, offset=0):
+        # type: (int, _Region, int) -> None
+        """Append ``data[offset:]`` to the region starting at ``start``.
+        If either is a :class:`_PagedRegion`, the result is one too.
+        """
+
+        region = self._byte_map[start]
+        if isinstance(data, _PagedRegion) or isinstance(region, _PagedRegion):
+            if not isinstance(region, _PagedRegion):
+                region = _PagedRegion(_region_views(region, 0, len(region)))
+                self._byte_map[start] = region
+            region.extend(_region_views(data, offset, len(data)))
+        else:
+            self._mutable_region(start).extend(memoryview(data)[offset:])
+
+    def _before_change(self, start, stop):
+        # type: (int, int) -> None
+        """Discard the content hashes of the bytes in ``range(start, stop)``
+        and let live snapshots save them before they are modified.
+        """
+
+        if self._hashes:
+            for level, size in enumerate(_HASH_BLOCK_SIZES):
+                for index in range(start // size, (stop - 1) // size + 1):
+                    self._hashes.pop((level, index), None)
+        if self._snapshots:
+            for snapshot in self._snapshots:
+                snapshot._save(start, stop)
+
+    def _clear(self, start, stop):
+        # type: (int, int) -> None
+        """Delete every mapped byte in ``range(start, stop)``."""
+
+        first = self._start_addresses.floor(start)
+        if first is None:
+            first = start
+        for region_start in list(
+            self._start_addresses.irange(first, stop - 1)
+        ):
+            region_stop = region_start + len(self._byte_map[region_start])
+            begin = max(start, region_start)
+            end = min(stop, region_stop)
+            if begin < end:
+                self._delete(region_start, begin, end)
 
     @classmethod
     def _decode_protobuf(cls, proto_ibm, uuid):
         # type: (ImageByteMap_pb2.ImageByteMap, UUID) -> ImageByteMap
-        byte_map = {
-            region.address: bytearray(region.data)
-            for region in proto_ibm.byte_map.regions
-        }
         image_byte_map = cls(
             addr_min=proto_ibm.addr_min,
             addr_max=proto_ibm.addr_max,
             base_address=proto_ibm.base_address,
-            byte_map=byte_map,
             entry_point_address=proto_ibm.entry_point_address,
             uuid=uuid,
         )
+        # Region payloads are kept as the immutable bytes parsed from the
+        # Protobuf message, and only copied when they are first modified.
+        image_byte_map._load_regions(
+            (region.address, region.data)
+            for region in proto_ibm.byte_map.regions
+        )
         return image_byte_map
 
+    def _delete(self, region_start, start, stop):
+        # type: (int, int, int) -> None
+        """Delete the bytes in ``range(start, stop)``, all of which must be
+        in the region starting at ``region_start``.
+        """
+
+        if start == stop:
+            return
+        region = self._byte_map[region_start]
+        start_offset = start - region_start
+        stop_offset = stop - region_start
+
+        # If the slice is the whole region, delete the whole region
+        if len(region) == stop_offset - start_offset:
+            del self._byte_map[region_start]
+            self._start_addresses.remove(region_start)
+
+        # If the slice stops at the last byte of the region, delete it
+        elif stop_offset == len(region):
+            del self._mutable_region(region_start)[start_offset:]
+
+        # If the slice starts at the first byte of a region
+        # there is no need to split
+        elif start_offset == 0:
+            new_region = region[stop_offset:]
+            del self._byte_map[region_start]
+            self._byte_map[stop] = new_region
+            self._start_addresses.remove(region_start)
+            self._start_addresses.add(stop)
+
+        # Otherwise split the region
+        else:
+            self._byte_map[region_start] = region[:start_offset]
+            self._byte_map[stop] = region[stop_offset:]
+            self._start_addresses.add(stop)
+
     def _find_end(self, address):
         # type: (int) -> int
         """Get the last address of the region of contiguous bytes at the
@@ -343,6 +841,29 @@ class ImageByteMap(Node):
             raise IndexError("no range containing %d" % address)
         return last_address
 
+    def _find_range(self, start, stop):
+        # type: (int, int) -> int
+        """Get the first address of the region of contiguous bytes holding
+        every address in ``range(start, stop)``.
+
+        :param start: The first address of the range.
+        :param stop: The address one past the end of the range.
+        :raises IndexError: if any address in the range is not mapped to
+            a byte.
+        """
+
+        if start not in self:
+            raise IndexError("start address not in map")
+        start_address = self._find_start(start)
+        region_stop = start_address + len(self._byte_map[start_address])
+        if start < stop <= region_stop:
+            return start_address
+        if stop - 1 not in self:
+            raise IndexError("stop address not in map")
+        if start_address != self._find_start(stop - 1):
+            raise IndexError("gap in bytes in range")
+        return start_address
+
     def _find_start(self, address):
         # type: (int) -> int
         """Get the first address of the region of contiguous bytes at the
@@ -352,11 +873,69 @@ class ImageByteMap(Node):
         :raises IndexError: if no region contains ``address``.
         """
 
-        i = bisect_right(self._start_addresses, address)
-        if i:
-            return self._start_addresses[i - 1]
+        start = self._start_addresses.floor(address)
+        if start is not None:
+            return start
         raise IndexError("no range containing %d" % address)
 
+    def _hash_block(self, level, index):
+        # type: (int, int) -> bytes
+        """Get the content hash of a block in the hash tree, computing and
+        caching it if needed. The block must contain mapped bytes.
+
+        :param level: The level of the block in the tree. Blocks at level
+            0 are chunks of bytes; blocks at higher levels are hashed from
+            the hashes of the blocks they contain.
+        :param index: The index of the block among those at its level.
+        """
+
+        key = (level, index)
+        digest = self._hashes.get(key)
+        if digest is not None:
+            return digest
+        size = _HASH_BLOCK_SIZES[level]
+        start = index * size
+        if level == 0:
+            digest = self._hash_bytes(start, start + size)
+        else:
+            child_size = _HASH_BLOCK_SIZES[level - 1]
+            children = []  # type: typing.List[int]
+            for address, view in self.spans(start, start + size):
+                first = address // child_size
+                last = (address + len(view) - 1) // child_size
+                if children and children[-1] == first:
+                    first += 1
+                children.extend(range(first, last + 1))
+            hash_ = _new_hash()
+            for child in children:
+                hash_.update(_HASH_PREFIX.pack(level - 1, child))
+                hash_.update(self._hash_block(level - 1, child))
+            digest = hash_.digest()
+        self._hashes[key] = digest
+        return digest
+
+    def _hash_bytes(self, start, stop):
+        # type: (int, int) -> bytes
+        """Hash the mapped bytes in ``range(start, stop)`` directly."""
+
+        # Contiguous views (such as the pages of a region) are hashed as
+        # one, so that the hash does not depend on how regions are stored.
+        runs = []  # type: typing.List[typing.Tuple[int, list]]
+        run_stop = None
+        for address, view in self.spans(start, stop):
+            if address != run_stop:
+                runs.append((address, []))
+            runs[-1][1].append(view)
+            run_stop = address + len(view)
+        hash_ = _new_hash()
+        for address, views in runs:
+            hash_.update(
+                _HASH_PREFIX.pack(address, sum(len(view) for view in views))
+            )
+            for view in views:
+                hash_.update(view)
+        return hash_.digest()
+
     def _in_range(self, key):
         # type: (int) -> bool
         """Check: is an address within the possible domain of addresses
@@ -367,6 +946,75 @@ class ImageByteMap(Node):
 
         return key >= self.addr_min and key <= self.addr_max
 
+    def _load_regions(self, regions):
+        # type: (typing.Iterable[typing.Tuple[int, _Region]]) -> None
+        """Fill an empty map with regions, taking ownership of their
+        buffers without copying or scanning them.
+
+        The regions are coalesced in a single pass, on the assumption that
+        they are in ascending order by address, as they are in files that
+        GTIRB writes. If a region is found out of order, the regions are
+        sorted and coalesced again.
+
+        :param regions: Pairs ``(address, data)`` of regions to add.
+        :raises ValueError: if the regions overlap, or are not within
+            ``range(addr_min, addr_max + 1)``.
+        """
+
+        byte_map = self._byte_map
+        starts = []  # type: typing.List[int]
+        stop = None
+        items = iter(regions)
+        in_order = False
+        while True:
+            for address, data in items:
+                if stop is None or stop < address:
+                    byte_map[address] = data
+                    starts.append(address)
+                    stop = address + len(data)
+                    continue
+                if stop == address:
+                    self._append(starts[-1], data)
+                elif in_order:
+                    raise ValueError("address ranges in byte map overlap")
+                else:
+                    # Out of order: start over with the regions sorted
+                    items = iter(
+                        sorted(
+                            [*byte_map.items(), (address, data), *items],
+                            key=lambda item: item[0],
+                        )
+                    )
+                    byte_map.clear()
+                    starts, stop, in_order = [], None, True
+                    break
+                stop += len(data)
+            else:
+                break
+
+        if starts and (starts[0] < self.addr_min or stop - 1 > self.addr_max):
+            raise ValueError("address in byte map out of range")
+        self._start_addresses = SortedList(starts)
+
+    def _mutable_region(self, start):
+        # type: (int) -> typing.Union[bytearray, _PagedRegion]
+        """Get the region starting at ``start`` for modification, first
+        copying it into a ``bytearray`` if it is an immutable buffer. Large
+        immutable buffers are instead paged by :func:`_compact` without
+        copying, and a :class:`_PagedRegion` copies its pages as they are
+        modified.
+
+        :param start: The first address of a region in ``_byte_map``.
+        """
+
+        region = self._byte_map[start]
+        if isinstance(region, bytes):
+            region = _compact(region)
+            if isinstance(region, bytes):
+                region = bytearray(region)
+            self._byte_map[start] = region
+        return region
+
     def _to_protobuf(self):
         # type: () -> ImageByteMap_pb2.ImageByteMap
         proto_byte_map = ByteMap_pb2.ByteMap()
@@ -390,6 +1038,160 @@ class ImageByteMap(Node):
         proto_ibm.uuid = self.uuid.bytes
         return proto_ibm
 
+    def _word_groups(self, addresses, width):
+        # type: (typing.Sequence[int], int) -> typing.Iterator[tuple]
+        """Split the addresses of integers into groups held by a single
+        region.
+
+        :param addresses: The addresses of the integers, in ascending order.
+        :param width: The size of each integer in bytes.
+        :returns: Yields tuples ``(region_start, region, lo, hi)``, such that
+            the integers at ``addresses[lo:hi]`` are all in the region
+            starting at ``region_start``.
+        :raises IndexError: if the bytes of any integer are not all in
+            one region.
+        """
+
+        position = 0
+        while position < len(addresses):
+            address = int(addresses[position])
+            region_start = self._start_addresses.floor(address)
+            if region_start is not None:
+                region = self._byte_map[region_start]
+                last = region_start + len(region) - width
+                if address <= last:
+                    end = bisect_right(addresses, last, position)
+                    yield region_start, region, position, end
+                    position = end
+                    continue
+            raise IndexError("no %d contiguous bytes at %d" % (width, address))
+
+    def _write(self, address, data):
+        # type: (int, typing.Union[bytes, bytearray]) -> None
+        """Write a run of bytes starting at ``address``.
+
+        The data is spliced into any regions it overlaps, and every region
+        it overlaps or touches is coalesced into a single region, so the
+        cost is linear in the size of the data and the regions merged, plus
+        a logarithmic update of ``_start_addresses`` per region merged.
+
+        :param address: The address to write the first byte to.
+        :param data: The bytes to write. Must not be empty.
+        """
+
+        stop = address + len(data)
+        starts = self._start_addresses
+
+        # Find the regions overlapping or adjacent to [address, stop).
+        first = starts.floor(address)
+        if first is None or first + len(self._byte_map[first]) < address:
+            first = address
+        merged = list(starts.irange(first, stop))
+
+        # If a region starts at or before the write, splice into it.
+        # Otherwise the write begins a new region.
+        if merged and merged[0] <= address:
+            region_start = merged.pop(0)
+            region = self._mutable_region(region_start)
+            region[address - region_start : stop - region_start] = data
+        else:
+            region_start = address
+            if len(data) >= 2 * _PAGE_SIZE:
+                self._byte_map[address] = _compact(bytes(data))
+            else:
+                self._byte_map[address] = bytearray(data)
+            starts.add(address)
+
+        # Absorb whatever the remaining regions hold past the end of the
+        # written data.
+        for start in merged:
+            other = self._byte_map.pop(start)
+            starts.remove(start)
+            if start + len(other) > stop:
+                self._append(region_start, other, stop - start)
+
+    def compact(self):
+        # type: () -> None
+        """Free the memory of pages of 64 KiB filled with a single repeated
+        byte, such as zero-initialized data and padding, in regions at
+        least two pages long.
+
+        Loading a map keeps each region in the buffer it was read into,
+        without copying it. Once a large region is written to, only the
+        pages written to are copied, and the other pages share memory with
+        each other or view the buffer, which is kept whole. Compacting
+        copies the pages which are not filled with a repeated byte, one
+        region at a time, so that the buffers can be freed.
+        """
+
+        for start, region in list(self._byte_map.items()):
+            self._byte_map[start] = _compact(region, release=True)
+        self._version += 1
+
+    def content_hash(self, start=None, stop=None):
+        # type: (typing.Optional[int], typing.Optional[int]) -> bytes
+        """Get a hash of the mapped bytes in a range of addresses, suitable
+        for use as a cache key. The hash covers both the values and the
+        addresses of the bytes, and only depends on which bytes are mapped
+        in the range: it is the same for any two maps and ranges holding
+        the same bytes at the same addresses.
+
+        Hashes are kept for a tree of aligned blocks of addresses, from
+        4 KiB chunks up, and only the blocks containing modified bytes are
+        rehashed when the map changes. So after the first call, hashing
+        even a large range is cheap, as long as most of it is unchanged.
+
+        :param start: The first address of the range,
+            or None to start at address 0.
+        :param stop: The address one past the end of the range,
+            or None to stop after the highest mapped address.
+        :returns: A 32-byte BLAKE2b digest.
+        """
+
+        # Shrink the range to the mapped bytes it holds, so that the hash
+        # does not depend on the bounds of the range.
+        starts = self._start_addresses
+        if start is None:
+            start = 0
+        first = starts.floor(start)
+        if first is None or first + len(self._byte_map[first]) <= start:
+            first = next(starts.irange(start), None)
+        last = starts.floor(1 << 64 if stop is None else stop - 1)
+        if first is None or last is None:
+            start = stop = 0
+        else:
+            end = last + len(self._byte_map[last])
+            start = max(start, first)
+            stop = end if stop is None else min(end, stop)
+
+        # Split the range into the largest blocks of the hash tree which
+        # it covers, plus partial chunks at either end.
+        hash_ = _new_hash()
+        address = start
+        while address < stop:
+            level = -1
+            while (
+                level + 1 < len(_HASH_BLOCK_SIZES)
+                and address % _HASH_BLOCK_SIZES[level + 1] == 0
+                and address + _HASH_BLOCK_SIZES[level + 1] <= stop
+            ):
+                level += 1
+            if level < 0:
+                chunk = address - address % _HASH_CHUNK_SIZE
+                end = min(stop, chunk + _HASH_CHUNK_SIZE)
+            else:
+                end = address + _HASH_BLOCK_SIZES[level]
+            if self.spans(address, end):
+                hash_.update(_HASH_PREFIX.pack(address, end))
+                if level < 0:
+                    hash_.update(self._hash_bytes(address, end))
+                else:
+                    hash_.update(
+                        self._hash_block(level, address // (end - address))
+                    )
+            address = end
+        return hash_.digest()
+
     def deep_eq(self, other):
         # type: (typing.Any) -> bool
         # Do not move __eq__. See docstring for Node.deep_eq for more info.
@@ -408,6 +1210,791 @@ class ImageByteMap(Node):
                 return False
         return True
 
+    def diff(self, other):
+        # type: (ImageByteMap) -> typing.List[tuple]
+        """Find the ranges of addresses whose contents differ between this
+        map and another, such as two builds of the same binary.
+
+        The layouts of regions in the two maps are compared first. Bytes
+        mapped in both are compared in large chunks at ``memcmp`` speed,
+        and only chunks which differ are narrowed down to the exact bytes,
+        so comparing mostly identical maps takes little more than a single
+        pass over their contents.
+
+        :param other: The map to compare this map with.
+        :returns: A list of ``(start, stop, change)`` tuples in ascending
+            order by address, each describing the addresses in
+            ``range(start, stop)``. Adjacent ranges with the same
+            :class:`gtirb.ImageByteMap.Change` are merged.
+        """
+
+        changes = []  # type: typing.List[typing.Any]
+
+        def report(start, stop, change):
+            # type: (int, int, ImageByteMap.Change) -> None
+            if (
+                changes
+                and changes[-1][1] == start
+                and changes[-1][2] == change
+            ):
+                changes[-1][1] = stop
+            else:
+                changes.append([start, stop, change])
+
+        def compare(address, mine, theirs, chunk_sizes):
+            # type: (int, memoryview, memoryview, typing.List[int]) -> None
+            """Report the bytes which differ between two equally sized
+            views, the first bytes of which are at ``address``.
+            """
+
+            if not chunk_sizes:
+                for offset in range(len(mine)):
+                    if mine[offset] != theirs[offset]:
+                        report(
+                            address + offset,
+                            address + offset + 1,
+                            ImageByteMap.Change.Changed,
+                        )
+                return
+            size = chunk_sizes[0]
+            for offset in range(0, len(mine), size):
+                a = mine[offset : offset + size]
+                b = theirs[offset : offset + size]
+                # Copying a chunk to bytes is as fast as comparing it, and
+                # bytes compare with memcmp, whereas views compare per byte.
+                if a.tobytes() != b.tobytes():
+                    compare(address + offset, a, b, chunk_sizes[1:])
+
+        # Split the addresses mapped in either map into segments, each of
+        # which is mapped by at most one region of each map.
+        mine = self.spans()
+        theirs = other.spans()
+        bounds = set()  # type: typing.Set[int]
+        for address, view in mine + theirs:
+            bounds.update((address, address + len(view)))
+        points = sorted(bounds)
+        i = j = 0
+        for start, stop in zip(points, points[1:]):
+            while i < len(mine) and mine[i][0] + len(mine[i][1]) <= start:
+                i += 1
+            while (
+                j < len(theirs) and theirs[j][0] + len(theirs[j][1]) <= start
+            ):
+                j += 1
+            in_mine = i < len(mine) and mine[i][0] <= start
+            in_theirs = j < len(theirs) and theirs[j][0] <= start
+            if in_mine and in_theirs:
+                a = mine[i][1][start - mine[i][0] : stop - mine[i][0]]
+                b = theirs[j][1][start - theirs[j][0] : stop - theirs[j][0]]
+                compare(start, a, b, [0x10000, 0x400, 0x20])
+            elif in_mine:
+                report(start, stop, ImageByteMap.Change.Removed)
+            elif in_theirs:
+                report(start, stop, ImageByteMap.Change.Added)
+        return [tuple(change) for change in changes]
+
+    def find_all(
+        self,
+        patterns,  # type: typing.Union[Pattern, typing.Iterable[Pattern]]
+        start=None,  # type: typing.Optional[int]
+        stop=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> typing.List[typing.Tuple[int, Pattern]]
+        """Find every occurrence of several byte patterns at once.
+
+        Each region is searched once for every distinct run of literal
+        bytes that is the longest run in some pattern, no matter how many
+        patterns share it. Matches may overlap, but never include unmapped
+        addresses.
+
+        :param patterns: A pattern or an iterable of patterns. Each pattern
+            is either a literal byte sequence, or a string of hexadecimal
+            byte values in which ``??`` matches any byte
+            (for example, ``"48 8b ?? ?? 00"``).
+        :param start: The first address to search,
+            or None to start at the lowest mapped address.
+        :param stop: The address one past the end of the range to search,
+            or None to stop after the highest mapped address.
+        :returns: A list of ``(address, pattern)`` tuples, one for each
+            match, sorted by address and then by the order of ``patterns``.
+        :raises ValueError: if a pattern is empty or malformed.
+        """
+
+        if isinstance(patterns, (str, bytes, bytearray)):
+            patterns = [patterns]
+        patterns = list(patterns)
+        if len(patterns) == 0:
+            return []
+        parsed = [_parse_pattern(pattern) for pattern in patterns]
+
+        # Each pattern is located by searching for its longest literal run.
+        # Patterns sharing a run are located with a single search; this is
+        # much faster than a combined regular expression or an automaton
+        # stepped through in Python, as every search runs at C speed.
+        regexes = [
+            re.compile(b"".join(map(_token_regex, tokens)), re.DOTALL)
+            for tokens in parsed
+        ]
+        anchored = {}  # type: typing.Dict[bytes, typing.List[typing.Any]]
+        unanchored = []  # type: typing.List[int]
+        for i, tokens in enumerate(parsed):
+            offset, literal = _longest_literal(tokens)
+            if literal:
+                anchored.setdefault(literal, []).append((offset, i))
+            else:
+                unanchored.append(i)
+        anchors = [
+            (re.compile(re.escape(literal)), members)
+            for literal, members in anchored.items()
+        ]
+        matches = []  # type: typing.List[typing.Tuple[int, int]]
+
+        def search(address, data, boundary=None):
+            # type: (int, typing.Any, typing.Optional[int]) -> None
+            """Record the matches in ``data``, which starts at ``address``.
+            If ``boundary`` is given, only record the matches which start
+            before that offset and end after it.
+            """
+
+            for anchor, members in anchors:
+                found = anchor.search(data)
+                while found is not None:
+                    position = found.start()
+                    for offset, i in members:
+                        begin = position - offset
+                        if (
+                            begin >= 0
+                            and (
+                                boundary is None
+                                or begin < boundary < begin + len(parsed[i])
+                            )
+                            and regexes[i].match(data, begin)
+                        ):
+                            matches.append((address + begin, i))
+                    found = anchor.search(data, position + 1)
+            for i in unanchored:
+                first, last = 0, len(data) - len(parsed[i])
+                if boundary is not None:
+                    first = max(first, boundary - len(parsed[i]) + 1)
+                    last = min(last, boundary - 1)
+                matches.extend(
+                    (address + begin, i) for begin in range(first, last + 1)
+                )
+
+        # Matches spanning the boundary between contiguous spans are found
+        # by searching the end of the first joined to the start of the next.
+        overlap = max(len(tokens) for tokens in parsed) - 1
+        tail_address, tail = 0, b""
+        for address, view in self.spans(start, stop):
+            if tail and tail_address + len(tail) == address:
+                search(tail_address, tail + view[:overlap], len(tail))
+            else:
+                tail = b""
+            search(address, view)
+            if overlap:
+                tail = (tail + view[-overlap:])[-overlap:]
+                tail_address = address + len(view) - len(tail)
+            view.release()
+        matches.sort()
+        return [(address, patterns[i]) for address, i in matches]
+
+    def find_pointer_runs(
+        self,
+        start=None,  # type: typing.Optional[int]
+        stop=None,  # type: typing.Optional[int]
+        *,
+        width=8,  # type: int
+        byteorder="little",  # type: str
+        targets=None,  # type: typing.Optional[typing.Iterable[int]]
+        min_length=2  # type: int
+    ):
+        # type: (...) -> typing.List[typing.Tuple[int, int]]
+        """Find runs of consecutive aligned integers which look like
+        pointers, as candidates for jump tables and pointer arrays.
+
+        An integer looks like a pointer if its value is in
+        ``range(addr_min, addr_max + 1)``, or is one of ``targets``.
+        Only integers whose address is a multiple of ``width`` are
+        considered. If NumPy is installed, each run of contiguous bytes is
+        checked with vectorized comparisons.
+
+        :param start: The first address to search,
+            or None to start at the lowest mapped address.
+        :param stop: The address one past the end of the range to search,
+            or None to stop after the highest mapped address.
+        :param width: The size of a pointer in bytes: 1, 2, 4, or 8.
+        :param byteorder: Either ``"little"`` or ``"big"``.
+        :param targets: Additional values to accept as pointers, such as
+            the addresses of blocks, or None to only accept values within
+            the map's range of addresses.
+        :param min_length: The fewest consecutive pointers to report.
+        :returns: A list of ``(address, count)`` tuples in ascending order
+            by address, one for each run of at least ``min_length``
+            pointers starting at ``address``.
+        """
+
+        if width not in (1, 2, 4, 8):
+            raise ValueError("width must be 1, 2, 4, or 8")
+        if byteorder not in ("little", "big"):
+            raise ValueError("byteorder must be either 'little' or 'big'")
+        min_length = max(min_length, 1)
+        endian = "<" if byteorder == "little" else ">"
+        low, high = self.addr_min, self.addr_max
+        targets = set() if targets is None else set(targets)
+        if numpy is not None:
+            dtype = numpy.dtype("%su%d" % (endian, width))
+            target_array = numpy.fromiter(
+                (t for t in targets if 0 <= t < 1 << (8 * width)),
+                dtype=numpy.uint64,
+            )
+        else:
+            code = {1: "B", 2: "H", 4: "I", 8: "Q"}[width]
+            unpacker = struct.Struct(endian + code)
+
+        def scan(address, data):
+            # type: (int, typing.Any) -> typing.Iterator[tuple]
+            """Yield the runs of any length in ``data``, which starts at
+            ``address``.
+            """
+
+            first = -(-address // width) * width
+            count = (address + len(data) - first) // width
+            if count < 1:
+                return
+            begin = first - address
+            data = data[begin : begin + count * width]
+            if numpy is not None:
+                words = numpy.frombuffer(data, dtype=dtype)
+                hits = (words >= low) & (words <= high)
+                if len(target_array):
+                    hits |= numpy.isin(words, target_array)
+                edges = numpy.diff(
+                    hits.astype(numpy.int8), prepend=0, append=0
+                )
+                starts = numpy.flatnonzero(edges == 1)
+                lengths = numpy.flatnonzero(edges == -1) - starts
+                for i, length in zip(starts.tolist(), lengths.tolist()):
+                    yield first + i * width, length
+                return
+            run = 0
+            for i, (value,) in enumerate(unpacker.iter_unpack(data)):
+                if low <= value <= high or value in targets:
+                    run += 1
+                    continue
+                if run:
+                    yield first + (i - run) * width, run
+                run = 0
+            if run:
+                yield first + (count - run) * width, run
+
+        runs = []  # type: typing.List[typing.Tuple[int, int]]
+
+        def add(found):
+            # type: (typing.Iterable[typing.Tuple[int, int]]) -> None
+            """Record runs, joining them to the last run if they continue
+            it across the boundary between spans.
+            """
+
+            for address, count in found:
+                if runs and runs[-1][0] + runs[-1][1] * width == address:
+                    runs[-1] = (runs[-1][0], runs[-1][1] + count)
+                else:
+                    runs.append((address, count))
+
+        # Each span is scanned separately. Pointers straddling the boundary
+        # between contiguous spans are found by joining the incomplete word
+        # at the end of one to the start of the next.
+        tail_address, tail = 0, b""
+        for address, view in self.spans(start, stop):
+            if tail_address + len(tail) != address:
+                tail_address, tail = address, b""
+            if tail:
+                add(scan(tail_address, tail + bytes(view[: width - 1])))
+            add(scan(address, view))
+            end = address + len(view)
+            aligned = end - end % width
+            if aligned >= address:
+                tail_address, tail = aligned, bytes(view[aligned - address :])
+            else:
+                tail += bytes(view)
+            view.release()
+        return [run for run in runs if run[1] >= min_length]
+
+    def reader(self, address):
+        # type: (int) -> ImageByteMapReader
+        """Get a seekable stream reading bytes from the map,
+        starting at ``address``.
+
+        :param address: The address to start reading at.
+        """
+
+        return ImageByteMapReader(self, address)
+
+    def read_words(
+        self,
+        addresses,  # type: typing.Iterable[int]
+        width=8,  # type: int
+        byteorder="little",  # type: str
+        signed=False,  # type: bool
+    ):
+        # type: (...) -> array.array
+        """Read integers at many addresses at once, such as the entries of
+        a jump table or an import address table.
+
+        The addresses are grouped by the region holding them, and each
+        group is decoded in a single vectorized gather if NumPy is
+        installed, or with one precompiled :class:`struct.Struct` otherwise.
+
+        :param addresses: The addresses of the integers to read, in any
+            order. May be a NumPy array.
+        :param width: The size of each integer in bytes: 1, 2, 4, or 8.
+        :param byteorder: Either ``"little"`` or ``"big"``.
+        :param signed: Whether the integers are two's complement signed.
+        :returns: An :class:`array.array` of the integers, in the same
+            order as ``addresses``.
+        :raises IndexError: if the bytes of any integer are not all in
+            one region.
+        """
+
+        if width not in (1, 2, 4, 8):
+            raise ValueError("width must be 1, 2, 4, or 8")
+        if byteorder not in ("little", "big"):
+            raise ValueError("byteorder must be either 'little' or 'big'")
+        typecode = next(
+            code for code in "BHILQ" if array.array(code).itemsize == width
+        )
+        if signed:
+            typecode = typecode.lower()
+
+        endian = "<" if byteorder == "little" else ">"
+        code = {1: "B", 2: "H", 4: "I", 8: "Q"}[width]
+        unpacker = struct.Struct(endian + (code.lower() if signed else code))
+
+        def unpack(region, offset):
+            # type: (_Region, int) -> int
+            """Read the integer at ``offset`` in a region."""
+
+            if isinstance(region, _PagedRegion):
+                region = b"".join(region.views(offset, offset + width))
+                offset = 0
+            return unpacker.unpack_from(region, offset)[0]
+
+        if numpy is not None:
+            if isinstance(addresses, numpy.ndarray):
+                addresses = addresses.astype(numpy.uint64, copy=False)
+            else:
+                addresses = numpy.fromiter(addresses, dtype=numpy.uint64)
+            order = numpy.argsort(addresses, kind="stable")
+            sorted_addresses = addresses[order]
+            dtype = numpy.dtype(
+                "%s%s%d" % (endian, "i" if signed else "u", width)
+            )
+            words = numpy.empty(len(addresses), dtype=dtype.newbyteorder("="))
+            byte_offsets = numpy.arange(width)
+            for region_start, region, lo, hi in self._word_groups(
+                sorted_addresses, width
+            ):
+                if isinstance(region, _PagedRegion):
+                    # Pages are not contiguous in memory
+                    for i in range(lo, hi):
+                        offset = int(sorted_addresses[i]) - region_start
+                        words[order[i]] = unpack(region, offset)
+                    continue
+                data = numpy.frombuffer(region, dtype=numpy.uint8)
+                offsets = sorted_addresses[lo:hi] - numpy.uint64(region_start)
+                offsets = offsets.astype(numpy.intp)[:, None] + byte_offsets
+                words[order[lo:hi]] = data[offsets].view(dtype).ravel()
+            return array.array(typecode, words.tobytes())
+
+        addresses = list(addresses)
+        order = sorted(range(len(addresses)), key=addresses.__getitem__)
+        sorted_addresses = [addresses[i] for i in order]
+        words = array.array(typecode, bytes(width * len(addresses)))
+        for region_start, region, lo, hi in self._word_groups(
+            sorted_addresses, width
+        ):
+            for i in range(lo, hi):
+                words[order[i]] = unpack(
+                    region, sorted_addresses[i] - region_start
+                )
+        return words
+
+    def regions_as_arrays(
+        self,
+        start=None,  # type: typing.Optional[int]
+        stop=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> typing.Iterator[typing.Tuple[int, "numpy.ndarray"]]
+        """Yield read-only NumPy arrays of ``uint8`` sharing memory with the
+        regions of the map. Requires NumPy.
+
+        :param start: The first address of the range to view,
+            or None to start at the lowest mapped address.
+        :param stop: The address one past the end of the range to view,
+            or None to stop after the highest mapped address.
+        :returns: Yields ``(address, array)`` tuples in ascending order
+            by address, one for each region overlapping the range.
+            See :func:`gtirb.ImageByteMap.spans` for restrictions on
+            modifying the map while arrays are alive.
+        :raises ImportError: if NumPy is not installed.
+        """
+
+        _require_numpy()
+        for address, view in self.spans(start, stop):
+            yield address, numpy.frombuffer(view, dtype=numpy.uint8)
+
+    def restore(self, snapshot):
+        # type: (ImageByteMapSnapshot) -> None
+        """Undo every change made to this map since a snapshot was taken.
+
+        Only the pages modified since the snapshot are written back, so
+        the cost is proportional to the amount of data changed rather than
+        the size of the map. Snapshots taken after ``snapshot`` are
+        invalidated; ``snapshot`` itself remains valid, and can be
+        restored again later.
+
+        :param snapshot: A snapshot returned by :meth:`snapshot`.
+        :raises ValueError: if ``snapshot`` was not taken of this map,
+            or has been invalidated.
+        """
+
+        if snapshot.image_byte_map is not self or not snapshot.valid:
+            raise ValueError("snapshot is not valid for this map")
+        for other in list(self._snapshots):
+            if other._serial > snapshot._serial:
+                other._valid = False
+                self._snapshots.discard(other)
+
+        page_size = snapshot.page_size
+        for page, saved in snapshot._pages.items():
+            # Older snapshots still need the current contents of the page
+            self._before_change(page, page + page_size)
+            self._clear(page, page + page_size)
+            for address, data in saved:
+                self._write(address, data)
+        snapshot._pages.clear()
+
+        (
+            self.addr_min,
+            self.addr_max,
+            self.base_address,
+            self.entry_point_address,
+        ) = snapshot._attributes
+        self._version += 1
+
+    def snapshot(self):
+        # type: () -> ImageByteMapSnapshot
+        """Take a snapshot of the current contents of this map, which can
+        later be passed to :meth:`restore` to undo any changes made since.
+
+        Taking a snapshot does not copy the map. Instead, each page of
+        :attr:`ImageByteMapSnapshot.page_size` bytes is saved the first
+        time it is modified while the snapshot is alive, so snapshots
+        are cheap to take and to hold onto for maps which are mostly
+        left unchanged. Snapshots can be nested.
+
+        :returns: A new :class:`ImageByteMapSnapshot`.
+        """
+
+        self._snapshot_count += 1
+        snapshot = ImageByteMapSnapshot(self, self._snapshot_count)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def spans(
+        self,
+        start=None,  # type: typing.Optional[int]
+        stop=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> typing.List[typing.Tuple[int, memoryview]]
+        """Get views of all mapped bytes in a range of addresses,
+        without copying them. Unmapped addresses in the range are skipped.
+
+        The views are read-only and share memory with the map. Regions
+        that have never been modified are immutable buffers which are
+        copied on their first modification, so views are only guaranteed
+        to reflect the contents of the map at the time they were taken.
+        A region cannot be resized while a view of it is alive, so views
+        should be released (for example, by using them as context managers)
+        before writing to or deleting from neighbouring addresses.
+
+        :param start: The first address of the range,
+            or None to start at the lowest mapped address.
+        :param stop: The address one past the end of the range,
+            or None to stop after the highest mapped address.
+        :returns: A list of ``(address, view)`` tuples in ascending order
+            by address, one for each region overlapping the range. Regions
+            stored in pages to share runs of repeated bytes have one view
+            per page instead.
+        """
+
+        first = None if start is None else self._start_addresses.floor(start)
+        if first is None:
+            first = start
+        last = None if stop is None else stop - 1
+        spans = []
+        for region_start in self._start_addresses.irange(first, last):
+            region = self._byte_map[region_start]
+            begin = 0 if start is None else max(start - region_start, 0)
+            end = len(region)
+            if stop is not None:
+                end = min(stop - region_start, end)
+            if begin >= end:
+                continue
+            address = region_start + begin
+            for view in _region_views(region, begin, end):
+                spans.append((address, view.toreadonly()))
+                address += len(view)
+        return spans
+
+    def statistics(
+        self,
+        start=None,  # type: typing.Optional[int]
+        stop=None,  # type: typing.Optional[int]
+        window=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> ImageByteMapStatistics
+        """Compute statistics of the mapped bytes in a range of addresses,
+        such as their entropy, as used to spot packed or encrypted data.
+        Requires NumPy.
+
+        The bytes are counted with vectorized operations over the buffers
+        of the regions, rather than one at a time.
+
+        :param start: The first address of the range,
+            or None to start at the lowest mapped address.
+        :param stop: The address one past the end of the range,
+            or None to stop after the highest mapped address.
+        :param window: If given, the range is also split into windows of
+            this many addresses, starting at its first address, and the
+            statistics of each window holding mapped bytes are computed.
+        :raises ImportError: if NumPy is not installed.
+        """
+
+        _require_numpy()
+        if window is not None and window < 1:
+            raise ValueError("window must be positive")
+        spans = self.spans(start, stop)
+        if start is None:
+            start = spans[0][0] if spans else 0
+        printable = numpy.zeros(256, dtype=bool)
+        printable[list(_PRINTABLE)] = True
+        histogram = numpy.zeros(256, dtype=numpy.int64)
+
+        # Histograms of windows are reduced to their statistics as soon as
+        # they are complete. The last window counted is kept pending, as
+        # the next span may continue it.
+        results = []  # type: typing.List[tuple]
+        pending = None  # type: typing.Optional[tuple]
+        # Each batch counts the 256 byte values of each window it spans,
+        # so small windows get shorter batches to bound these counts.
+        batch = min(
+            _STATISTICS_BATCH, _STATISTICS_BATCH // 256 * (window or 1)
+        )
+
+        def finish(indices, counts):
+            # type: ("numpy.ndarray", "numpy.ndarray") -> None
+            sizes = counts.sum(axis=1)
+            results.append(
+                (
+                    indices,
+                    sizes,
+                    _entropy(counts),
+                    counts[:, printable].sum(axis=1) / sizes,
+                )
+            )
+
+        for address, view in spans:
+            data = numpy.frombuffer(view, dtype=numpy.uint8)
+            histogram += numpy.bincount(data, minlength=256)
+            if window is None:
+                continue
+            for begin in range(0, len(data), batch):
+                chunk = data[begin : begin + batch]
+                offset = address + begin - start
+                first = offset // window
+                rows = (
+                    numpy.arange(offset, offset + len(chunk)) // window - first
+                )
+                counts = numpy.bincount(
+                    rows * 256 + chunk, minlength=(int(rows[-1]) + 1) * 256
+                ).reshape(-1, 256)
+                indices = numpy.arange(first, first + len(counts))
+                if pending is not None:
+                    if pending[0][0] == first:
+                        counts[0] += pending[1][0]
+                    else:
+                        finish(*pending)
+                if len(counts) > 1:
+                    finish(indices[:-1], counts[:-1])
+                pending = indices[-1:], counts[-1:]
+            view.release()
+        if pending is not None:
+            finish(*pending)
+
+        if results:
+            indices, sizes, entropy, printable_ratio = (
+                numpy.concatenate(column) for column in zip(*results)
+            )
+        else:
+            indices = sizes = numpy.empty(0, dtype=numpy.int64)
+            entropy = printable_ratio = numpy.empty(0)
+        addresses = indices.astype(numpy.uint64) * numpy.uint64(window or 0)
+        return ImageByteMapStatistics(
+            start,
+            histogram,
+            window,
+            addresses + numpy.uint64(start),
+            sizes,
+            entropy,
+            printable_ratio,
+        )
+
+    def strings(
+        self,
+        start=None,  # type: typing.Optional[int]
+        stop=None,  # type: typing.Optional[int]
+        *,
+        min_length=4,  # type: int
+        encodings=("ascii", "utf-16le")  # type: typing.Iterable[str]
+    ):
+        # type: (...) -> typing.Iterator[typing.Tuple[int, str, str]]
+        """Find strings of printable ASCII characters (including tabs),
+        like the ``strings`` utility.
+
+        The regions are searched with compiled regular expressions,
+        without copying them. Strings continuing across the boundary
+        between contiguous spans are found whole. Views of the regions
+        are held while iterating, so the map should not be modified until
+        the iteration is finished; see :func:`gtirb.ImageByteMap.spans`.
+
+        :param start: The first address to search,
+            or None to start at the lowest mapped address.
+        :param stop: The address one past the end of the range to search,
+            or None to stop after the highest mapped address.
+        :param min_length: The fewest characters in a string.
+        :param encodings: The encodings to search for strings in:
+            any of ``"ascii"`` and ``"utf-16le"``.
+        :returns: Yields ``(address, encoding, text)`` tuples. Strings of
+            each encoding are yielded in ascending order by address.
+        """
+
+        if min_length < 1:
+            raise ValueError("min_length must be positive")
+        scanners = []
+        for encoding in encodings:
+            try:
+                unit, width = _STRING_UNITS[encoding]
+            except KeyError:
+                raise ValueError("unsupported encoding: %s" % encoding)
+            regex = re.compile(b"(?:%s){%d,}" % (unit, min_length))
+            scanners.append((encoding, regex, width))
+
+        # The bytes at the end of each span which may start a string
+        # continuing into the next span are carried over and searched
+        # again, joined to the start of the next span.
+        carries = [(0, b"")] * len(scanners)
+
+        def flush(i):
+            # type: (int) -> typing.Iterator[typing.Tuple[int, str, str]]
+            """Yield the strings in the bytes carried for a scanner."""
+
+            encoding, regex, _ = scanners[i]
+            address, data = carries[i]
+            for match in regex.finditer(data):
+                yield address + match.start(), encoding, (
+                    match.group().decode(encoding)
+                )
+            carries[i] = (0, b"")
+
+        for address, view in self.spans(start, stop):
+            found = []  # type: typing.List[typing.Tuple[int, str, str]]
+            for i, (encoding, regex, width) in enumerate(scanners):
+                base, data = carries[i]
+                if base + len(data) != address:
+                    found.extend(flush(i))
+                    base, data = address, b""
+                data = data + bytes(view) if data else view
+                keep = max(len(data) - (min_length + 1) * width + 1, 0)
+                for match in regex.finditer(data):
+                    if match.end() > len(data) - width:
+                        keep = match.start()
+                        break
+                    text = bytes(data[match.start() : match.end()])
+                    found.append(
+                        (base + match.start(), encoding, text.decode(encoding))
+                    )
+                    keep = max(keep, match.end())
+                carries[i] = (base + keep, bytes(data[keep:]))
+            view.release()
+            found.sort()
+            yield from found
+        for i in range(len(scanners)):
+            yield from flush(i)
+
+    def view(self, start, stop):
+        # type: (int, int) -> memoryview
+        """Get a view of the bytes in ``range(start, stop)`` without copying
+        them.
+
+        The view is read-only and shares memory with the map; see
+        :func:`gtirb.ImageByteMap.spans` for restrictions on modifying the
+        map while views are alive. If the range crosses a page boundary of
+        a region stored in pages, the view is of a copy instead.
+
+        :param start: The first address of the range.
+        :param stop: The address one past the end of the range.
+        :raises IndexError: if any address in the range is not mapped to
+            a byte.
+        """
+
+        if start == stop:
+            return memoryview(b"")
+        if start > stop:
+            raise IndexError("reverse slicing unsupported")
+        start_address = self._find_range(start, stop)
+        views = _region_views(
+            self._byte_map[start_address],
+            start - start_address,
+            stop - start_address,
+        )
+        if len(views) == 1:
+            return views[0].toreadonly()
+        return memoryview(b"".join(views))
+
+    def words_as_array(self, start, stop, width=4, byteorder="little"):
+        # type: (int, int, int, str) -> typing.Tuple[int, "numpy.ndarray"]
+        """Get a read-only NumPy array of the aligned unsigned integers in
+        ``range(start, stop)``, sharing memory with the map. Requires NumPy.
+
+        Only integers whose address is a multiple of ``width`` and which lie
+        entirely within the range are included.
+
+        :param start: The first address of the range.
+        :param stop: The address one past the end of the range.
+        :param width: The size of each integer in bytes: 1, 2, 4, or 8.
+        :param byteorder: Either ``"little"`` or ``"big"``.
+        :returns: A tuple ``(address, array)``, where ``address`` is the
+            address of the first integer in the array.
+        :raises IndexError: if the bytes of those integers are not all in
+            one region.
+        :raises ImportError: if NumPy is not installed.
+        """
+
+        _require_numpy()
+        if width not in (1, 2, 4, 8):
+            raise ValueError("width must be 1, 2, 4, or 8")
+        if byteorder not in ("little", "big"):
+            raise ValueError("byteorder must be either 'little' or 'big'")
+        endian = "<" if byteorder == "little" else ">"
+        dtype = numpy.dtype("%su%d" % (endian, width))
+        first = -(-start // width) * width
+        count = max((stop - first) // width, 0)
+        if count == 0:
+            return first, numpy.empty(0, dtype=dtype)
+        view = self.view(first, first + count * width)
+        return first, numpy.frombuffer(view, dtype=dtype)
+
     def __repr__(self):
         # type: () -> str
         return (
@@ -420,3 +2007,373 @@ class ImageByteMap(Node):
             "byte_map={_byte_map!r}, "
             ")".format(**self.__dict__)
         )
+
+
+class ImageByteMapSnapshot:
+    """A saved state of an :class:`ImageByteMap`,
+    returned by :meth:`ImageByteMap.snapshot`.
+
+    :ivar image_byte_map: The map this snapshot was taken of.
+    :cvar page_size: The granularity, in bytes, at which modified
+        contents of the map are saved.
+    """
+
+    page_size = 4096  # type: int
+
+    def __init__(self, image_byte_map, serial):
+        # type: (ImageByteMap, int) -> None
+        """
+        :param image_byte_map: The map this snapshot is taken of.
+        :param serial: The position of this snapshot in the order in which
+            snapshots of the map were taken.
+        """
+
+        self.image_byte_map = image_byte_map  # type: ImageByteMap
+        self._serial = serial  # type: int
+        self._valid = True  # type: bool
+        # Saved contents of each page modified since the snapshot was
+        # taken, keyed by the page's first address
+        self._pages = (
+            dict()
+        )  # type: typing.Dict[int, typing.List[typing.Tuple[int, bytes]]]
+        self._attributes = (
+            image_byte_map.addr_min,
+            image_byte_map.addr_max,
+            image_byte_map.base_address,
+            image_byte_map.entry_point_address,
+        )  # type: typing.Tuple[int, int, int, int]
+
+    def _save(self, start, stop):
+        # type: (int, int) -> None
+        """Save the contents of every page overlapping ``range(start, stop)``
+        which has not been saved yet.
+        """
+
+        page_size = self.page_size
+        page = start - start % page_size
+        while page < stop:
+            if page not in self._pages:
+                self._pages[page] = [
+                    (address, bytes(view))
+                    for address, view in self.image_byte_map.spans(
+                        page, page + page_size
+                    )
+                ]
+            page += page_size
+
+    @property
+    def valid(self):
+        # type: () -> bool
+        """Whether this snapshot can still be restored. Restoring a
+        snapshot invalidates all snapshots taken after it.
+        """
+
+        return self._valid
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "ImageByteMapSnapshot("
+            "image_byte_map={image_byte_map.uuid!r}, "
+            "saved_pages={saved_pages}, "
+            "valid={valid}"
+            ")".format(
+                image_byte_map=self.image_byte_map,
+                saved_pages=len(self._pages),
+                valid=self._valid,
+            )
+        )
+
+
+class ImageByteMapReader(io.RawIOBase):
+    """A seekable, read-only stream over the bytes of a
+    :class:`gtirb.ImageByteMap`, positioned by address.
+
+    The reader remembers the region it last read from, so sequential
+    reads only look up a region when they cross into a new one.
+    Reads never cross a gap in the map: a read stops at the end of the
+    current region, and reading at an unmapped address returns no bytes.
+
+    :ivar image_byte_map: The map being read.
+    """
+
+    _formats = {
+        (size, byteorder): struct.Struct(
+            ("<" if byteorder == "little" else ">") + code
+        )
+        for size, code in ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+        for byteorder in ("little", "big")
+    }
+
+    def __init__(self, image_byte_map, address):
+        # type: (ImageByteMap, int) -> None
+        """
+        :param image_byte_map: The map to read from.
+        :param address: The address to start reading at.
+        """
+
+        super().__init__()
+        self.image_byte_map = image_byte_map  # type: ImageByteMap
+        self._address = address  # type: int
+        self._region_start = 0  # type: int
+        self._region = bytearray()  # type: _Region
+        self._version = None  # type: typing.Optional[int]
+
+    def _current_region(self):
+        # type: () -> int
+        """Make the region containing the current address the cached
+        region, and get the offset of the current address in it.
+
+        :returns: The offset of the current address in ``_region``, or -1
+            if the current address is not mapped to a byte.
+        """
+
+        offset = self._address - self._region_start
+        if (
+            self._version == self.image_byte_map._version
+            and 0 <= offset < len(self._region)
+        ):
+            return offset
+        if self.closed:
+            raise ValueError("I/O operation on closed reader")
+        if self._address not in self.image_byte_map:
+            return -1
+        self._region_start = self.image_byte_map._find_start(self._address)
+        self._region = self.image_byte_map._byte_map[self._region_start]
+        self._version = self.image_byte_map._version
+        return self._address - self._region_start
+
+    def _read_int(self, size, byteorder):
+        # type: (int, str) -> int
+        offset = self._current_region()
+        if offset < 0 or offset + size > len(self._region):
+            raise IndexError(
+                "no %d contiguous bytes at %d" % (size, self._address)
+            )
+        try:
+            unpacker = self._formats[(size, byteorder)]
+        except KeyError:
+            raise ValueError("byteorder must be either 'little' or 'big'")
+        self._address += size
+        region = self._region
+        if isinstance(region, _PagedRegion):
+            region = b"".join(region.views(offset, offset + size))
+            offset = 0
+        return unpacker.unpack_from(region, offset)[0]
+
+    def close(self):
+        # type: () -> None
+        super().close()
+        # Drop the cached region so that further reads fail
+        self._version = None
+        self._region = bytearray()
+
+    def read(self, size=-1):
+        # type: (typing.Optional[int]) -> bytes
+        """Read up to ``size`` bytes, stopping at the end of the current
+        region. If ``size`` is negative or None, read the rest of it.
+        """
+
+        offset = self._current_region()
+        if offset < 0:
+            return b""
+        end = len(self._region)
+        if size is not None and size >= 0:
+            end = min(end, offset + size)
+        self._address += end - offset
+        return b"".join(_region_views(self._region, offset, end))
+
+    def readable(self):
+        # type: () -> bool
+        return True
+
+    def readinto(self, buffer):
+        # type: (typing.Any) -> int
+        """Read bytes into a pre-allocated, writable bytes-like object,
+        stopping at the end of the current region.
+
+        :returns: The number of bytes read.
+        """
+
+        offset = self._current_region()
+        if offset < 0:
+            return 0
+        with memoryview(buffer) as view, view.cast("B") as out:
+            size = min(len(out), len(self._region) - offset)
+            position = 0
+            for region in _region_views(self._region, offset, offset + size):
+                with region:
+                    out[position : position + len(region)] = region
+                    position += len(region)
+        self._address += size
+        return size
+
+    def read_u8(self):
+        # type: () -> int
+        """Read an unsigned byte.
+
+        :raises IndexError: if the current address is not mapped to a byte.
+        """
+
+        # Bytes are read one at a time often enough to warrant a fast path
+        offset = self._address - self._region_start
+        if self._version != self.image_byte_map._version or not (
+            0 <= offset < len(self._region)
+        ):
+            offset = self._current_region()
+            if offset < 0:
+                raise IndexError("no contents at %d" % self._address)
+        self._address += 1
+        return self._region[offset]
+
+    def read_u16(self, byteorder="little"):
+        # type: (str) -> int
+        """Read an unsigned 16-bit integer.
+
+        :param byteorder: Either ``"little"`` or ``"big"``.
+        :raises IndexError: if the integer does not lie within one region.
+        """
+
+        return self._read_int(2, byteorder)
+
+    def read_u32(self, byteorder="little"):
+        # type: (str) -> int
+        """Read an unsigned 32-bit integer.
+
+        :param byteorder: Either ``"little"`` or ``"big"``.
+        :raises IndexError: if the integer does not lie within one region.
+        """
+
+        return self._read_int(4, byteorder)
+
+    def read_u64(self, byteorder="little"):
+        # type: (str) -> int
+        """Read an unsigned 64-bit integer.
+
+        :param byteorder: Either ``"little"`` or ``"big"``.
+        :raises IndexError: if the integer does not lie within one region.
+        """
+
+        return self._read_int(8, byteorder)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # type: (int, int) -> int
+        """Change the current address.
+
+        :param offset: The new address if ``whence`` is ``io.SEEK_SET``,
+            or an offset from the current address if it is ``io.SEEK_CUR``,
+            or from one past ``addr_max`` if it is ``io.SEEK_END``.
+        :param whence: How to interpret ``offset``.
+        :returns: The new address.
+        """
+
+        if self.closed:
+            raise ValueError("I/O operation on closed reader")
+        if whence == io.SEEK_SET:
+            address = offset
+        elif whence == io.SEEK_CUR:
+            address = self._address + offset
+        elif whence == io.SEEK_END:
+            address = self.image_byte_map.addr_max + 1 + offset
+        else:
+            raise ValueError("invalid whence (%r)" % whence)
+        if address < 0:
+            raise ValueError("negative seek address %d" % address)
+        self._address = address
+        return address
+
+    def seekable(self):
+        # type: () -> bool
+        return True
+
+    def tell(self):
+        # type: () -> int
+        """Get the current address."""
+
+        return self._address
+
+
+class ImageByteMapStatistics:
+    """Statistics of the mapped bytes in a range of addresses of an
+    :class:`ImageByteMap`, returned by :meth:`ImageByteMap.statistics`.
+
+    :ivar address: The first address of the range.
+    :ivar histogram: A NumPy array of the number of times each byte value
+        occurs in the range.
+    :ivar window: The number of addresses in each window,
+        or None if the range was not split into windows.
+    :ivar window_addresses: A NumPy array of the first address of each
+        window holding mapped bytes, in ascending order.
+    :ivar window_sizes: A NumPy array of the number of mapped bytes in
+        each window.
+    :ivar window_entropy: A NumPy array of the entropy of each window;
+        see :attr:`entropy`.
+    :ivar window_printable: A NumPy array of the fraction of printable
+        bytes in each window; see :attr:`printable_ratio`.
+    """
+
+    def __init__(
+        self,
+        address,  # type: int
+        histogram,  # type: numpy.ndarray
+        window,  # type: typing.Optional[int]
+        window_addresses,  # type: numpy.ndarray
+        window_sizes,  # type: numpy.ndarray
+        window_entropy,  # type: numpy.ndarray
+        window_printable,  # type: numpy.ndarray
+    ):
+        # type: (...) -> None
+        self.address = address  # type: int
+        self.histogram = histogram  # type: numpy.ndarray
+        self.window = window  # type: typing.Optional[int]
+        self.window_addresses = window_addresses  # type: numpy.ndarray
+        self.window_sizes = window_sizes  # type: numpy.ndarray
+        self.window_entropy = window_entropy  # type: numpy.ndarray
+        self.window_printable = window_printable  # type: numpy.ndarray
+
+    @property
+    def entropy(self):
+        # type: () -> float
+        """The Shannon entropy of the bytes in the range, in bits per byte:
+        0 if every byte is the same, and 8 if every value is equally common.
+        """
+
+        return float(_entropy(self.histogram))
+
+    @property
+    def printable_ratio(self):
+        # type: () -> float
+        """The fraction of the bytes in the range which are printable ASCII
+        characters, as listed in :data:`string.printable`.
+        """
+
+        return float(self.histogram[list(_PRINTABLE)].sum()) / max(
+            self.size, 1
+        )
+
+    @property
+    def size(self):
+        # type: () -> int
+        """The number of mapped bytes in the range."""
+
+        return int(self.histogram.sum())
+
+    def __repr__(self):
+        # type: () -> str
+        return (
+            "ImageByteMapStatistics("
+            "address={address:#x}, "
+            "size={size}, "
+            "entropy={entropy:.3f}, "
+            "printable_ratio={printable_ratio:.3f}, "
+            "window={window}, "
+            "windows={windows}"
+            ")".format(
+                address=self.address,
+                size=self.size,
+                entropy=self.entropy,
+                printable_ratio=self.printable_ratio,
+                window=self.window,
+                windows=len(self.window_addresses),
+            )
+        )
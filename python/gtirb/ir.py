@@ -1,12 +1,12 @@
 """The IR is the core class for reading and writing GTIRB files.
 
-    You can open a GTIRB Protobuf file and load it into an IR instance:
+You can open a GTIRB Protobuf file and load it into an IR instance:
 
-    >>> ir = IR.load_protobuf('filename.gtirb')
+>>> ir = IR.load_protobuf('filename.gtirb')
 
-    And then you can write the IR instance as a Protobuf file:
+And then you can write the IR instance as a Protobuf file:
 
-    >>> ir.save_protobuf('filename.gtirb')
+>>> ir.save_protobuf('filename.gtirb')
 """
 
 import IR_pb2
@@ -14,10 +14,226 @@ import typing
 from uuid import UUID
 
 from .auxdata import AuxData, AuxDataContainer
-from .module import Module
+from .block import Block, ProxyBlock
+from .module import CfgNode, Edge, Module
+from .node import Node
+from .symbol import Symbol
 from .util import DictLike
 
 
+class LinkedCFG:
+    """The control flow graphs of the modules of an IR, linked into one
+    graph by resolving each :class:`gtirb.ProxyBlock` to the block in some
+    module that defines it. Get one from :meth:`gtirb.IR.linked_cfg`.
+
+    A ``ProxyBlock`` is resolved through the symbols referring to it. Each
+    symbol is followed through the ``symbolForwarding`` tables of the
+    modules, and the last symbol along the way that names a definition
+    gives the block. A definition is a symbol referring to a
+    :class:`gtirb.Block` that is neither ``Extern``, ``Static``, nor
+    ``Local``; where modules define the same name, the first module in the
+    IR wins. ``ProxyBlock``\\s that cannot be resolved are left in the graph.
+
+    The module CFGs are not copied: queries look up a node in the CFG of its
+    module, replacing resolved ``ProxyBlock``\\s with the blocks they resolve
+    to. Changes to the CFGs are seen, but changes to the modules, their
+    symbols, or the ``symbolForwarding`` tables need a new ``LinkedCFG``.
+    """
+
+    _linkable = frozenset(
+        (Symbol.StorageKind.Normal, Symbol.StorageKind.Undefined)
+    )
+
+    def __init__(
+        self,
+        modules,  # type: typing.Iterable[Module]
+        forwarding=dict(),  # type: typing.Mapping[Symbol, Symbol]
+    ):
+        # type: (...) -> None
+        """
+        :param modules: The modules to link, in link order.
+        :param forwarding: Symbol forwarding in addition to the
+            ``symbolForwarding`` tables of the modules.
+        """
+
+        modules = list(modules)
+        # The module of each node, the blocks defining each name, and all
+        # the symbol forwarding
+        self._modules = dict()  # type: typing.Dict[CfgNode, Module]
+        definitions = dict()  # type: typing.Dict[str, Block]
+        tables = [forwarding]  # type: typing.List[typing.Mapping]
+        for module in modules:
+            for node in module.blocks | module.proxies:
+                self._modules.setdefault(node, module)
+            for symbol in module.symbols:
+                if (
+                    isinstance(symbol.referent, Block)
+                    and symbol.storage_kind in self._linkable
+                ):
+                    definitions.setdefault(symbol.name, symbol.referent)
+            table = module.aux_data.get("symbolForwarding")
+            if table is not None:
+                tables.append(table.data)
+        forwards = dict()  # type: typing.Dict[Symbol, Symbol]
+        for table in tables:
+            for source, target in table.items():
+                source, target = self._symbol(source), self._symbol(target)
+                if source is not None and target is not None:
+                    forwards.setdefault(source, target)
+
+        # The block each ProxyBlock resolves to, and the ProxyBlocks
+        # resolving to each block
+        self._resolved = dict()  # type: typing.Dict[ProxyBlock, Block]
+        self._proxies = (
+            dict()
+        )  # type: typing.Dict[Block, typing.List[CfgNode]]
+        for module in modules:
+            for symbol in module.symbols:
+                proxy = symbol.referent
+                if (
+                    not isinstance(proxy, ProxyBlock)
+                    or proxy in self._resolved
+                ):
+                    continue
+                block = self._definition(symbol, forwards, definitions)
+                if block is not None:
+                    self._resolved[proxy] = block
+                    self._proxies.setdefault(block, []).append(proxy)
+
+    def _aliases(self, node):
+        # type: (CfgNode) -> typing.Iterator[typing.Tuple[Module, CfgNode]]
+        """Iterate over a resolved node and the ProxyBlocks resolving to it,
+        each with its module.
+        """
+
+        node = self.resolve(node)
+        for alias in [node] + self._proxies.get(node, []):
+            module = self._modules.get(alias)
+            if module is not None:
+                yield module, alias
+
+    @staticmethod
+    def _definition(symbol, forwards, definitions):
+        # type: (Symbol, typing.Any, typing.Any) -> typing.Optional[Block]
+        """Find the block defining a symbol, or None."""
+
+        chain = [symbol]
+        seen = {symbol}
+        while chain[-1] in forwards and forwards[chain[-1]] not in seen:
+            chain.append(forwards[chain[-1]])
+            seen.add(chain[-1])
+        for symbol in reversed(chain):
+            if isinstance(symbol.referent, Block):
+                return symbol.referent
+            block = definitions.get(symbol.name)
+            if block is not None:
+                return block
+        return None
+
+    @staticmethod
+    def _symbol(value):
+        # type: (typing.Any) -> typing.Optional[Symbol]
+        """Get the symbol in an entry of a ``symbolForwarding`` table, or
+        None if it is not a symbol. Entries naming symbols in modules that
+        were decoded after the table are left as UUIDs by decoding, so
+        these are looked up now.
+        """
+
+        if isinstance(value, UUID):
+            value = Node._uuid_cache.get(value)
+        return value if isinstance(value, Symbol) else None
+
+    def in_edges(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[Edge]
+        """Iterate over the edges whose target is a node, or a
+        :class:`gtirb.ProxyBlock` resolving to it. The edges are those of the
+        module CFGs, so their targets are not resolved.
+
+        :param node: The node.
+        :param types: The types of edge to include, or None to include every
+            edge. Edges without labels have no type.
+        """
+
+        for module, alias in self._aliases(node):
+            yield from module.cfg.in_edges(alias, types)
+
+    def out_edges(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[Edge]
+        """Iterate over the edges whose source is a node. The edges are
+        those of the module CFGs, so their targets are not resolved.
+
+        :param node: The node.
+        :param types: The types of edge to include, or None to include every
+            edge. Edges without labels have no type.
+        """
+
+        node = self.resolve(node)
+        module = self._modules.get(node)
+        if module is not None:
+            yield from module.cfg.out_edges(node, types)
+
+    def predecessors(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[CfgNode]
+        """Iterate over the sources of the edges whose target is a node, or
+        a :class:`gtirb.ProxyBlock` resolving to it. Each source is produced
+        once.
+
+        :param node: The node.
+        :param types: The types of edge to follow, or None to follow every
+            edge. Edges without labels have no type.
+        """
+
+        seen = set()  # type: typing.Set[CfgNode]
+        for module, alias in self._aliases(node):
+            for source in module.cfg.predecessors(alias, types):
+                source = self.resolve(source)
+                if source not in seen:
+                    seen.add(source)
+                    yield source
+
+    def resolve(self, node):
+        # type: (CfgNode) -> CfgNode
+        """Get the block a :class:`gtirb.ProxyBlock` resolves to, or the
+        node itself if it is not a resolved ``ProxyBlock``.
+        """
+
+        return self._resolved.get(node, node)  # type: ignore
+
+    def successors(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[CfgNode]
+        """Iterate over the targets of the edges whose source is a node,
+        with resolved :class:`gtirb.ProxyBlock`\\s replaced by the blocks
+        they resolve to. Each target is produced once.
+
+        :param node: The node.
+        :param types: The types of edge to follow, or None to follow every
+            edge. Edges without labels have no type.
+        """
+
+        seen = set()  # type: typing.Set[CfgNode]
+        for edge in self.out_edges(node, types):
+            target = self.resolve(edge.target)
+            if target not in seen:
+                seen.add(target)
+                yield target
+
+
 class IR(AuxDataContainer):
     """A complete internal representation consisting of multiple Modules.
 
@@ -78,6 +294,22 @@ class IR(AuxDataContainer):
                 return False
         return True
 
+    def linked_cfg(self):
+        # type: () -> LinkedCFG
+        """Link the CFGs of the modules into one graph, resolving
+        :class:`gtirb.ProxyBlock`\\s to the blocks defining them in other
+        modules. Forwarding in a ``symbolForwarding`` table of the IR is
+        followed as well as that in the tables of the modules.
+
+        The index of definitions is built once, in time proportional to the
+        number of blocks and symbols, and queries take time proportional to
+        the size of the result. See :class:`gtirb.LinkedCFG` for which
+        changes the graph follows.
+        """
+
+        table = self.aux_data.get("symbolForwarding")
+        return LinkedCFG(self.modules, {} if table is None else table.data)
+
     @staticmethod
     def load_protobuf_file(protobuf_file):
         # type: (typing.BinaryIO) -> IR
@@ -1,4 +1,6 @@
+from bisect import bisect_left
 from enum import Enum
+from fnmatch import fnmatchcase
 from uuid import UUID
 import CFG_pb2
 import Module_pb2
@@ -7,19 +9,25 @@ import typing
 
 from .auxdata import AuxData, AuxDataContainer
 from .block import Block, ProxyBlock
+from .cfganalysis import CallGraph, CFGAnalysis
 from .dataobject import DataObject
-from .imagebytemap import ImageByteMap
+from .imagebytemap import ImageByteMap, ImageByteMapStatistics
 from .node import Node
 from .section import Section
-from .symbol import Symbol
+from .symbol import Referent, Symbol
 from .symbolicexpression import (
     SymAddrAddr,
     SymAddrConst,
     SymStackConst,
     SymbolicOperand,
 )
-from .util import DictLike
-
+from .util import (
+    DictLike,
+    ObservedAttribute,
+    ObservedDict,
+    ObservedSet,
+    SortedList,
+)
 
 CfgNode = typing.Union[Block, ProxyBlock]
 """A type hint for nodes in the CFG."""
@@ -242,6 +250,544 @@ class Edge:
         )
 
 
+_Adjacency = typing.Dict[CfgNode, typing.List[Edge]]
+
+
+class CFG(ObservedSet):
+    """The control flow graph of a :class:`gtirb.Module`: a ``set`` of
+    :class:`gtirb.Edge`\\s which also indexes its edges by source and
+    target, so the edges leaving or entering a node can be found without
+    scanning every edge.
+
+    The index is built when the graph is first queried, and then kept
+    current as edges are added to and removed from the set. Edges must not
+    be modified while in the set, as their hashes would change.
+    """
+
+    def __init__(self, edges=()):
+        # type: (typing.Iterable[Edge]) -> None
+        """
+        :param edges: The edges of the graph.
+        """
+
+        super().__init__(edges, on_change=self._edges_changed)
+        # For each node, the nodes it has edges to or from, each mapped to
+        # a list of those edges, or None until the graph is first queried.
+        # Both maps share the lists, which are short and so are cheaper than
+        # sets of edges, whose hashes are slow.
+        self._successors = (
+            None
+        )  # type: typing.Optional[typing.Dict[CfgNode, _Adjacency]]
+        self._predecessors = (
+            None
+        )  # type: typing.Optional[typing.Dict[CfgNode, _Adjacency]]
+        # Counts changes, so that analyses of the graph can tell whether
+        # they are out of date
+        self._changes = 0  # type: int
+
+    def _adjacency(self):
+        # type: () -> typing.Tuple[typing.Dict[CfgNode, _Adjacency], ...]
+        """Get the maps of each node's successors and predecessors,
+        building them if the graph has not been queried before.
+        """
+
+        if self._successors is None or self._predecessors is None:
+            self._successors = dict()
+            self._predecessors = dict()
+            self._index_edges(self, ())
+        return self._successors, self._predecessors
+
+    def _edges_changed(self, added, removed):
+        # type: (typing.Iterable[Edge], typing.Iterable[Edge]) -> None
+        self._changes += 1
+        if self._successors is not None:
+            self._index_edges(added, removed)
+
+    def _index_edges(self, added, removed):
+        # type: (typing.Iterable[Edge], typing.Iterable[Edge]) -> None
+        """Update the maps of successors and predecessors."""
+
+        successors, predecessors = self._successors, self._predecessors
+        assert successors is not None and predecessors is not None
+        for edge in removed:
+            targets = successors.get(edge.source, {})
+            parallel = targets.get(edge.target, [])
+            if edge in parallel:
+                parallel.remove(edge)
+            if parallel:
+                continue
+            targets.pop(edge.target, None)
+            if not targets:
+                successors.pop(edge.source, None)
+            sources = predecessors.get(edge.target, {})
+            sources.pop(edge.source, None)
+            if not sources:
+                predecessors.pop(edge.target, None)
+        for edge in added:
+            source, target = edge.source, edge.target
+            targets = successors.get(source)
+            if targets is None:
+                targets = successors[source] = dict()
+            parallel = targets.get(target)
+            if parallel is not None:
+                parallel.append(edge)
+                continue
+            targets[target] = parallel = [edge]
+            sources = predecessors.get(target)
+            if sources is None:
+                sources = predecessors[target] = dict()
+            sources[source] = parallel
+
+    @staticmethod
+    def _edges_of(adjacent, types):
+        # type: (_Adjacency, typing.Any) -> typing.Iterator[Edge]
+        """Iterate over the edges to or from a node with a type in types."""
+
+        for parallel in adjacent.values():
+            for edge in parallel:
+                if types is None or (
+                    edge.label is not None and edge.label.type in types
+                ):
+                    yield edge
+
+    @staticmethod
+    def _nodes_of(adjacent, types):
+        # type: (_Adjacency, typing.Any) -> typing.Iterator[CfgNode]
+        """Iterate over the nodes adjacent to a node by an edge with a type
+        in types.
+        """
+
+        for node, parallel in adjacent.items():
+            if types is None or any(
+                edge.label is not None and edge.label.type in types
+                for edge in parallel
+            ):
+                yield node
+
+    def in_edges(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[Edge]
+        """Iterate over the edges whose target is a node.
+
+        :param node: The node.
+        :param types: The types of edge to include, or None to include every
+            edge. Edges without labels have no type.
+        """
+
+        return self._edges_of(self._adjacency()[1].get(node, {}), types)
+
+    def out_edges(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[Edge]
+        """Iterate over the edges whose source is a node.
+
+        :param node: The node.
+        :param types: The types of edge to include, or None to include every
+            edge. Edges without labels have no type.
+        """
+
+        return self._edges_of(self._adjacency()[0].get(node, {}), types)
+
+    def predecessors(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[CfgNode]
+        """Iterate over the sources of the edges whose target is a node.
+        Each source is produced once, however many edges it has to the node.
+
+        :param node: The node.
+        :param types: The types of edge to follow, or None to follow every
+            edge. Edges without labels have no type.
+        """
+
+        return self._nodes_of(self._adjacency()[1].get(node, {}), types)
+
+    def successors(
+        self,
+        node,  # type: CfgNode
+        types=None,  # type: typing.Optional[typing.Container[Edge.Type]]
+    ):
+        # type: (...) -> typing.Iterator[CfgNode]
+        """Iterate over the targets of the edges whose source is a node.
+        Each target is produced once, however many edges it has from the node.
+
+        :param node: The node.
+        :param types: The types of edge to follow, or None to follow every
+            edge. Edges without labels have no type.
+        """
+
+        return self._nodes_of(self._adjacency()[0].get(node, {}), types)
+
+
+AddressedNode = typing.Union[Block, DataObject, Section]
+"""A type hint for nodes indexed by address."""
+
+
+class _AddressIndex:
+    """An index of a set of nodes by the range of addresses each occupies,
+    ``range(node.address, node.address + node.size)``.
+
+    The index is built on the first query, as an implicit binary search
+    tree over the ranges sorted by address, in which each subtree records
+    the highest address covered by its ranges. Queries take logarithmic
+    time plus time proportional to the number of results.
+
+    Changes made after that are noted, rather than rebuilding the tree:
+    the tree's entries for nodes that were removed or moved are skipped,
+    and nodes that were added or moved are checked one by one. The tree
+    is rebuilt once enough changes accumulate. The nodes' ``address`` and
+    ``size`` must be :class:`gtirb.util.ObservedAttribute`\\s, which the
+    index observes from the first query until it is given new nodes.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._nodes = set()  # type: typing.Set[AddressedNode]
+        # The tree, as parallel lists sorted by range, or None if unbuilt
+        self._starts = None  # type: typing.Optional[typing.List[int]]
+        self._stops = []  # type: typing.List[int]
+        self._max_stops = []  # type: typing.List[int]
+        self._sorted = []  # type: typing.List[AddressedNode]
+        # Nodes whose entries in the tree are out of date
+        self._stale = set()  # type: typing.Set[AddressedNode]
+        # Nodes added or moved since the tree was built
+        self._pending = set()  # type: typing.Set[AddressedNode]
+
+    def _build(self):
+        # type: () -> None
+        """(Re)build the tree from the current set of nodes."""
+
+        nodes = sorted(self._nodes, key=lambda n: (n.address, n.size))
+        self._starts = [node.address for node in nodes]
+        self._stops = stops = [node.address + node.size for node in nodes]
+        self._sorted = nodes
+        self._stale.clear()
+        self._pending.clear()
+
+        # The subtree rooted at index mid covers the indices [lo, hi), with
+        # mid = (lo + hi) // 2. Record the highest stop in each subtree.
+        max_stops = list(stops)
+
+        def record(lo, hi):
+            # type: (int, int) -> int
+            mid = (lo + hi) // 2
+            highest = stops[mid]
+            if lo < mid:
+                highest = max(highest, record(lo, mid))
+            if mid + 1 < hi:
+                highest = max(highest, record(mid + 1, hi))
+            max_stops[mid] = highest
+            return highest
+
+        if nodes:
+            record(0, len(nodes))
+        self._max_stops = max_stops
+
+    def _current(self):
+        # type: () -> None
+        """Build or rebuild the tree if it is missing or too out of date."""
+
+        if self._starts is None:
+            for node in self._nodes:
+                ObservedAttribute.observe(node, self)
+            self._build()
+        elif (
+            len(self._stale) + len(self._pending) > 64 + len(self._nodes) // 8
+        ):
+            self._build()
+
+    def _finish(self, found, test):
+        # type: (typing.List[AddressedNode], typing.Callable) -> list
+        """Add the pending nodes passing a test to nodes found in the
+        tree, and sort them by address.
+        """
+
+        if self._stale:
+            found = [node for node in found if node not in self._stale]
+        found.extend(
+            node
+            for node in self._pending
+            if node in self._nodes and test(node.address, node.size)
+        )
+        found.sort(key=lambda n: (n.address, n.size))
+        return found
+
+    def at(self, start, stop):
+        # type: (int, int) -> typing.List[AddressedNode]
+        """Find the nodes whose address is in ``range(start, stop)``."""
+
+        self._current()
+        assert self._starts is not None
+        lo = bisect_left(self._starts, start)
+        hi = bisect_left(self._starts, stop, lo)
+        return self._finish(
+            self._sorted[lo:hi],
+            lambda address, size: start <= address < stop,
+        )
+
+    def attribute_changed(self, node, name, old_value):
+        # type: (AddressedNode, str, int) -> None
+        if self._starts is not None and node in self._nodes:
+            self._stale.add(node)
+            self._pending.add(node)
+
+    def nodes_changed(self, added, removed):
+        # type: (typing.Iterable, typing.Iterable) -> None
+        if self._starts is None:
+            return
+        for node in removed:
+            ObservedAttribute.unobserve(node, self)
+            self._stale.add(node)
+            self._pending.discard(node)
+        for node in added:
+            ObservedAttribute.observe(node, self)
+        self._pending.update(added)
+
+    def on(self, start, stop):
+        # type: (int, int) -> typing.List[AddressedNode]
+        """Find the nodes occupying any address in ``range(start, stop)``."""
+
+        self._current()
+        starts, stops, max_stops = self._starts, self._stops, self._max_stops
+        assert starts is not None
+        found = []
+        subtrees = [(0, len(starts))]
+        while subtrees:
+            lo, hi = subtrees.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if max_stops[mid] <= start:
+                continue
+            subtrees.append((lo, mid))
+            if starts[mid] < stop:
+                if stops[mid] > start and stops[mid] > starts[mid]:
+                    found.append(mid)
+                subtrees.append((mid + 1, hi))
+        found.sort()
+
+        def overlaps(address, size):
+            # type: (int, int) -> bool
+            return size > 0 and address < stop and address + size > start
+
+        return self._finish([self._sorted[i] for i in found], overlaps)
+
+    def reset(self, nodes):
+        # type: (typing.Set[AddressedNode]) -> None
+        """Index a new set of nodes. The tree is built on the next query."""
+
+        if self._starts is not None:
+            for node in self._nodes:
+                ObservedAttribute.unobserve(node, self)
+        self._nodes = nodes
+        self._starts = None
+        self._stale.clear()
+        self._pending.clear()
+
+
+_Operands = typing.List[typing.Tuple[int, SymbolicOperand]]
+
+
+class _OperandIndex:
+    """An index of the addresses of a ``dict`` of symbolic operands, kept
+    in a :class:`gtirb.util.SortedList`.
+
+    The index is built on the first query, taking ``O(n log n)`` time, and
+    then updated as operands are added or removed, taking ``O(log n)``
+    time per change.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._operands = dict()  # type: typing.Dict[int, SymbolicOperand]
+        # The sorted addresses, or None if unbuilt
+        self._addresses = None  # type: typing.Optional[SortedList[int]]
+
+    def between(self, start, stop):
+        # type: (int, int) -> _Operands
+        """Find the operands at addresses in ``range(start, stop)``."""
+
+        if self._addresses is None:
+            self._addresses = SortedList(self._operands)
+        if stop <= start:
+            return []
+        operands = self._operands
+        return [
+            (address, operands[address])
+            for address in self._addresses.irange(start, stop - 1)
+        ]
+
+    def keys_changed(self, added, removed):
+        # type: (typing.Iterable[int], typing.Iterable[int]) -> None
+        if self._addresses is None:
+            return
+        for address in removed:
+            self._addresses.remove(address)
+        for address in added:
+            self._addresses.add(address)
+
+    def reset(self, operands):
+        # type: (typing.Dict[int, SymbolicOperand]) -> None
+        """Index a new dict of operands. The index is built on the next
+        query.
+        """
+
+        self._operands = operands
+        self._addresses = None
+
+
+class _SymbolIndex:
+    """An index of a set of symbols by name and by payload, the referent
+    or value of each symbol, with the names kept sorted for searches by
+    pattern.
+
+    The index is built on the first query, taking ``O(n log n)`` time, and
+    then updated as symbols are added to or removed from the set, or
+    renamed or given new payloads, taking ``O(log n)`` time per change.
+    The symbols are observed from the first query until the index is
+    given new symbols.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._symbols = set()  # type: typing.Set[Symbol]
+        # The maps, or None if unbuilt
+        self._by_name = (
+            None
+        )  # type: typing.Optional[typing.Dict[str, typing.Set[Symbol]]]
+        self._by_payload = (
+            dict()
+        )  # type: typing.Dict[typing.Any, typing.Set[Symbol]]
+        self._names = SortedList()  # type: SortedList[str]
+
+    def _add(self, symbol, name, payload):
+        # type: (Symbol, typing.Any, typing.Any) -> None
+        """Index a symbol under a name and a payload, either of which may
+        be None to leave it out.
+        """
+
+        assert self._by_name is not None
+        if name is not None:
+            named = self._by_name.get(name)
+            if named is None:
+                named = self._by_name[name] = set()
+                self._names.add(name)
+            named.add(symbol)
+        if payload is not None:
+            self._by_payload.setdefault(payload, set()).add(symbol)
+
+    def _current(self):
+        # type: () -> typing.Dict[str, typing.Set[Symbol]]
+        """Build the index if it is missing."""
+
+        if self._by_name is None:
+            self._by_name = dict()
+            self._by_payload = dict()
+            for symbol in self._symbols:
+                ObservedAttribute.observe(symbol, self)
+                self._by_name.setdefault(symbol.name, set()).add(symbol)
+                if symbol._payload is not None:
+                    self._by_payload.setdefault(symbol._payload, set()).add(
+                        symbol
+                    )
+            self._names = SortedList(self._by_name)
+        return self._by_name
+
+    def _discard(self, symbol, name, payload):
+        # type: (Symbol, typing.Any, typing.Any) -> None
+        """Remove a symbol from under a name and a payload, either of which
+        may be None to leave it in place.
+        """
+
+        assert self._by_name is not None
+        if name is not None:
+            named = self._by_name.get(name)
+            if named is not None:
+                named.discard(symbol)
+                if not named:
+                    del self._by_name[name]
+                    self._names.remove(name)
+        if payload is not None:
+            found = self._by_payload.get(payload)
+            if found is not None:
+                found.discard(symbol)
+                if not found:
+                    del self._by_payload[payload]
+
+    def attribute_changed(self, symbol, name, old_value):
+        # type: (Symbol, str, typing.Any) -> None
+        if self._by_name is None or symbol not in self._symbols:
+            return
+        if name == "name":
+            self._discard(symbol, old_value, None)
+            self._add(symbol, symbol.name, None)
+        else:
+            self._discard(symbol, None, old_value)
+            self._add(symbol, None, symbol._payload)
+
+    def matching(self, pattern):
+        # type: (str) -> typing.Iterator[Symbol]
+        """Iterate over the symbols whose names match a glob pattern, in
+        order of name.
+        """
+
+        by_name = self._current()
+        prefix = pattern
+        for i, char in enumerate(pattern):
+            if char in "*?[":
+                prefix = pattern[:i]
+                break
+        for name in self._names.irange(prefix):
+            if not name.startswith(prefix):
+                return
+            if fnmatchcase(name, pattern):
+                yield from by_name[name]
+
+    def named(self, name):
+        # type: (str) -> typing.Set[Symbol]
+        """Get the symbols with a name."""
+
+        return set(self._current().get(name, ()))
+
+    def nodes_changed(self, added, removed):
+        # type: (typing.Iterable, typing.Iterable) -> None
+        if self._by_name is None:
+            return
+        for symbol in removed:
+            ObservedAttribute.unobserve(symbol, self)
+            self._discard(symbol, symbol.name, symbol._payload)
+        for symbol in added:
+            ObservedAttribute.observe(symbol, self)
+            self._add(symbol, symbol.name, symbol._payload)
+
+    def reset(self, symbols):
+        # type: (typing.Set[Symbol]) -> None
+        """Index a new set of symbols. The index is built on the next
+        query.
+        """
+
+        if self._by_name is not None:
+            for symbol in self._symbols:
+                ObservedAttribute.unobserve(symbol, self)
+        self._symbols = symbols
+        self._by_name = None
+
+    def with_payload(self, payload):
+        # type: (typing.Any) -> typing.Set[Symbol]
+        """Get the symbols with a referent or value."""
+
+        self._current()
+        return set(self._by_payload.get(payload, ()))
+
+
 class Module(AuxDataContainer):
     """Represents a loadable object, such as an executable or library.
 
@@ -252,6 +798,9 @@ class Module(AuxDataContainer):
         currently exist or have the same contents.
     :ivar blocks: A set containing all the :class:`gtirb.Block`\\s
         in the binary.
+    :ivar cfg: A :class:`gtirb.CFG` containing all the :class:`gtirb.Edge`\\s
+        in the control flow graph of the binary. Sets assigned to it are
+        copied into a :class:`gtirb.CFG`.
     :ivar data: A set containing all the :class:`gtirb.DataObject`\\s
         in the binary.
     :ivar image_byte_map: A :class:`gtirb.ImageByteMap` containing the raw
@@ -394,6 +943,25 @@ class Module(AuxDataContainer):
         if image_byte_map is None:
             image_byte_map = ImageByteMap()
 
+        # Indexes of the sets of nodes by address, keyed by the attribute
+        # holding each set; see __setattr__
+        self._address_indexes = {
+            "blocks": _AddressIndex(),
+            "data": _AddressIndex(),
+            "sections": _AddressIndex(),
+        }  # type: typing.Dict[str, _AddressIndex]
+        # The indexes of the symbols and of the addresses of the symbolic
+        # operands; see __setattr__
+        self._symbol_index = _SymbolIndex()
+        self._operand_index = _OperandIndex()
+        # Analyses of the CFG by the arguments to cfg_analysis, each with
+        # what it was computed from; see cfg_analysis
+        self._cfg_analyses = (
+            dict()
+        )  # type: typing.Dict[typing.Tuple, typing.Tuple]
+        # The call graph, with what it was computed from; see call_graph
+        self._call_graph = None  # type: typing.Optional[typing.Tuple]
+
         self.binary_path = binary_path  # type: str
         self.blocks = set(blocks)  # type: typing.Set[Block]
         self.data = set(data)  # type: typing.Set[DataObject]
@@ -412,7 +980,27 @@ class Module(AuxDataContainer):
 
         # Initialize the CFG and aux data last so that the cache is populated
         super().__init__(aux_data, uuid)
-        self.cfg = set(cfg)  # type: typing.Set[Edge]
+        self.cfg = cfg  # type: CFG
+
+    def __setattr__(self, name, value):
+        # type: (str, typing.Any) -> None
+        # Sets of nodes indexed by address or name, and the dict of symbolic
+        # operands, are stored as copies which report changes to their
+        # index, and sets of edges as CFGs.
+        index = self.__dict__.get("_address_indexes", {}).get(name)
+        if name == "symbols":
+            index = self._symbol_index
+        if index is not None:
+            value = ObservedSet(value, on_change=index.nodes_changed)
+            index.reset(value)
+        elif name == "symbolic_operands":
+            value = ObservedDict(
+                value, on_change=self._operand_index.keys_changed
+            )
+            self._operand_index.reset(value)
+        elif name == "cfg":
+            value = CFG(value)
+        super().__setattr__(name, value)
 
     @classmethod
     def _decode_protobuf(cls, proto_module, uuid):
@@ -467,6 +1055,15 @@ class Module(AuxDataContainer):
             uuid=uuid,
         )
 
+    def _function_table(self, name):
+        # type: (str) -> typing.Dict[UUID, typing.Set[Block]]
+        """Get the data of a table of functions, such as
+        ``functionBlocks``, or an empty ``dict`` if there is no such table.
+        """
+
+        aux_data = self.aux_data.get(name)
+        return {} if aux_data is None else aux_data.data
+
     def _to_protobuf(self):
         # type: () -> Module_pb2.Module
         proto_module = Module_pb2.Module()
@@ -507,6 +1104,174 @@ class Module(AuxDataContainer):
         proto_module.uuid = self.uuid.bytes
         return proto_module
 
+    def blocks_at(self, start, stop=None):
+        # type: (int, typing.Optional[int]) -> typing.List[Block]
+        """Find the blocks starting at an address, or in a range of
+        addresses. See :meth:`blocks_on` for the cost of queries.
+
+        :param start: The address, or the first address of the range.
+        :param stop: The address one past the end of the range,
+            or None to find the blocks starting at ``start``.
+        :returns: The blocks, sorted by address and then size.
+        """
+
+        if stop is None:
+            stop = start + 1
+        return self._address_indexes["blocks"].at(start, stop)
+
+    def blocks_on(self, start, stop=None):
+        # type: (int, typing.Optional[int]) -> typing.List[Block]
+        """Find the blocks containing an address, or overlapping a range
+        of addresses. Blocks of size zero contain no addresses.
+
+        Blocks are indexed by address on the first query, taking
+        ``O(n log n)`` time, after which queries take ``O(log n + k)`` time
+        for ``k`` results. Changes to :attr:`blocks` and to the address or
+        size of blocks are tracked by the index.
+
+        :param start: The address, or the first address of the range.
+        :param stop: The address one past the end of the range,
+            or None to find the blocks containing ``start``.
+        :returns: The blocks, sorted by address and then size.
+        """
+
+        if stop is None:
+            stop = start + 1
+        return self._address_indexes["blocks"].on(start, stop)
+
+    def call_graph(self):
+        # type: () -> CallGraph
+        """Get the graph of the calls between the module's functions, as
+        listed in the ``functionBlocks`` and ``functionEntries`` aux data
+        tables, and to :class:`gtirb.ProxyBlock`\\s.
+
+        The graph is built in one pass over :attr:`cfg`, and kept until the
+        CFG or the tables change. Checking whether the tables changed takes
+        time proportional to their size.
+        """
+
+        tables = tuple(
+            {
+                function: frozenset(blocks)
+                for function, blocks in self._function_table(name).items()
+            }
+            for name in ("functionBlocks", "functionEntries")
+        )
+        cfg = self.cfg
+        cached = self._call_graph
+        if cached is not None and cached[0] is cfg:
+            if cached[1:-1] == (cfg._changes, tables):
+                return cached[-1]
+
+        call = Edge.Type.Call
+        graph = CallGraph(
+            (
+                (edge.source, edge.target)
+                for edge in cfg
+                if edge.label is not None and edge.label.type == call
+            ),
+            *tables
+        )
+        self._call_graph = (cfg, cfg._changes, tables, graph)
+        return graph
+
+    def cfg_analysis(
+        self,
+        function=None,  # type: typing.Optional[UUID]
+        *,
+        types=None  # type: typing.Optional[typing.Iterable[Edge.Type]]
+    ):
+        # type: (...) -> CFGAnalysis
+        """Analyze the control flow graph of the module, or of one of its
+        functions, finding dominators, strongly connected components, and
+        loops.
+
+        The nodes of the graph analyzed are those with edges in
+        :attr:`cfg`, or the blocks of a function as listed in the
+        ``functionBlocks`` aux data table. Dominator trees are rooted at the
+        nodes without predecessors, at the node with the lowest UUID of each
+        cycle that cannot be reached from elsewhere and, for a function, at
+        its entries listed in the ``functionEntries`` table. See
+        :attr:`gtirb.CFGAnalysis.entries`.
+
+        Analyses are kept, and returned again for the same arguments until
+        the CFG, or the tables listing the function, change.
+
+        :param function: The UUID of the function in the ``functionBlocks``
+            table, or None to analyze every node of the CFG.
+        :param types: The types of edge to follow, or None to follow every
+            edge. Edges without labels have no type.
+        :raises KeyError: if the function is not in the ``functionBlocks``
+            table.
+        """
+
+        if types is not None:
+            types = frozenset(types)
+        if function is None:
+            nodes = None
+            entries = frozenset()  # type: typing.FrozenSet[Block]
+        else:
+            nodes = frozenset(self._function_table("functionBlocks")[function])
+            entries = nodes.intersection(
+                self._function_table("functionEntries").get(function, ())
+            )
+
+        cfg = self.cfg
+        key = (function, types)
+        source = (cfg, cfg._changes, nodes, entries)
+        cached = self._cfg_analyses.get(key)
+        if cached is not None and cached[0] is cfg:
+            if cached[1:-1] == source[1:]:
+                return cached[-1]
+
+        successors, predecessors = cfg._adjacency()
+        if nodes is None:
+            nodes = successors.keys() | predecessors.keys()
+        # Nodes are hashed by identity, so they are ordered by UUID to root
+        # cycles at the same node whenever the IR is analyzed
+        ordered = sorted(nodes, key=lambda n: n.uuid)
+        if types is None:
+            analysis = CFGAnalysis(
+                ordered, lambda node: successors.get(node, ()), entries
+            )
+        else:
+            analysis = CFGAnalysis(
+                ordered, lambda node: cfg.successors(node, types), entries
+            )
+        self._cfg_analyses[key] = source + (analysis,)
+        return analysis
+
+    def data_at(self, start, stop=None):
+        # type: (int, typing.Optional[int]) -> typing.List[DataObject]
+        """Find the data objects starting at an address, or in a range of
+        addresses. See :meth:`blocks_on` for the cost of queries.
+
+        :param start: The address, or the first address of the range.
+        :param stop: The address one past the end of the range,
+            or None to find the data objects starting at ``start``.
+        :returns: The data objects, sorted by address and then size.
+        """
+
+        if stop is None:
+            stop = start + 1
+        return self._address_indexes["data"].at(start, stop)
+
+    def data_on(self, start, stop=None):
+        # type: (int, typing.Optional[int]) -> typing.List[DataObject]
+        """Find the data objects containing an address, or overlapping a range
+        of addresses. Data objects of size zero contain no addresses.
+        See :meth:`blocks_on` for the cost of queries.
+
+        :param start: The address, or the first address of the range.
+        :param stop: The address one past the end of the range,
+            or None to find the data objects containing ``start``.
+        :returns: The data objects, sorted by address and then size.
+        """
+
+        if stop is None:
+            stop = start + 1
+        return self._address_indexes["data"].on(start, stop)
+
     def deep_eq(self, other):
         # type: (typing.Any) -> bool
         # Do not move __eq__. See docstring for Node.deep_eq for more info.
@@ -549,6 +1314,271 @@ class Module(AuxDataContainer):
 
         return self.image_byte_map.deep_eq(other.image_byte_map)
 
+    def find_pointer_runs(
+        self,
+        sections=None,  # type: typing.Optional[typing.Iterable[Section]]
+        *,
+        width=None,  # type: typing.Optional[int]
+        byteorder=None,  # type: typing.Optional[str]
+        min_length=2  # type: int
+    ):
+        # type: (...) -> typing.List[typing.Tuple[int, int]]
+        """Find runs of consecutive aligned pointers in the contents of
+        sections, as candidates for jump tables and pointer arrays.
+
+        A value is considered a pointer if it lies within the range of
+        addresses of :attr:`image_byte_map` or is the address of a block.
+        See :meth:`gtirb.ImageByteMap.find_pointer_runs`.
+
+        :param sections: The sections to search,
+            or None to search every section.
+        :param width: The size of a pointer in bytes,
+            or None to use the pointer size of :attr:`isa_id`.
+        :param byteorder: Either ``"little"`` or ``"big"``,
+            or None to use the byte order of :attr:`isa_id`.
+        :param min_length: The fewest consecutive pointers to report.
+        :returns: A list of ``(address, count)`` tuples in ascending order
+            by address, one for each run of at least ``min_length``
+            pointers starting at ``address``.
+        :raises ValueError: if ``width`` is None and the pointer size of
+            :attr:`isa_id` is unknown.
+        """
+
+        if width is None:
+            try:
+                width = _POINTER_WIDTHS[self.isa_id]
+            except KeyError:
+                raise ValueError(
+                    "pointer width of %s is unknown" % self.isa_id
+                )
+        if byteorder is None:
+            byteorder = (
+                "big" if self.isa_id == Module.ISAID.PPC32 else "little"
+            )
+        if sections is None:
+            sections = self.sections
+        targets = {block.address for block in self.blocks}
+        runs = []  # type: typing.List[typing.Tuple[int, int]]
+        for section in sections:
+            runs.extend(
+                self.image_byte_map.find_pointer_runs(
+                    section.address,
+                    section.address + section.size,
+                    width=width,
+                    byteorder=byteorder,
+                    targets=targets,
+                    min_length=min_length,
+                )
+            )
+        runs.sort()
+        return runs
+
+    def reaches(
+        self,
+        source,  # type: CfgNode
+        target,  # type: CfgNode
+        *,
+        types=None  # type: typing.Optional[typing.Iterable[Edge.Type]]
+    ):
+        # type: (...) -> bool
+        """Check whether there is a path in the CFG from one node to
+        another. Each node reaches itself.
+
+        The first check indexes the :class:`gtirb.CFGAnalysis` returned
+        by :meth:`cfg_analysis` for the same edge types, using
+        :meth:`gtirb.CFGAnalysis.index_reachability`. Most later checks take
+        constant time, until the CFG changes and the index is rebuilt.
+
+        :param source: The node the path would start at.
+        :param target: The node the path would end at.
+        :param types: The types of edge to follow, or None to follow every
+            edge. Edges without labels have no type.
+        """
+
+        if source is target:
+            return True
+        analysis = self.cfg_analysis(types=types)
+        if source not in analysis or target not in analysis:
+            return False
+        analysis.index_reachability()
+        return analysis.reaches(source, target)
+
+    def section_hash(self, section):
+        # type: (Section) -> bytes
+        """Get a hash of the contents of a section, suitable for use as a
+        cache key. See :meth:`gtirb.ImageByteMap.content_hash`.
+
+        :param section: The section to hash.
+        :returns: A 32-byte digest of the bytes in :attr:`image_byte_map`
+            within the section.
+        """
+
+        return self.image_byte_map.content_hash(
+            section.address, section.address + section.size
+        )
+
+    def section_statistics(self, section, window=None):
+        # type: (Section, typing.Optional[int]) -> ImageByteMapStatistics
+        """Compute statistics of the contents of a section, such as their
+        entropy. Requires NumPy.
+        See :meth:`gtirb.ImageByteMap.statistics`.
+
+        :param section: The section to compute statistics of.
+        :param window: If given, the section is also split into windows of
+            this many addresses, starting at its first address.
+        :raises ImportError: if NumPy is not installed.
+        """
+
+        return self.image_byte_map.statistics(
+            section.address, section.address + section.size, window
+        )
+
+    def sections_at(self, start, stop=None):
+        # type: (int, typing.Optional[int]) -> typing.List[Section]
+        """Find the sections starting at an address, or in a range of
+        addresses. See :meth:`blocks_on` for the cost of queries.
+
+        :param start: The address, or the first address of the range.
+        :param stop: The address one past the end of the range,
+            or None to find the sections starting at ``start``.
+        :returns: The sections, sorted by address and then size.
+        """
+
+        if stop is None:
+            stop = start + 1
+        return self._address_indexes["sections"].at(start, stop)
+
+    def sections_on(self, start, stop=None):
+        # type: (int, typing.Optional[int]) -> typing.List[Section]
+        """Find the sections containing an address, or overlapping a range
+        of addresses. Sections of size zero contain no addresses.
+        See :meth:`blocks_on` for the cost of queries.
+
+        :param start: The address, or the first address of the range.
+        :param stop: The address one past the end of the range,
+            or None to find the sections containing ``start``.
+        :returns: The sections, sorted by address and then size.
+        """
+
+        if stop is None:
+            stop = start + 1
+        return self._address_indexes["sections"].on(start, stop)
+
+    def strings(
+        self,
+        sections=None,  # type: typing.Optional[typing.Iterable[Section]]
+        *,
+        min_length=4,  # type: int
+        encodings=("ascii", "utf-16le")  # type: typing.Iterable[str]
+    ):
+        # type: (...) -> typing.Iterator[typing.Tuple[int, str, str]]
+        """Find strings of printable characters in the contents of
+        sections. See :meth:`gtirb.ImageByteMap.strings`.
+
+        :param sections: The sections to search,
+            or None to search every section.
+        :param min_length: The fewest characters in a string.
+        :param encodings: The encodings to search for strings in:
+            any of ``"ascii"`` and ``"utf-16le"``.
+        :returns: Yields ``(address, encoding, text)`` tuples. The sections
+            are searched in ascending order by address.
+        """
+
+        if sections is None:
+            sections = self.sections
+        encodings = tuple(encodings)
+        for section in sorted(sections, key=lambda s: s.address):
+            yield from self.image_byte_map.strings(
+                section.address,
+                section.address + section.size,
+                min_length=min_length,
+                encodings=encodings,
+            )
+
+    def symbolic_operands_in(self, start, stop):
+        # type: (int, int) -> _Operands
+        """Find the symbolic operands at addresses in a range.
+
+        The addresses of :attr:`symbolic_operands` are sorted on the first
+        query, taking ``O(n log n)`` time, after which queries take
+        ``O(log n + k)`` time for ``k`` results. Operands added to or
+        removed from :attr:`symbolic_operands` are tracked by the index.
+
+        :param start: The first address of the range.
+        :param stop: The address one past the end of the range.
+        :returns: ``(address, operand)`` tuples, sorted by address.
+        """
+
+        return self._operand_index.between(start, stop)
+
+    def symbolic_operands_of(self, node):
+        # type: (AddressedNode) -> _Operands
+        """Find the symbolic operands at the addresses a block, data object,
+        or section occupies. See :meth:`symbolic_operands_in` for the cost
+        of queries.
+
+        :param node: The block, data object, or section.
+        :returns: ``(address, operand)`` tuples, sorted by address.
+        """
+
+        return self._operand_index.between(
+            node.address, node.address + node.size
+        )
+
+    def symbols_at(self, address):
+        # type: (int) -> typing.Set[Symbol]
+        """Find the symbols whose value is an address, or which refer to a
+        block or data object of the module starting at the address.
+
+        :param address: The address.
+        """
+
+        found = self._symbol_index.with_payload(address)
+        for node in self.blocks_at(address) + self.data_at(address):
+            found.update(self._symbol_index.with_payload(node))
+        return found
+
+    def symbols_matching(self, pattern):
+        # type: (str) -> typing.Iterator[Symbol]
+        """Find the symbols whose names match a glob pattern, as understood
+        by :func:`fnmatch.fnmatchcase`. The names sharing the literal
+        prefix of the pattern, such as ``"str"`` in ``"str*cpy"``, are found
+        in ``O(log n)`` time and then matched one by one, so a search for a
+        prefix, ``"prefix*"``, takes ``O(log n + k)`` time for ``k`` names.
+        See :meth:`symbols_named` for how symbols are indexed.
+
+        :param pattern: The pattern.
+        :returns: Yields the symbols in order of name. :attr:`symbols`
+            must not be modified during iteration.
+        """
+
+        return self._symbol_index.matching(pattern)
+
+    def symbols_named(self, name):
+        # type: (str) -> typing.Set[Symbol]
+        """Find the symbols with a name.
+
+        Symbols are indexed by name and by referent or value on the first
+        query, taking ``O(n log n)`` time, after which queries take time
+        proportional to the number of results. Changes to :attr:`symbols`
+        and to the ``name``, ``referent``, or ``value`` of symbols are
+        tracked by the index.
+
+        :param name: The name.
+        """
+
+        return self._symbol_index.named(name)
+
+    def symbols_referring_to(self, referent):
+        # type: (Referent) -> typing.Set[Symbol]
+        """Find the symbols referring to a block, data object, or
+        proxy block. See :meth:`symbols_named` for how symbols are indexed.
+
+        :param referent: The referent.
+        """
+
+        return self._symbol_index.with_payload(referent)
+
     def __repr__(self):
         # type: () -> str
         return (
@@ -569,3 +1599,12 @@ class Module(AuxDataContainer):
             "symbolic_operands={symbolic_operands!r}, "
             ")".format(**self.__dict__)
         )
+
+
+_POINTER_WIDTHS = {
+    Module.ISAID.ARM: 4,
+    Module.ISAID.IA32: 4,
+    Module.ISAID.PPC32: 4,
+    Module.ISAID.X64: 8,
+}  # type: typing.Dict[Module.ISAID, int]
+"""The size in bytes of a pointer on each supported ISA."""
@@ -3,6 +3,7 @@ import typing
 from uuid import UUID
 
 from .node import Node
+from .util import ObservedAttribute
 
 
 class Section(Node):
@@ -16,6 +17,9 @@ class Section(Node):
     :ivar size: The size of this section in bytes.
     """
 
+    address = ObservedAttribute("address")
+    size = ObservedAttribute("size")
+
     def __init__(
         self,
         name="",  # type: str
@@ -7,6 +7,7 @@ import Symbol_pb2
 from .block import Block, ProxyBlock
 from .dataobject import DataObject
 from .node import Node
+from .util import ObservedAttribute
 
 
 Referent = typing.Union[Block, ProxyBlock, DataObject]
@@ -46,6 +47,11 @@ class Symbol(Node):
         in the context of a function's activation frame.
         """
 
+    # The payload holds both the value and the referent, so observing it
+    # observes both
+    name = ObservedAttribute("name")
+    _payload = ObservedAttribute("_payload")
+
     def __init__(
         self,
         name,  # type: str
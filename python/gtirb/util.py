@@ -1,6 +1,8 @@
 """General utilities usable by any other GTIRB submoudle."""
 
+from bisect import bisect_left, bisect_right
 import typing
+from weakref import WeakKeyDictionary, ref
 
 K = typing.TypeVar("K")
 V = typing.TypeVar("V")
@@ -17,3 +19,503 @@ class DictLike(typing.Generic[K, V]):
     #     typing.Iterable[typing.Tuple[K, V]],
     # ]
     # but cannot, due to metaclass conflicts.
+
+
+class ObservedAttribute:
+    """A data descriptor for an attribute whose changes are reported to
+    observers, such as indexes keyed by the attribute. Indexes in a
+    :class:`gtirb.Module` use it to stay current as the nodes they hold
+    are changed, for instance as a block's ``address`` is assigned.
+
+    Values are kept in the instance's ``__dict__`` under the name of the
+    attribute, so instances look the same as if it were a plain attribute,
+    and reading it is as fast.
+
+    Observers are registered with each instance, by :meth:`observe`, so
+    that changes are reported only to the observers of that instance, and
+    assigning to the attribute of an unobserved instance costs little more
+    than assigning to a plain attribute. After the attribute is assigned a
+    value unequal to its old value, each observer's
+    ``attribute_changed(instance, name, old_value)`` method is called.
+    Both instances and observers are only weakly referenced, and the
+    registrations are kept apart from the instances, so they are neither
+    pickled nor copied with them.
+
+    :ivar name: The name of the attribute.
+    """
+
+    # Maps each observed instance to weak references to its observers.
+    _registry = WeakKeyDictionary()  # type: WeakKeyDictionary
+
+    def __init__(self, name):
+        # type: (str) -> None
+        """
+        :param name: The name of the attribute.
+        """
+
+        self.name = name  # type: str
+
+    # There is no __get__, so reads find the value in the instance's
+    # __dict__ without calling into the descriptor.
+
+    def __set__(self, instance, value):
+        # type: (typing.Any, typing.Any) -> None
+        values = instance.__dict__
+        observers = self._registry.get(instance)
+        if not observers:
+            values[self.name] = value
+            return
+        old_value = values.get(self.name)
+        values[self.name] = value
+        if old_value == value:
+            return
+        for reference in list(observers):
+            observer = reference()
+            if observer is None:
+                observers.remove(reference)
+            else:
+                observer.attribute_changed(instance, self.name, old_value)
+
+    @staticmethod
+    def observe(instance, observer):
+        # type: (typing.Any, typing.Any) -> None
+        """Report changes to the observed attributes of an instance to an
+        observer. An observer registered more than once has its method
+        called once per registration.
+        """
+
+        registry = ObservedAttribute._registry
+        registry.setdefault(instance, []).append(ref(observer))
+
+    @staticmethod
+    def observers(instance):
+        # type: (typing.Any) -> typing.List[typing.Any]
+        """Get the live observers of an instance, once per registration."""
+
+        references = ObservedAttribute._registry.get(instance, ())
+        return [
+            observer
+            for observer in (reference() for reference in references)
+            if observer is not None
+        ]
+
+    @staticmethod
+    def unobserve(instance, observer):
+        # type: (typing.Any, typing.Any) -> None
+        """Undo one registration of an observer with :meth:`observe`."""
+
+        registry = ObservedAttribute._registry
+        observers = registry.get(instance)
+        if observers:
+            try:
+                observers.remove(ref(observer))
+            except ValueError:
+                pass
+            if not observers:
+                del registry[instance]
+
+
+class ObservedSet(set):
+    """A ``set`` which reports the values added to and removed from it.
+
+    :ivar on_change: A function called after the set is modified with two
+        collections: the values added and the values removed.
+        Or None to report nothing.
+    """
+
+    def __init__(
+        self,
+        iterable=(),  # type: typing.Iterable[typing.Any]
+        on_change=None,  # type: typing.Optional[typing.Callable]
+    ):
+        # type: (...) -> None
+        """
+        :param iterable: The initial values, which are not reported.
+        :param on_change: The function to report changes to.
+        """
+
+        super().__init__(iterable)
+        self.on_change = on_change  # type: typing.Optional[typing.Callable]
+
+    def __iand__(self, other):
+        # type: (typing.Any) -> ObservedSet
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __ior__(self, other):
+        # type: (typing.Any) -> ObservedSet
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        # type: (typing.Any) -> ObservedSet
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        # type: (typing.Any) -> ObservedSet
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
+    def __reduce__(self):
+        # type: () -> typing.Tuple[type, typing.Tuple[typing.List]]
+        # Copies are plain sets, whose changes are not reported
+        return set, (list(self),)
+
+    def _report(self, added, removed):
+        # type: (typing.Iterable, typing.Iterable) -> None
+        if self.on_change is not None and (added or removed):
+            self.on_change(added, removed)
+
+    def add(self, value):
+        # type: (typing.Any) -> None
+        if value not in self:
+            super().add(value)
+            self._report((value,), ())
+
+    def clear(self):
+        # type: () -> None
+        removed = set(self)
+        super().clear()
+        self._report((), removed)
+
+    def difference_update(self, *iterables):
+        # type: (*typing.Iterable[typing.Any]) -> None
+        removed = {value for value in set().union(*iterables) if value in self}
+        super().difference_update(removed)
+        self._report((), removed)
+
+    def discard(self, value):
+        # type: (typing.Any) -> None
+        if value in self:
+            super().discard(value)
+            self._report((), (value,))
+
+    def intersection_update(self, *iterables):
+        # type: (*typing.Iterable[typing.Any]) -> None
+        removed = set(self).difference(set(self).intersection(*iterables))
+        super().difference_update(removed)
+        self._report((), removed)
+
+    def pop(self):
+        # type: () -> typing.Any
+        value = super().pop()
+        self._report((), (value,))
+        return value
+
+    def remove(self, value):
+        # type: (typing.Any) -> None
+        super().remove(value)
+        self._report((), (value,))
+
+    def symmetric_difference_update(self, iterable):
+        # type: (typing.Iterable[typing.Any]) -> None
+        other = set(iterable)
+        removed = {value for value in other if value in self}
+        added = other.difference(removed)
+        super().difference_update(removed)
+        super().update(added)
+        self._report(added, removed)
+
+    def update(self, *iterables):
+        # type: (*typing.Iterable[typing.Any]) -> None
+        added = {
+            value for value in set().union(*iterables) if value not in self
+        }
+        super().update(added)
+        self._report(added, ())
+
+    def __repr__(self):
+        # type: () -> str
+        # Represented as a plain set, so that reprs of owners stay
+        # expressions
+        return repr(set(self))
+
+
+class ObservedDict(dict):
+    """A ``dict`` which reports the keys added to and removed from it.
+    Assigning a new value to a key already present is not reported.
+
+    :ivar on_change: A function called after the keys of the dict change
+        with two collections: the keys added and the keys removed.
+        Or None to report nothing.
+    """
+
+    def __init__(
+        self,
+        mapping=(),  # type: typing.Any
+        on_change=None,  # type: typing.Optional[typing.Callable]
+    ):
+        # type: (...) -> None
+        """
+        :param mapping: The initial items, which are not reported.
+        :param on_change: The function to report changes to.
+        """
+
+        super().__init__(mapping)
+        self.on_change = on_change  # type: typing.Optional[typing.Callable]
+
+    def __delitem__(self, key):
+        # type: (typing.Any) -> None
+        super().__delitem__(key)
+        self._report((), (key,))
+
+    def __ior__(self, other):
+        # type: (typing.Any) -> ObservedDict
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # type: () -> typing.Tuple[type, typing.Tuple[typing.Dict]]
+        # Copies are plain dicts, whose changes are not reported
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        # type: (typing.Any, typing.Any) -> None
+        added = key not in self
+        super().__setitem__(key, value)
+        if added:
+            self._report((key,), ())
+
+    def _report(self, added, removed):
+        # type: (typing.Iterable, typing.Iterable) -> None
+        if self.on_change is not None and (added or removed):
+            self.on_change(added, removed)
+
+    def clear(self):
+        # type: () -> None
+        removed = list(self)
+        super().clear()
+        self._report((), removed)
+
+    def pop(self, key, *default):
+        # type: (typing.Any, *typing.Any) -> typing.Any
+        present = key in self
+        value = super().pop(key, *default)
+        if present:
+            self._report((), (key,))
+        return value
+
+    def popitem(self):
+        # type: () -> typing.Tuple[typing.Any, typing.Any]
+        item = super().popitem()
+        self._report((), (item[0],))
+        return item
+
+    def setdefault(self, key, default=None):
+        # type: (typing.Any, typing.Any) -> typing.Any
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        # type: (*typing.Any, **typing.Any) -> None
+        items = dict(*args, **kwargs)
+        added = [key for key in items if key not in self]
+        super().update(items)
+        self._report(added, ())
+
+    def __repr__(self):
+        # type: () -> str
+        # Represented as a plain dict, so that reprs of owners stay
+        # expressions
+        return repr(dict(self))
+
+
+class SortedList(typing.Generic[K]):
+    """A sorted collection of unique values, supporting insertion, removal,
+    and lookup of neighbouring values in logarithmic time.
+
+    The values are kept in a two-level structure, like a B+ tree with a
+    single level of interior nodes: a list of sorted sublists of at most
+    ``2 * load`` values each, plus the largest value of each sublist.
+    Lookups bisect the maxima and then a single sublist, and updates only
+    move the values of one sublist. This keeps operations fast on
+    collections with millions of values, where updating a single flat
+    list would take linear time.
+    """
+
+    load = 512  # type: int
+
+    def __init__(self, iterable=()):
+        # type: (typing.Iterable[K]) -> None
+        """
+        :param iterable: The initial values. Duplicates are ignored.
+        """
+
+        values = list(iterable)
+        if any(a >= b for a, b in zip(values, values[1:])):
+            values = sorted(set(values))
+        load = self.load
+        self._lists = [
+            values[i : i + load] for i in range(0, len(values), load)
+        ]  # type: typing.List[typing.List[K]]
+        self._maxes = [
+            sublist[-1] for sublist in self._lists
+        ]  # type: typing.List[K]
+        self._len = len(values)  # type: int
+
+    def __contains__(self, value):
+        # type: (typing.Any) -> bool
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        sublist = self._lists[i]
+        return sublist[bisect_left(sublist, value)] == value
+
+    def __eq__(self, other):
+        # type: (typing.Any) -> bool
+        if isinstance(other, SortedList):
+            return self._len == other._len and list(self) == list(other)
+        if isinstance(other, list):
+            return self._len == len(other) and list(self) == other
+        return NotImplemented
+
+    def __iter__(self):
+        # type: () -> typing.Iterator[K]
+        for sublist in self._lists:
+            yield from sublist
+
+    def __len__(self):
+        # type: () -> int
+        return self._len
+
+    def _merge(self, i):
+        # type: (int) -> None
+        """Merge the sublist at index ``i`` into a neighbour, so that
+        sublists do not dwindle as values are removed.
+        """
+
+        lists = self._lists
+        maxes = self._maxes
+        if i == len(lists) - 1:
+            i -= 1
+        lists[i].extend(lists[i + 1])
+        maxes[i] = maxes[i + 1]
+        del lists[i + 1]
+        del maxes[i + 1]
+        if len(lists[i]) > 2 * self.load:
+            self._split(i)
+
+    def _split(self, i):
+        # type: (int) -> None
+        """Split the sublist at index ``i`` in two."""
+
+        sublist = self._lists[i]
+        half = sublist[self.load :]
+        del sublist[self.load :]
+        self._lists.insert(i + 1, half)
+        self._maxes[i] = sublist[-1]
+        self._maxes.insert(i + 1, half[-1])
+
+    def add(self, value):
+        # type: (K) -> None
+        """Insert a value, if it is not already present."""
+
+        maxes = self._maxes
+        if not maxes:
+            self._lists.append([value])
+            maxes.append(value)
+            self._len += 1
+            return
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            i -= 1
+            self._lists[i].append(value)
+            maxes[i] = value
+        else:
+            sublist = self._lists[i]
+            j = bisect_left(sublist, value)
+            if sublist[j] == value:
+                return
+            sublist.insert(j, value)
+        self._len += 1
+
+        if len(self._lists[i]) > 2 * self.load:
+            self._split(i)
+
+    def floor(self, value):
+        # type: (K) -> typing.Optional[K]
+        """Get the largest value less than or equal to ``value``,
+        or None if there is no such value.
+        """
+
+        maxes = self._maxes
+        i = bisect_left(maxes, value)
+        if i < len(maxes):
+            sublist = self._lists[i]
+            j = bisect_right(sublist, value)
+            if j:
+                return sublist[j - 1]
+        if i:
+            return maxes[i - 1]
+        return None
+
+    def irange(
+        self,
+        minimum=None,  # type: typing.Optional[K]
+        maximum=None,  # type: typing.Optional[K]
+    ):
+        # type: (...) -> typing.Iterator[K]
+        """Iterate in ascending order over the values between ``minimum``
+        and ``maximum``, inclusive. The collection must not be modified
+        during iteration.
+
+        :param minimum: The smallest value to yield,
+            or None to start from the smallest value in the collection.
+        :param maximum: The largest value to yield,
+            or None to continue up to the largest value in the collection.
+        """
+
+        lists = self._lists
+        if minimum is None:
+            i = j = 0
+        else:
+            i = bisect_left(self._maxes, minimum)
+            if i == len(lists):
+                return
+            j = bisect_left(lists[i], minimum)
+        for sublist in lists[i:]:
+            if maximum is not None and sublist[-1] > maximum:
+                yield from sublist[j : bisect_right(sublist, maximum)]
+                return
+            yield from sublist[j:] if j else sublist
+            j = 0
+
+    def remove(self, value):
+        # type: (K) -> None
+        """Remove a value.
+
+        :raises ValueError: if the value is not present.
+        """
+
+        maxes = self._maxes
+        i = bisect_left(maxes, value)
+        if i < len(maxes):
+            sublist = self._lists[i]
+            j = bisect_left(sublist, value)
+            if sublist[j] == value:
+                del sublist[j]
+                self._len -= 1
+                if not sublist:
+                    del self._lists[i]
+                    del maxes[i]
+                    return
+                if j == len(sublist):
+                    maxes[i] = sublist[-1]
+                if len(sublist) < self.load // 4 and len(maxes) > 1:
+                    self._merge(i)
+                return
+        raise ValueError("%r not in list" % (value,))
+
+    def __repr__(self):
+        # type: () -> str
+        return "SortedList({!r})".format(list(self))
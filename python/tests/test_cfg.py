@@ -0,0 +1,394 @@
+import itertools
+import unittest
+
+from io import BytesIO
+from uuid import UUID, uuid4
+
+from gtirb import (
+    CFG,
+    IR,
+    AuxData,
+    Block,
+    Edge,
+    Module,
+    ProxyBlock,
+    Symbol,
+)
+from gtirb.node import Node
+
+
+def edge(source, target, type=None, **kwargs):
+    label = None if type is None else Edge.Label(type, **kwargs)
+    return Edge(source, target, label)
+
+
+class CFGTest(unittest.TestCase):
+    def test_adjacency(self):
+        a, b, c = Block(0, 1), Block(1, 1), Block(2, 1)
+        proxy = ProxyBlock()
+        branch = edge(a, c, Edge.Type.Branch, conditional=True)
+        fallthrough = edge(a, b, Edge.Type.Fallthrough)
+        call = edge(b, proxy, Edge.Type.Call)
+        unlabeled = edge(a, c)
+        cfg = CFG([branch, fallthrough, call, unlabeled])
+
+        self.assertEqual(set(cfg.successors(a)), {b, c})
+        self.assertEqual(len(list(cfg.successors(a))), 2)
+        self.assertEqual(set(cfg.predecessors(c)), {a})
+        self.assertEqual(
+            set(cfg.out_edges(a)), {branch, fallthrough, unlabeled}
+        )
+        self.assertEqual(set(cfg.in_edges(proxy)), {call})
+        self.assertEqual(
+            list(cfg.successors(a, types={Edge.Type.Fallthrough})), [b]
+        )
+        self.assertEqual(
+            list(cfg.in_edges(c, types=(Edge.Type.Branch,))), [branch]
+        )
+        self.assertEqual(list(cfg.successors(c)), [])
+        self.assertEqual(list(cfg.predecessors(Block(3, 1))), [])
+
+        # The index follows changes to the set
+        cfg.discard(branch)
+        self.assertEqual(set(cfg.successors(a)), {b, c})
+        self.assertEqual(list(cfg.successors(a, [Edge.Type.Branch])), [])
+        cfg -= {unlabeled, call}
+        self.assertEqual(list(cfg.successors(a)), [b])
+        self.assertEqual(list(cfg.predecessors(c)), [])
+        self.assertEqual(list(cfg.predecessors(proxy)), [])
+        cfg.add(edge(c, a, Edge.Type.Branch))
+        self.assertEqual(list(cfg.predecessors(a)), [c])
+        cfg.clear()
+        self.assertEqual(list(cfg.successors(a)), [])
+        self.assertEqual(cfg._successors, {})
+        self.assertEqual(cfg._predecessors, {})
+
+    def test_analysis(self):
+        entry, head, body, exit, outside = (Block(i, 1) for i in range(5))
+        branch, fallthrough = Edge.Type.Branch, Edge.Type.Fallthrough
+        function = uuid4()
+        module = Module(
+            aux_data={
+                "functionBlocks": AuxData(
+                    {function: {entry, head, body, exit}},
+                    "mapping<UUID,set<UUID>>",
+                ),
+                "functionEntries": AuxData(
+                    {function: {entry}}, "mapping<UUID,set<UUID>>"
+                ),
+            },
+            blocks=[entry, head, body, exit, outside],
+            cfg=[
+                edge(entry, head, fallthrough),
+                edge(head, body, branch),
+                edge(body, body, branch),
+                edge(body, head, branch),
+                edge(head, exit, fallthrough),
+                edge(exit, ProxyBlock(), Edge.Type.Call),
+                edge(outside, head, branch),
+            ],
+        )
+        types = [branch, fallthrough]
+        analysis = module.cfg_analysis(function, types=types)
+        self.assertEqual(set(analysis.nodes), {entry, head, body, exit})
+        self.assertEqual(analysis.entries, [entry])
+        self.assertEqual(analysis.exits, [exit])
+
+        self.assertEqual(
+            analysis.immediate_dominators,
+            {entry: None, head: entry, body: head, exit: head},
+        )
+        self.assertEqual(
+            analysis.immediate_post_dominators,
+            {exit: None, head: exit, body: head, entry: head},
+        )
+        self.assertTrue(analysis.dominates(head, exit))
+        self.assertFalse(analysis.dominates(body, exit))
+        self.assertTrue(analysis.post_dominates(exit, body))
+        self.assertFalse(analysis.dominates(outside, head))
+
+        self.assertEqual(
+            [set(c) for c in analysis.components],
+            [{entry}, {head, body}, {exit}],
+        )
+        self.assertEqual(analysis.component_of(body), 1)
+
+        outer, inner = analysis.loops
+        self.assertEqual((outer.header, outer.nodes), (head, {head, body}))
+        self.assertEqual((inner.header, inner.nodes), (body, {body}))
+        self.assertIsNone(outer.parent)
+        self.assertEqual(outer.children, [inner])
+        self.assertEqual(inner.depth, 2)
+        self.assertIs(analysis.loop_of(body), inner)
+        self.assertIsNone(analysis.loop_of(exit))
+
+        # Analyses are kept until the CFG or the function changes
+        self.assertIs(module.cfg_analysis(function, types=types), analysis)
+        module.cfg.discard(edge(body, body, branch))
+        analysis = module.cfg_analysis(function, types=types)
+        self.assertEqual(len(analysis.loops), 1)
+        module.aux_data["functionBlocks"].data[function].discard(exit)
+        self.assertNotIn(exit, module.cfg_analysis(function).nodes)
+        with self.assertRaises(KeyError):
+            module.cfg_analysis(uuid4())
+
+        # Nodes reached from more than one entry have no dominator
+        analysis = module.cfg_analysis()
+        self.assertEqual(set(analysis.entries), {entry, outside})
+        self.assertIsNone(analysis.immediate_dominators[head])
+        self.assertEqual(len(analysis.nodes), 6)
+
+        # Cycles without edges from elsewhere are rooted at their node
+        # with the lowest UUID, and cycles without edges to elsewhere are
+        # exits, whatever order the edges are added in
+        a, b, c, d = (Block(i, 1, uuid=UUID(int=4 - i)) for i in range(4))
+        edges = [edge(a, b), edge(b, a), edge(b, c), edge(c, d), edge(d, c)]
+        for order in itertools.permutations(edges):
+            analysis = Module(cfg=order).cfg_analysis()
+            self.assertEqual(analysis.entries, [b])
+            self.assertEqual(analysis.exits, [d])
+            self.assertEqual(
+                analysis.immediate_dominators, {a: b, b: None, c: b, d: c}
+            )
+            self.assertEqual(
+                analysis.immediate_post_dominators,
+                {a: b, b: c, c: d, d: None},
+            )
+        self.assertEqual(
+            {loop.nodes for loop in analysis.loops},
+            {frozenset({a, b}), frozenset({c, d})},
+        )
+
+    def test_paths(self):
+        a, b, c, d, e, f = (Block(i, 1) for i in range(6))
+        module = Module(
+            cfg=[
+                edge(a, b),
+                edge(a, c),
+                edge(b, d),
+                edge(c, d),
+                edge(d, e),
+                edge(e, d),
+                edge(e, f),
+            ]
+        )
+        analysis = module.cfg_analysis()
+        self.assertEqual(analysis.count_paths(a, f), 2)
+        self.assertEqual(analysis.count_paths(b, f), 1)
+        self.assertEqual(analysis.count_paths(e, d), 1)
+        self.assertEqual(analysis.count_paths(f, a), 0)
+        self.assertTrue(analysis.reaches(a, e))
+        self.assertTrue(analysis.reaches(e, d))
+        self.assertFalse(analysis.reaches(b, c))
+        self.assertFalse(analysis.reaches(f, a))
+        self.assertEqual(
+            sorted(analysis.paths(a, f), key=lambda path: path[1].address),
+            [[a, b, d, e, f], [a, c, d, e, f]],
+        )
+        self.assertEqual(len(list(analysis.paths(a, f, limit=1))), 1)
+        self.assertEqual(list(analysis.paths(d, d)), [[d]])
+        self.assertEqual(list(analysis.paths(f, a)), [])
+        with self.assertRaises(KeyError):
+            analysis.count_paths(a, Block(6, 1))
+
+    def test_reaches(self):
+        blocks = [Block(i, 1) for i in range(8)]
+        a, b, c, d, e, f, g, h = blocks
+        call, branch = Edge.Type.Call, Edge.Type.Branch
+        module = Module(
+            cfg=[
+                edge(a, b, branch),
+                edge(b, c, branch),
+                edge(c, b, branch),
+                edge(c, d, call),
+                edge(d, e, branch),
+                edge(a, f, branch),
+                edge(f, g, branch),
+            ]
+        )
+        reachable = {
+            a: {b, c, d, e, f, g},
+            b: {c, d, e},
+            c: {b, d, e},
+            d: {e},
+            f: {g},
+        }
+        for source in blocks:
+            for target in blocks:
+                self.assertEqual(
+                    module.reaches(source, target),
+                    source is target or target in reachable.get(source, ()),
+                )
+        self.assertFalse(module.reaches(a, d, types=[branch]))
+        self.assertTrue(module.reaches(a, c, types=[branch]))
+
+        # The index is rebuilt when the CFG changes
+        module.cfg.add(edge(g, h, branch))
+        self.assertTrue(module.reaches(a, h))
+        module.cfg.discard(edge(c, d, call))
+        self.assertFalse(module.reaches(a, e))
+
+        analysis = module.cfg_analysis()
+        analysis.index_reachability(labellings=4)
+        self.assertTrue(analysis.reaches(a, h))
+        self.assertFalse(analysis.reaches(h, a))
+        with self.assertRaises(ValueError):
+            analysis.index_reachability(labellings=0)
+
+    def test_call_graph(self):
+        f0, f1, g0, h0, outside = (Block(i, 1) for i in range(5))
+        proxy = ProxyBlock()
+        f, g, h = uuid4(), uuid4(), uuid4()
+        call = Edge.Type.Call
+        module = Module(
+            aux_data={
+                "functionBlocks": AuxData(
+                    {f: {f0, f1}, g: {g0}, h: {h0}},
+                    "mapping<UUID,set<UUID>>",
+                ),
+                "functionEntries": AuxData(
+                    {f: {f0}, g: {g0}, h: {h0}}, "mapping<UUID,set<UUID>>"
+                ),
+            },
+            cfg=[
+                edge(f0, f1, Edge.Type.Fallthrough),
+                edge(f0, g0, call),
+                edge(f1, g0, call),
+                edge(f1, outside, call),
+                edge(g0, proxy, call),
+                edge(g0, f1, call),
+                edge(outside, h0, call),
+            ],
+        )
+        graph = module.call_graph()
+        self.assertEqual(graph.functions, {f, g, h})
+        self.assertEqual(set(graph.callees(f)), {g})
+        self.assertEqual(set(graph.callees(g)), {f, proxy})
+        self.assertEqual(list(graph.callees(h)), [])
+        self.assertEqual(set(graph.callers(g)), {f})
+        self.assertEqual(list(graph.callers(proxy)), [g])
+        self.assertEqual(
+            sorted(graph.call_sites(f, g), key=lambda b: b.address), [f0, f1]
+        )
+        self.assertEqual(graph.call_sites(g, h), [])
+        self.assertEqual(graph.function_of(f1), f)
+        self.assertIsNone(graph.function_of(outside))
+
+        # The graph is kept until the CFG or the tables change
+        self.assertIs(module.call_graph(), graph)
+        module.cfg.add(edge(h0, f0, call))
+        graph = module.call_graph()
+        self.assertEqual(list(graph.callees(h)), [f])
+        module.aux_data["functionBlocks"].data[h].add(outside)
+        graph = module.call_graph()
+        self.assertEqual(set(graph.callees(f)), {g, h})
+
+    def test_linked_cfg(self):
+        main, after, puts, puts_end, memcpy, static = (
+            Block(i, 1) for i in range(6)
+        )
+        to_puts, to_memcpy, missing = ProxyBlock(), ProxyBlock(), ProxyBlock()
+        call, fallthrough = Edge.Type.Call, Edge.Type.Fallthrough
+        plt = Symbol("memcpy@plt", payload=to_memcpy)
+        extern = Symbol("memcpy", Symbol.StorageKind.Extern)
+        exe = Module(
+            aux_data={
+                "symbolForwarding": AuxData(
+                    {plt: extern}, "mapping<UUID,UUID>"
+                )
+            },
+            blocks=[main, after],
+            cfg=[
+                edge(main, to_puts, call),
+                edge(main, after, fallthrough),
+                edge(after, to_memcpy, call),
+                edge(after, missing, call),
+            ],
+            proxies=[to_puts, to_memcpy, missing],
+            symbols=[
+                Symbol("puts", Symbol.StorageKind.Extern, payload=to_puts),
+                plt,
+                extern,
+                Symbol("abort", Symbol.StorageKind.Extern, payload=missing),
+            ],
+        )
+        hidden = Module(
+            blocks=[static],
+            symbols=[
+                Symbol("puts", Symbol.StorageKind.Static, payload=static)
+            ],
+        )
+        lib = Module(
+            blocks=[puts, puts_end, memcpy],
+            cfg=[edge(puts, puts_end, fallthrough)],
+            symbols=[
+                Symbol("puts", Symbol.StorageKind.Normal, payload=puts),
+                Symbol("memcpy", Symbol.StorageKind.Normal, payload=memcpy),
+            ],
+        )
+        linked = IR(modules=[exe, hidden, lib]).linked_cfg()
+
+        self.assertIs(linked.resolve(to_puts), puts)
+        self.assertIs(linked.resolve(to_memcpy), memcpy)
+        self.assertIs(linked.resolve(missing), missing)
+        self.assertEqual(set(linked.successors(main)), {after, puts})
+        self.assertEqual(
+            list(linked.successors(main, types=[fallthrough])), [after]
+        )
+        self.assertEqual(set(linked.successors(after)), {memcpy, missing})
+        self.assertEqual(list(linked.successors(to_puts)), [puts_end])
+        self.assertEqual(list(linked.predecessors(puts)), [main])
+        self.assertEqual(list(linked.predecessors(static)), [])
+        self.assertEqual(
+            list(linked.in_edges(memcpy)), [edge(after, to_memcpy, call)]
+        )
+        self.assertEqual(len(list(linked.out_edges(main))), 2)
+
+        # Changes to the module CFGs are seen
+        exe.cfg.add(edge(after, to_puts, call))
+        self.assertEqual(set(linked.predecessors(puts)), {main, after})
+
+    def test_linked_cfg_loaded(self):
+        main, bar = Block(0x1000, 1), Block(0x2000, 1)
+        proxy = ProxyBlock()
+        foo = Symbol("foo", Symbol.StorageKind.Extern, payload=proxy)
+        exported = Symbol("bar", Symbol.StorageKind.Normal, payload=bar)
+        exe = Module(
+            aux_data={
+                "symbolForwarding": AuxData(
+                    {foo: exported}, "mapping<UUID,UUID>"
+                )
+            },
+            blocks=[main],
+            cfg=[edge(main, proxy, Edge.Type.Call)],
+            proxies=[proxy],
+            symbols=[foo],
+        )
+        lib = Module(blocks=[bar], symbols=[exported])
+
+        # The forwarding entry names a symbol in a module decoded after the
+        # table, so decoding leaves it as a UUID
+        stream = BytesIO()
+        IR(modules=[exe, lib]).save_protobuf_file(stream)
+        Node._uuid_cache.clear()
+        stream.seek(0)
+        ir = IR.load_protobuf_file(stream)
+        loaded_main = Block.from_uuid(main.uuid)
+        loaded_bar = Block.from_uuid(bar.uuid)
+        self.assertEqual(
+            list(ir.linked_cfg().successors(loaded_main)), [loaded_bar]
+        )
+
+    def test_module_cfg(self):
+        a, b = Block(0, 1), Block(1, 1)
+        module = Module(blocks=[a, b], cfg=[edge(a, b)])
+        self.assertIsInstance(module.cfg, CFG)
+        self.assertEqual(list(module.cfg.successors(a)), [b])
+        module.cfg = {edge(b, a)}
+        self.assertIsInstance(module.cfg, CFG)
+        self.assertEqual(list(module.cfg.successors(b)), [a])
+        self.assertEqual(list(module.cfg.successors(a)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,13 @@
+import io
 import unittest
+from uuid import uuid4
 from gtirb import ImageByteMap
+from gtirb.imagebytemap import _PAGE_SIZE, _PagedRegion
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def decode_byte(byte):
@@ -51,6 +59,26 @@ class TestImageByteMap(unittest.TestCase):
         with self.assertRaises(ValueError, msg="Overlapping ranges uncaught"):
             TestImageByteMap._new_ibm(bad_byte_map)
 
+    def test_unordered_regions(self):
+        """Test initialization from regions out of order"""
+        ibm = TestImageByteMap._new_ibm(
+            {110: b"cc", 15: b"bbb", 310: b"ff", 10: b"aaaaa", 18: b"d"}
+        )
+        self.assertEqual(ibm._start_addresses, [10, 110, 310])
+        self.assertEqual(ibm[10:19], b"aaaaabbbd")
+
+        # Decoding trusts the order of the regions, but checks it
+        proto = ibm._to_protobuf()
+        proto.byte_map.regions[0].address = 112
+        decoded = ImageByteMap._decode_protobuf(proto, uuid4())
+        self.assertEqual(decoded._start_addresses, [110, 310])
+        self.assertEqual(decoded[110:121], b"ccaaaaabbbd")
+        proto.byte_map.regions[0].address = 111
+        with self.assertRaises(ValueError):
+            ImageByteMap._decode_protobuf(proto, uuid4())
+        with self.assertRaises(ValueError):
+            TestImageByteMap._new_ibm({310: b"ff", 0: b"a"}, addr_min=1)
+
     def test_contains(self):
         """Test ImageByteMap.__contains__"""
         byte_map = {
@@ -237,3 +265,670 @@ class TestImageByteMap(unittest.TestCase):
 
         with self.assertRaises(TypeError, msg="not an iterable"):
             ibm[6:] = "badstring"
+
+    def test_setitem_slice_bulk(self):
+        """Test ImageByteMap.__setitem__ with slices spanning regions"""
+        byte_map = {10: b"aaaa", 16: b"bb", 20: b"cccc"}
+        ibm = TestImageByteMap._new_ibm(byte_map, addr_min=0, addr_max=40)
+
+        # Overwrite inside a single region
+        ibm[11:13] = b"xx"
+        self.assertEqual(ibm[10:14], b"axxa")
+        self.assertEqual(ibm._start_addresses, [10, 16, 20])
+
+        # Fill a gap, coalescing with both neighbours
+        ibm[14:16] = b"yy"
+        self.assertEqual(ibm._start_addresses, [10, 20])
+        self.assertEqual(ibm[10:18], b"axxayybb")
+
+        # Overwrite across a gap and into the following region
+        ibm[17:22] = b"zzzzz"
+        self.assertEqual(ibm._start_addresses, [10])
+        self.assertEqual(ibm[10:24], b"axxayybzzzzzcc")
+
+        # Write before the first region, touching it
+        ibm[5:10] = bytearray(b"12345")
+        self.assertEqual(ibm._start_addresses, [5])
+        self.assertEqual(len(ibm), 19)
+
+        # Write a new region after the last one, and an iterable of ints
+        ibm[30:] = range(3)
+        self.assertEqual(ibm._start_addresses, [5, 30])
+        self.assertEqual(ibm[30:33], b"\x00\x01\x02")
+
+        # Writing nothing leaves the map untouched
+        ibm[35:35] = b""
+        self.assertEqual(ibm._start_addresses, [5, 30])
+
+    def test_setitem_slice_large(self):
+        """Test ImageByteMap.__setitem__ with a large slice"""
+        data = bytes(range(256)) * 4096
+        ibm = TestImageByteMap._new_ibm(
+            {0x1000: b"\xff" * 16}, addr_min=0, addr_max=0x200000
+        )
+        ibm[0x1008:] = data
+        self.assertEqual(ibm._start_addresses, [0x1000])
+        self.assertEqual(len(ibm), 8 + len(data))
+        self.assertEqual(ibm[0x1008 : 0x1008 + len(data)], data)
+
+    def test_view(self):
+        """Test ImageByteMap.view"""
+        byte_map = {10: bytearray(b"aaaaa"), 20: b"bbbbbb"}
+        ibm = TestImageByteMap._new_ibm(byte_map)
+        view = ibm.view(12, 15)
+        self.assertIsInstance(view, memoryview)
+        self.assertTrue(view.readonly)
+        self.assertEqual(view, b"aaa")
+        self.assertEqual(ibm.view(20, 20), b"")
+
+        # Views share memory with the map
+        ibm[13] = ord("x")
+        self.assertEqual(view, b"axa")
+        view.release()
+
+        for bad_range in ((5, 12), (12, 17), (14, 22), (15, 12)):
+            with self.assertRaises(IndexError, msg=str(bad_range)):
+                ibm.view(*bad_range)
+
+    def test_spans(self):
+        """Test ImageByteMap.spans"""
+        byte_map = {10: b"aaaaa", 20: b"bbbbbb", 30: b"cc"}
+        ibm = TestImageByteMap._new_ibm(byte_map)
+
+        def spans(*args):
+            return [(addr, bytes(view)) for addr, view in ibm.spans(*args)]
+
+        self.assertEqual(
+            spans(), [(10, b"aaaaa"), (20, b"bbbbbb"), (30, b"cc")]
+        )
+        self.assertEqual(spans(12, 22), [(12, b"aaa"), (20, b"bb")])
+        self.assertEqual(spans(0, 10), [])
+        self.assertEqual(spans(15, 20), [])
+        self.assertEqual(spans(21, None), [(21, b"bbbbb"), (30, b"cc")])
+        self.assertEqual(spans(None, 11), [(10, b"a")])
+        self.assertTrue(all(view.readonly for _, view in ibm.spans()))
+
+    def test_reader(self):
+        """Test ImageByteMap.reader"""
+        byte_map = {10: b"\x01\x02\x03\x04\x05\x06\x07\x08\x09", 30: b"zz"}
+        ibm = TestImageByteMap._new_ibm(byte_map)
+        reader = ibm.reader(10)
+        self.assertIsInstance(reader, io.RawIOBase)
+        self.assertTrue(reader.readable())
+        self.assertTrue(reader.seekable())
+
+        self.assertEqual(reader.read(2), b"\x01\x02")
+        self.assertEqual(reader.tell(), 12)
+        self.assertEqual(reader.read_u16(), 0x0403)
+        self.assertEqual(reader.read_u16("big"), 0x0506)
+        self.assertEqual(reader.read_u8(), 0x07)
+        self.assertEqual(reader.tell(), 17)
+
+        # Reads stop at the end of a region, and return nothing in gaps
+        self.assertEqual(reader.read(), b"\x08\x09")
+        self.assertEqual(reader.read(), b"")
+        self.assertEqual(reader.seek(29), 29)
+        self.assertEqual(reader.read(4), b"")
+        self.assertEqual(reader.seek(1, io.SEEK_CUR), 30)
+        buffer = bytearray(4)
+        self.assertEqual(reader.readinto(buffer), 2)
+        self.assertEqual(buffer, b"zz\x00\x00")
+
+        reader.seek(10)
+        self.assertEqual(reader.read_u64(), 0x0807060504030201)
+        reader.seek(10)
+        self.assertEqual(reader.read_u32("big"), 0x01020304)
+        with self.assertRaises(IndexError, msg="integer past region end"):
+            reader.read_u64()
+        self.assertEqual(reader.tell(), 14)
+        with self.assertRaises(ValueError, msg="bad byte order"):
+            reader.read_u16("middle")
+        with self.assertRaises(ValueError, msg="negative address"):
+            reader.seek(-20, io.SEEK_CUR)
+        self.assertEqual(reader.seek(-1, io.SEEK_END), ibm.addr_max)
+
+        # Modifying the map is visible to existing readers
+        reader.seek(11)
+        ibm[11:13] = b"ab"
+        self.assertEqual(reader.read(2), b"ab")
+        del ibm[13:19]
+        self.assertEqual(reader.read(), b"")
+
+        # Readers work with the standard buffered streams
+        ibm[13:19] = b"cdefgh"
+        with io.BufferedReader(ibm.reader(10)) as buffered:
+            self.assertEqual(buffered.read(5), b"\x01abcd")
+        with self.assertRaises(ValueError, msg="read after close"):
+            reader.close()
+            reader.read(1)
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_regions_as_arrays(self):
+        """Test ImageByteMap.regions_as_arrays"""
+        byte_map = {10: bytearray(b"\x00\x01\x02"), 20: b"\xff" * 4}
+        ibm = TestImageByteMap._new_ibm(byte_map)
+        arrays = list(ibm.regions_as_arrays())
+        self.assertEqual([addr for addr, _ in arrays], [10, 20])
+        self.assertEqual(arrays[0][1].dtype, numpy.uint8)
+        self.assertEqual(arrays[0][1].tolist(), [0, 1, 2])
+        self.assertEqual(int(arrays[1][1].sum()), 4 * 255)
+        self.assertFalse(arrays[0][1].flags.writeable)
+
+        # Arrays share memory with the map
+        ibm[11] = 7
+        self.assertEqual(arrays[0][1][1], 7)
+        del arrays
+
+        ranged = list(ibm.regions_as_arrays(11, 22))
+        self.assertEqual([addr for addr, _ in ranged], [11, 20])
+        self.assertEqual(ranged[1][1].tolist(), [255, 255])
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_words_as_array(self):
+        """Test ImageByteMap.words_as_array"""
+        byte_map = {9: bytes(range(1, 20))}
+        ibm = TestImageByteMap._new_ibm(byte_map)
+
+        address, words = ibm.words_as_array(9, 28, 4)
+        self.assertEqual(address, 12)
+        self.assertEqual(
+            words.tolist(), [0x07060504, 0x0B0A0908, 0x0F0E0D0C, 0x13121110]
+        )
+        address, words = ibm.words_as_array(9, 28, 8, "big")
+        self.assertEqual(address, 16)
+        self.assertEqual(words.tolist(), [0x08090A0B0C0D0E0F])
+        address, words = ibm.words_as_array(10, 14, 2)
+        self.assertEqual((address, words.tolist()), (10, [0x0302, 0x0504]))
+        address, words = ibm.words_as_array(13, 15, 8)
+        self.assertEqual(len(words), 0)
+
+        with self.assertRaises(ValueError, msg="bad width"):
+            ibm.words_as_array(10, 20, 3)
+        with self.assertRaises(ValueError, msg="bad byte order"):
+            ibm.words_as_array(10, 20, 2, "middle")
+        with self.assertRaises(IndexError, msg="unmapped words"):
+            ibm.words_as_array(8, 40, 4)
+
+    def test_lazy_regions(self):
+        """Test that immutable regions are only copied when modified"""
+        original = TestImageByteMap._new_ibm(
+            {10: b"aaaa", 20: b"bbbb", 30: b"cccc", 40: b"dddd"}
+        )
+        ibm = ImageByteMap._decode_protobuf(original._to_protobuf(), uuid4())
+        self.assertTrue(
+            all(isinstance(v, bytes) for v in ibm._byte_map.values())
+        )
+        self.assertEqual(ibm[11], ord("a"))
+        self.assertEqual(ibm[11:13], b"aa")
+        self.assertIsInstance(ibm[11:13], bytearray)
+        self.assertIsInstance(ibm._byte_map[10], bytes)
+
+        ibm[11] = ord("x")
+        ibm[22:24] = b"yy"
+        ibm[34] = ord("z")
+        del ibm[42:44]
+        self.assertEqual(
+            [type(ibm._byte_map[addr]) for addr in (10, 20, 30, 40)],
+            [bytearray] * 4,
+        )
+        self.assertEqual(
+            [bytes(ibm[a : a + 4]) for a in (10, 20)], [b"axaa", b"bbyy"]
+        )
+        self.assertEqual(ibm[30:35], b"ccccz")
+        self.assertEqual(ibm[40:42], b"dd")
+
+        # Splitting an immutable region does not need a mutable copy
+        ibm = ImageByteMap._decode_protobuf(original._to_protobuf(), uuid4())
+        del ibm[11:13]
+        self.assertEqual(ibm._start_addresses, [10, 13, 20, 30, 40])
+        self.assertEqual(ibm[13], ord("a"))
+
+        # Bytes passed to the constructor are shared until modified
+        data = b"eeee"
+        ibm = TestImageByteMap._new_ibm({10: data})
+        self.assertIs(ibm._byte_map[10], data)
+        ibm[10] = 0
+        self.assertEqual(data, b"eeee")
+
+    def test_find_all(self):
+        """Test ImageByteMap.find_all"""
+        byte_map = {
+            10: b"\x48\x8b\x05\x10\x00\x48\x8b\x00\x00\x00",
+            30: b"aaaa\x48",
+            36: b"\x8b",
+        }
+        ibm = TestImageByteMap._new_ibm(byte_map)
+
+        self.assertEqual(
+            ibm.find_all(["48 8b ?? ?? 00", b"\x48\x8b"]),
+            [
+                (10, "48 8b ?? ?? 00"),
+                (10, b"\x48\x8b"),
+                (15, "48 8b ?? ?? 00"),
+                (15, b"\x48\x8b"),
+            ],
+        )
+        # Overlapping matches of the same pattern are all found
+        self.assertEqual(
+            ibm.find_all(b"aa"), [(30, b"aa"), (31, b"aa"), (32, b"aa")]
+        )
+        # Matches do not cross gaps, or the ends of the range
+        self.assertEqual(ibm.find_all("48 8b", 11, 40), [(15, "48 8b")])
+        self.assertEqual(
+            ibm.find_all("00 ??"), [(a, "00 ??") for a in (14, 17, 18)]
+        )
+        self.assertEqual(
+            ibm.find_all("00 ?? ??", None, 19), [(14, "00 ?? ??")]
+        )
+        self.assertEqual(ibm.find_all([]), [])
+        self.assertEqual(ibm.find_all("61 62"), [])
+
+        for bad_pattern in ("", b"", "4", "4g", "?? 4"):
+            with self.assertRaises(ValueError, msg=repr(bad_pattern)):
+                ibm.find_all([bad_pattern])
+        with self.assertRaises(TypeError, msg="bad pattern type"):
+            ibm.find_all([72])
+
+    def test_find_all_contiguous_spans(self):
+        """Test ImageByteMap.find_all across contiguous spans"""
+
+        class ChoppedImageByteMap(ImageByteMap):
+            """Splits every span into pieces of at most two bytes."""
+
+            def spans(self, start=None, stop=None):
+                return [
+                    (address + i, view[i : i + 2])
+                    for address, view in super().spans(start, stop)
+                    for i in range(0, len(view), 2)
+                ]
+
+        byte_map = {0: b"abcabcdabcde", 20: b"cdab"}
+        patterns = ["61 ?? 63", b"bcdab", b"cd", b"abcde", b"e"]
+        ibm = TestImageByteMap._new_ibm(byte_map)
+        chopped = ChoppedImageByteMap(addr_max=40, byte_map=byte_map)
+        self.assertEqual(len(chopped.spans()), 8)
+        self.assertEqual(chopped.find_all(patterns), ibm.find_all(patterns))
+        self.assertEqual(
+            ibm.find_all(patterns),
+            [
+                (0, "61 ?? 63"),
+                (3, "61 ?? 63"),
+                (4, b"bcdab"),
+                (5, b"cd"),
+                (7, "61 ?? 63"),
+                (7, b"abcde"),
+                (9, b"cd"),
+                (11, b"e"),
+                (20, b"cd"),
+            ],
+        )
+
+    def test_snapshot(self):
+        """Test ImageByteMap.snapshot"""
+        ibm = ImageByteMap(
+            addr_max=0x10000,
+            byte_map={0x100: b"\x00" * 0x3000, 0x8000: b"abcd"},
+        )
+        original = {addr: bytes(region) for addr, region in ibm.spans()}
+
+        outer = ibm.snapshot()
+        ibm[0x200:0x204] = b"\xff" * 4
+        del ibm[0x8001:0x8003]
+        ibm.base_address = 0x1000
+        self.assertEqual(outer._pages.keys(), {0x0, 0x8000})
+
+        inner = ibm.snapshot()
+        ibm[0x3000:0x3200] = b"\x01" * 0x200
+        ibm[0x9000] = 7
+        self.assertEqual(inner._pages.keys(), {0x3000, 0x9000})
+        self.assertEqual(outer._pages.keys(), {0x0, 0x3000, 0x8000, 0x9000})
+
+        ibm.restore(inner)
+        self.assertTrue(inner.valid)
+        self.assertEqual(ibm[0x200:0x204], b"\xff" * 4)
+        self.assertNotIn(0x9000, ibm)
+        self.assertEqual(ibm._start_addresses, [0x100, 0x8000, 0x8003])
+        self.assertEqual(ibm.base_address, 0x1000)
+
+        ibm.restore(outer)
+        self.assertFalse(inner.valid)
+        self.assertEqual(
+            {addr: bytes(region) for addr, region in ibm.spans()}, original
+        )
+        self.assertEqual(ibm.base_address, 0)
+        with self.assertRaises(ValueError):
+            ibm.restore(inner)
+
+        # A restored snapshot can be restored again
+        ibm[0x100] = 1
+        ibm.restore(outer)
+        self.assertEqual(ibm[0x100], 0)
+
+        other = ImageByteMap(addr_max=0x10)
+        with self.assertRaises(ValueError):
+            other.restore(outer)
+
+    def test_region_churn(self):
+        """Test ImageByteMap's index of regions under churn"""
+        # Every write and delete creates or removes a one-byte region at
+        # the front of the map, the worst case for a flat sorted list.
+        n = 4000
+        addresses = range(2 * n, 0, -2)
+        ibm = ImageByteMap(addr_max=2 * n)
+        for address in addresses:
+            ibm[address : address + 1] = b"x"
+        index = ibm._start_addresses
+        self.assertEqual(list(index), list(reversed(addresses)))
+        self.assertGreater(len(index._lists), 1)
+        self.assertTrue(all(len(s) <= 2 * index.load for s in index._lists))
+        for address in reversed(addresses):
+            del ibm[address]
+        self.assertEqual(len(index), 0)
+
+    def test_read_words(self):
+        """Test ImageByteMap.read_words"""
+        ibm = TestImageByteMap._new_ibm(
+            {0x10: b"\x01\x00\x02\x00\xff\xff", 0x20: b"\x00\x00\x00\x2a"}
+        )
+        self.assertEqual(
+            list(ibm.read_words([0x14, 0x10, 0x12, 0x10], width=2)),
+            [0xFFFF, 1, 2, 1],
+        )
+        self.assertEqual(
+            list(ibm.read_words([0x14], width=2, signed=True)), [-1]
+        )
+        words = ibm.read_words(iter([0x20, 0x10]), 4, "big")
+        self.assertEqual(words.itemsize, 4)
+        self.assertEqual(list(words), [0x2A, 0x01000200])
+        self.assertEqual(list(ibm.read_words([], width=8)), [])
+        if numpy is not None:
+            addresses = numpy.array([0x12, 0x20], dtype=numpy.int64)
+            self.assertEqual(list(ibm.read_words(addresses, width=1)), [2, 0])
+
+        with self.assertRaises(IndexError):
+            ibm.read_words([0x10, 0x13], width=4)
+        with self.assertRaises(IndexError):
+            ibm.read_words([0x18], width=1)
+        with self.assertRaises(ValueError):
+            ibm.read_words([0x10], width=3)
+
+    def test_find_pointer_runs(self):
+        """Test ImageByteMap.find_pointer_runs"""
+
+        def pointers(*values):
+            return b"".join(v.to_bytes(4, "little") for v in values)
+
+        ibm = ImageByteMap(
+            addr_min=0x1000,
+            addr_max=0x11FF,
+            byte_map={
+                0x1000: pointers(0xFFFFFFFF, 0x1010, 0x1020, 0x1030, 5),
+                0x1014: pointers(0x1008, 6),
+                0x1102: b"\xff" * 2 + pointers(0x1100, 0x1104, 7, 0x2000),
+            },
+        )
+        self.assertEqual(
+            ibm.find_pointer_runs(width=4), [(0x1004, 3), (0x1104, 2)]
+        )
+        self.assertEqual(
+            ibm.find_pointer_runs(width=4, min_length=1),
+            [(0x1004, 3), (0x1014, 1), (0x1104, 2)],
+        )
+        self.assertEqual(
+            ibm.find_pointer_runs(width=4, targets=[6, 7, 0x2000]),
+            [(0x1004, 3), (0x1014, 2), (0x1104, 4)],
+        )
+        self.assertEqual(
+            ibm.find_pointer_runs(0x1008, 0x1108, width=4, min_length=1),
+            [(0x1008, 2), (0x1014, 1), (0x1104, 1)],
+        )
+        self.assertEqual(ibm.find_pointer_runs(width=4, byteorder="big"), [])
+
+    def test_diff(self):
+        """Test ImageByteMap.diff"""
+        Change = ImageByteMap.Change
+        before = TestImageByteMap._new_ibm(
+            {0: b"\x00" * 0x20000, 0x30000: b"abcd", 0x30010: b"efgh"},
+            addr_max=0x30100,
+        )
+        after = TestImageByteMap._new_ibm(
+            {0: bytearray(0x20000), 0x30000: b"abXd", 0x30008: b"ijkl"},
+            addr_max=0x30100,
+        )
+        self.assertEqual(before.diff(before), [])
+        after[0x10] = 1
+        after[0x11] = 1
+        after[0x1FFFF] = 1
+        self.assertEqual(
+            before.diff(after),
+            [
+                (0x10, 0x12, Change.Changed),
+                (0x1FFFF, 0x20000, Change.Changed),
+                (0x30002, 0x30003, Change.Changed),
+                (0x30008, 0x3000C, Change.Added),
+                (0x30010, 0x30014, Change.Removed),
+            ],
+        )
+        self.assertEqual(
+            after.diff(before)[-2:],
+            [
+                (0x30008, 0x3000C, Change.Removed),
+                (0x30010, 0x30014, Change.Added),
+            ],
+        )
+
+    def test_content_hash(self):
+        """Test ImageByteMap.content_hash"""
+        ibm = ImageByteMap(
+            addr_max=0x100000, byte_map={0x1000: bytes(range(256)) * 64}
+        )
+        copy = ImageByteMap(
+            addr_max=0x100000,
+            byte_map={0x1000: bytearray(ibm.view(0x1000, 0x5000))},
+        )
+        whole = ibm.content_hash()
+        self.assertEqual(len(whole), 32)
+        self.assertEqual(copy.content_hash(), whole)
+        self.assertEqual(ibm.content_hash(0, 0x100000), whole)
+        part = ibm.content_hash(0x1800, 0x4123)
+        self.assertNotEqual(part, whole)
+
+        # Changes outside a range leave its hash unchanged
+        ibm[0x4200] = 0xAA
+        self.assertNotEqual(ibm.content_hash(), whole)
+        self.assertEqual(ibm.content_hash(0x1800, 0x4123), part)
+        del ibm[0x4200]
+        self.assertNotEqual(ibm.content_hash(), whole)
+        ibm[0x4200] = 0x00
+        self.assertEqual(ibm.content_hash(), whole)
+
+        # Hashes cover addresses, not just the bytes themselves
+        moved = ImageByteMap(
+            addr_max=0x100000, byte_map={0x1001: bytes(range(256)) * 64}
+        )
+        self.assertNotEqual(moved.content_hash(0, 0x100000), whole)
+        self.assertNotEqual(
+            ImageByteMap().content_hash(0, 0x10),
+            ImageByteMap(byte_map={0: b"\x00"}).content_hash(0, 0x10),
+        )
+
+    def test_compact_regions(self):
+        """Test that pages of repeated bytes are shared"""
+        page = 0x10000
+        data = b"\x90" * 0x10 + bytes(4 * page) + b"\xcc" * page + b"end"
+        ibm = ImageByteMap(addr_max=0x1000000, byte_map={0x10000: data})
+        self.assertIs(ibm._byte_map[0x10000], data)
+        self.assertEqual(len(ibm), len(data))
+        self.assertEqual(ibm[0x10000:0x10012], b"\x90" * 0x10 + b"\x00\x00")
+        self.assertEqual(ibm[0x20010 - 2 : 0x20010 + 2], bytes(4))
+        self.assertEqual(ibm[0x50010], 0xCC)
+        self.assertEqual(bytes(ibm.view(0x60010, 0x60013)), b"end")
+        self.assertEqual(b"".join(v for _, v in ibm.spans()), data)
+        self.assertEqual(ibm.reader(0x6000E).read(), b"\xcc\xccend")
+
+        # Writes page the region without copying it, and copy only the
+        # pages they modify
+        ibm[0x30000] = 1
+        ibm[0x40000:0x40002] = b"\x02\x03"
+        region = ibm._byte_map[0x10000]
+        self.assertEqual(region[:0x10], b"\x90" * 0x10)
+        self.assertEqual(
+            sum(isinstance(p, bytearray) for p in region._pages), 2
+        )
+        self.assertIs(region._pages[0].obj, data)
+        self.assertIsInstance(region._pages[1], bytes)
+        self.assertEqual(ibm[0x2FFFF:0x30001], b"\x00\x01")
+        self.assertEqual(ibm[0x40000:0x40003], b"\x02\x03\x00")
+        self.assertEqual(ibm.reader(0x3FFFF).read_u32(), 0x030200)
+
+        # Splitting and joining regions keeps pages shared
+        del ibm[0x30010:0x30020]
+        self.assertEqual(ibm._start_addresses, [0x10000, 0x30020])
+        self.assertEqual(ibm[0x30020:0x30022], b"\x00\x00")
+        ibm[0x30010:0x30020] = bytes(0x10)
+        self.assertEqual(ibm._start_addresses, [0x10000])
+        self.assertIs(ibm._byte_map[0x10000]._pages[1], region._pages[1])
+        self.assertEqual(
+            ibm.content_hash(),
+            ImageByteMap(
+                addr_max=0x1000000,
+                byte_map={0x10000: bytes(ibm[0x10000:0x60013])},
+            ).content_hash(),
+        )
+
+        # Encoding expands the region, and decoding keeps it as decoded
+        copy = ImageByteMap._decode_protobuf(ibm._to_protobuf(), ibm.uuid)
+        self.assertTrue(copy.deep_eq(ibm))
+        self.assertEqual(copy._to_protobuf(), ibm._to_protobuf())
+        self.assertIsInstance(copy._byte_map[0x10000], bytes)
+
+        # Compacting copies the other pages, so the buffer can be freed
+        copy.compact()
+        pages = copy._byte_map[0x10000]._pages
+        self.assertIs(pages[1], region._pages[1])
+        self.assertTrue(all(len(p) == len(memoryview(p).obj) for p in pages))
+        self.assertTrue(copy.deep_eq(ibm))
+        ibm.compact()
+        self.assertNotIn(
+            data, [memoryview(p).obj for p in ibm._byte_map[0x10000]._pages]
+        )
+        self.assertTrue(copy.deep_eq(ibm))
+
+        # Regions without repeated pages are unchanged
+        data = bytes(range(256)) * 0x200
+        ibm = ImageByteMap(addr_max=0x100000, byte_map={0: data})
+        ibm.compact()
+        self.assertIs(ibm._byte_map[0], data)
+
+    def test_paged_region_delitem(self):
+        """Test deleting from the middle of a paged region"""
+        data = bytes(range(256)) * (_PAGE_SIZE * 3 // 256)
+        region = _PagedRegion([memoryview(data)])
+        expected = bytearray(data)
+        for index in (10, _PAGE_SIZE + 10):
+            region[index] = expected[index] = 0xFF
+        self.assertIsInstance(region._pages[0], bytearray)
+
+        # Within a modified page, and from a modified page to the next
+        for key in (slice(5, 20), slice(_PAGE_SIZE + 7, _PAGE_SIZE * 2 + 3)):
+            del region[key]
+            del expected[key]
+            self.assertEqual(len(region), len(expected))
+            self.assertEqual(bytes(region), bytes(expected))
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_statistics(self):
+        """Test ImageByteMap.statistics"""
+        ibm = ImageByteMap(
+            addr_max=0x10000,
+            byte_map={
+                0x1000: b"AB" * 0x100,
+                0x1200: bytes(range(256)),
+                0x2010: bytes(0x10),
+            },
+        )
+        stats = ibm.statistics()
+        self.assertEqual(stats.address, 0x1000)
+        self.assertEqual(stats.size, 0x310)
+        self.assertEqual(stats.histogram[ord("A")], 0x101)
+        self.assertEqual(stats.histogram[0], 0x11)
+        self.assertIsNone(stats.window)
+        self.assertEqual(len(stats.window_addresses), 0)
+
+        self.assertEqual(ibm.statistics(0x1000, 0x1200).entropy, 1.0)
+        self.assertEqual(ibm.statistics(0x1000, 0x1200).printable_ratio, 1)
+        self.assertEqual(ibm.statistics(0x1200, 0x1300).entropy, 8.0)
+        self.assertEqual(ibm.statistics(0x2010, 0x2020).entropy, 0.0)
+        self.assertEqual(ibm.statistics(0x3000).size, 0)
+
+        # Windows without mapped bytes are skipped, and windows are
+        # counted across the boundaries of regions
+        stats = ibm.statistics(0x1100, window=0x200)
+        self.assertEqual(stats.window_addresses.tolist(), [0x1100, 0x1F00])
+        self.assertEqual(stats.window_sizes.tolist(), [0x200, 0x10])
+        self.assertEqual(stats.histogram.sum(), 0x210)
+        self.assertAlmostEqual(
+            stats.window_entropy[0], ibm.statistics(0x1100, 0x1300).entropy
+        )
+        self.assertEqual(stats.window_entropy[1], 0.0)
+        self.assertEqual(stats.window_printable[1], 0.0)
+        with self.assertRaises(ValueError):
+            ibm.statistics(window=0)
+
+        # Small windows are counted in shorter batches, whose windows
+        # are continued by the next batch
+        ibm = ImageByteMap(
+            addr_max=0x10000, byte_map={0x4000: bytes(range(256)) * 0x10}
+        )
+        stats = ibm.statistics(window=1)
+        self.assertEqual(
+            stats.window_addresses.tolist(), list(range(0x4000, 0x5000))
+        )
+        self.assertEqual(stats.window_sizes.tolist(), [1] * 0x1000)
+        self.assertEqual(stats.window_entropy.tolist(), [0.0] * 0x1000)
+        stats = ibm.statistics(0x3FFF, window=3)
+        self.assertEqual(stats.window_sizes.sum(), 0x1000)
+        for address, entropy in zip(
+            stats.window_addresses.tolist(), stats.window_entropy.tolist()
+        ):
+            self.assertAlmostEqual(
+                entropy, ibm.statistics(address, address + 3).entropy
+            )
+
+    def test_strings(self):
+        """Test ImageByteMap.strings"""
+        ibm = ImageByteMap(
+            addr_max=0x100000,
+            byte_map={
+                0x1000: b"\x00hello\x00ab\x00\tworld\n\xff",
+                0x2000: b"w\x00i\x00d\x00e\x00\x00\x00",
+                0x3000: b"x" * 0x30000 + b"tail\x00",
+            },
+        )
+        self.assertEqual(
+            list(ibm.strings(encodings=["ascii"]))[:2],
+            [(0x1001, "ascii", "hello"), (0x100A, "ascii", "\tworld")],
+        )
+        self.assertEqual(
+            list(ibm.strings(0x1000, 0x3000, min_length=2)),
+            [
+                (0x1001, "ascii", "hello"),
+                (0x1007, "ascii", "ab"),
+                (0x100A, "ascii", "\tworld"),
+                (0x2000, "utf-16le", "wide"),
+            ],
+        )
+        self.assertEqual(
+            list(ibm.strings(0x1003, 0x1005, min_length=2)),
+            [(0x1003, "ascii", "ll")],
+        )
+
+        # Strings continuing across the pages of a region are found whole
+        ibm[0x3000:0x33000] = bytes(0x30000)
+        ibm[0x12FF0:0x13010] = b"y" * 0x20
+        self.assertEqual(
+            list(ibm.strings(0x3000)),
+            [(0x12FF0, "ascii", "y" * 0x20), (0x33000, "ascii", "tail")],
+        )
+        with self.assertRaises(ValueError):
+            list(ibm.strings(encodings=["utf-8"]))
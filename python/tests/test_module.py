@@ -0,0 +1,266 @@
+import copy
+import pickle
+import unittest
+
+from gtirb import (
+    Block,
+    DataObject,
+    ImageByteMap,
+    Module,
+    ProxyBlock,
+    Section,
+    SymAddrConst,
+    Symbol,
+)
+from gtirb.util import ObservedAttribute
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ModuleTest(unittest.TestCase):
+    def test_address_index(self):
+        first = Block(0x1000, 0x10)
+        inner = Block(0x1004, 0x4)
+        empty = Block(0x1010, 0)
+        last = Block(0x1010, 0x8)
+        module = Module(
+            blocks=[last, inner, empty, first],
+            data=[DataObject(0x2000, 8)],
+            sections=[Section(".text", 0x1000, 0x18)],
+        )
+        # Nodes are only observed once their module's index is queried
+        self.assertEqual(ObservedAttribute.observers(first), [])
+        self.assertEqual(module.blocks_on(0x1005), [first, inner])
+        self.assertEqual(module.blocks_on(0x1008, 0x1011), [first, last])
+        self.assertEqual(module.blocks_at(0x1010), [empty, last])
+        self.assertEqual(module.blocks_at(0x1001, 0x1010), [inner])
+        self.assertEqual(module.blocks_on(0x1018), [])
+        self.assertEqual(module.data_on(0x2007), list(module.data))
+        self.assertEqual(module.data_at(0x2004), [])
+        self.assertEqual(module.sections_on(0x1017), list(module.sections))
+        self.assertEqual(module.sections_at(0x1000), list(module.sections))
+
+        # Changes after the index is built are reflected in queries
+        module.blocks.remove(inner)
+        self.assertEqual(ObservedAttribute.observers(inner), [])
+        added = Block(0x1006, 2)
+        module.blocks.add(added)
+        first.size = 4
+        last.address = 0x1002
+        self.assertEqual(module.blocks_on(0x1007), [last, added])
+        self.assertEqual(
+            module.blocks_at(0x1000, 0x1010), [first, last, added]
+        )
+        inner.address = 0x1005
+        self.assertEqual(module.blocks_at(0x1005), [])
+
+        # Copies of indexed nodes are not indexed, and can be pickled
+        for clone in (copy.copy(last), pickle.loads(pickle.dumps(last))):
+            clone.address = 0x1008
+        self.assertEqual(module.blocks_at(0x1008), [])
+        self.assertEqual(module.blocks_at(0x1002), [last])
+
+        # Assigning a new set of blocks replaces the index
+        module.blocks = {inner}
+        self.assertEqual(module.blocks_on(0x1005), [inner])
+        module.blocks.clear()
+        self.assertEqual(module.blocks_on(0x1005), [])
+
+    def test_find_pointer_runs(self):
+        def pointers(*values):
+            return b"".join(v.to_bytes(8, "little") for v in values)
+
+        ibm = ImageByteMap(
+            addr_min=0x1000,
+            addr_max=0x2FFF,
+            byte_map={
+                0x1000: b"\x90" * 0x10,
+                0x2000: pointers(0x1000, 0x1008, 0x10, 0x3000, 0x1010),
+            },
+        )
+        module = Module(
+            blocks=[Block(0x1000, 8), Block(0x1008, 8), Block(0x3000, 8)],
+            image_byte_map=ibm,
+            isa_id=Module.ISAID.X64,
+            sections=[
+                Section(".text", 0x1000, 0x10),
+                Section(".rodata", 0x2000, 0x28),
+            ],
+        )
+        self.assertEqual(
+            module.find_pointer_runs(), [(0x2000, 2), (0x2018, 2)]
+        )
+        rodata = [s for s in module.sections if s.name == ".rodata"]
+        self.assertEqual(module.find_pointer_runs(rodata, min_length=3), [])
+        self.assertEqual(
+            module.find_pointer_runs(rodata, width=4, min_length=1),
+            [(0x2000, 1), (0x2008, 1), (0x2018, 1), (0x2020, 1)],
+        )
+        with self.assertRaises(ValueError):
+            Module().find_pointer_runs()
+
+    def test_section_hash(self):
+        text = Section(".text", 0x1000, 0x10)
+        data = Section(".data", 0x1010, 0x10)
+        module = Module(
+            image_byte_map=ImageByteMap(
+                addr_max=0x2000, byte_map={0x1000: b"\x90" * 0x20}
+            ),
+            sections=[text, data],
+        )
+        text_hash = module.section_hash(text)
+        data_hash = module.section_hash(data)
+        self.assertNotEqual(text_hash, data_hash)
+        module.image_byte_map[0x1010] = 0xC3
+        self.assertEqual(module.section_hash(text), text_hash)
+        self.assertNotEqual(module.section_hash(data), data_hash)
+
+    def test_strings(self):
+        module = Module(
+            image_byte_map=ImageByteMap(
+                addr_max=0x2000,
+                byte_map={0x1000: b"text\0data\0", 0x1800: b"o\0u\0t\0"},
+            ),
+            sections=[
+                Section(".rodata", 0x1005, 0x6),
+                Section(".text", 0x1000, 0x5),
+            ],
+        )
+        self.assertEqual(
+            list(module.strings()),
+            [(0x1000, "ascii", "text"), (0x1005, "ascii", "data")],
+        )
+        self.assertEqual(list(module.strings(min_length=5)), [])
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_symbol_index(self):
+        main, data, proxy = (
+            Block(0x1000, 8),
+            DataObject(0x2000, 8),
+            ProxyBlock(),
+        )
+        strcpy = Symbol("strcpy", payload=proxy)
+        strncpy = Symbol("strncpy", payload=0x3000)
+        start = Symbol("main", payload=main)
+        alias = Symbol("main_alias", payload=main)
+        table = Symbol("table", payload=data)
+        module = Module(
+            blocks=[main],
+            data=[data],
+            proxies=[proxy],
+            symbols=[strcpy, strncpy, start, alias, table],
+        )
+        self.assertEqual(ObservedAttribute.observers(start), [])
+        self.assertEqual(module.symbols_named("main"), {start})
+        self.assertEqual(module.symbols_named("printf"), set())
+        self.assertEqual(module.symbols_referring_to(main), {start, alias})
+        self.assertEqual(module.symbols_referring_to(proxy), {strcpy})
+        self.assertEqual(module.symbols_at(0x1000), {start, alias})
+        self.assertEqual(module.symbols_at(0x2000), {table})
+        self.assertEqual(module.symbols_at(0x3000), {strncpy})
+        self.assertEqual(
+            list(module.symbols_matching("str*")), [strcpy, strncpy]
+        )
+        self.assertEqual(list(module.symbols_matching("str?cpy")), [strncpy])
+        self.assertEqual(
+            set(module.symbols_matching("*a*")), {start, alias, table}
+        )
+        self.assertEqual(list(module.symbols_matching("main")), [start])
+
+        # Changes after the index is built are reflected in queries
+        alias.name = "main"
+        self.assertEqual(module.symbols_named("main"), {start, alias})
+        self.assertEqual(list(module.symbols_matching("main_*")), [])
+        strcpy.referent = main
+        strncpy.value = 0x1000
+        self.assertEqual(module.symbols_referring_to(proxy), set())
+        self.assertEqual(
+            module.symbols_at(0x1000), {start, alias, strcpy, strncpy}
+        )
+        self.assertEqual(module.symbols_at(0x3000), set())
+        main.address = 0x4000
+        self.assertEqual(module.symbols_at(0x4000), {start, alias, strcpy})
+        module.symbols.discard(start)
+        self.assertEqual(ObservedAttribute.observers(start), [])
+        module.symbols.add(Symbol("main"))
+        self.assertEqual(len(module.symbols_named("main")), 2)
+        self.assertNotIn(start, module.symbols_named("main"))
+        start.name = "other"
+        self.assertEqual(module.symbols_named("other"), set())
+
+        # Copies of indexed symbols are not indexed, and can be pickled
+        alias.name = "alias"
+        for clone in (copy.copy(alias), pickle.loads(pickle.dumps(alias))):
+            clone.name = "clone"
+        self.assertEqual(module.symbols_named("clone"), set())
+        self.assertEqual(module.symbols_named("alias"), {alias})
+
+        # Assigning a new set of symbols replaces the index
+        module.symbols = {start}
+        self.assertEqual(module.symbols_named("other"), {start})
+        self.assertEqual(module.symbols_named("main"), set())
+
+    def test_symbolic_operand_index(self):
+        first, second = Block(0x1000, 8), Block(0x1008, 8)
+        operands = {
+            address: SymAddrConst(0, Symbol(hex(address)))
+            for address in (0x1002, 0x1006, 0x1008, 0x100A, 0x2000)
+        }
+        module = Module(blocks=[first, second], symbolic_operands=operands)
+        self.assertEqual(
+            module.symbolic_operands_in(0x1004, 0x100A),
+            [(a, operands[a]) for a in (0x1006, 0x1008)],
+        )
+        self.assertEqual(
+            [a for a, _ in module.symbolic_operands_of(first)],
+            [0x1002, 0x1006],
+        )
+        self.assertEqual(module.symbolic_operands_in(0x1010, 0x1010), [])
+
+        # Changes after the index is built are reflected in queries
+        del module.symbolic_operands[0x1006]
+        module.symbolic_operands[0x1004] = operands[0x1006]
+        module.symbolic_operands[0x1002] = operands[0x2000]
+        module.symbolic_operands.update({0x1000: operands[0x1002]})
+        self.assertEqual(
+            module.symbolic_operands_of(first),
+            [
+                (0x1000, operands[0x1002]),
+                (0x1002, operands[0x2000]),
+                (0x1004, operands[0x1006]),
+            ],
+        )
+        module.symbolic_operands.pop(0x1008)
+        self.assertEqual(
+            [a for a, _ in module.symbolic_operands_of(second)], [0x100A]
+        )
+
+        # Assigning a new dict replaces the index
+        module.symbolic_operands = {0x100C: operands[0x2000]}
+        self.assertEqual(
+            module.symbolic_operands_of(second), [(0x100C, operands[0x2000])]
+        )
+        self.assertEqual(module.symbolic_operands_of(first), [])
+
+    def test_section_statistics(self):
+        text = Section(".text", 0x1000, 0x100)
+        module = Module(
+            image_byte_map=ImageByteMap(
+                addr_max=0x2000,
+                byte_map={0x1000: bytes(range(256)) + b"\0" * 0x10},
+            ),
+            sections=[text],
+        )
+        stats = module.section_statistics(text, window=0x80)
+        self.assertEqual(stats.size, 0x100)
+        self.assertEqual(stats.entropy, 8.0)
+        self.assertEqual(stats.window_addresses.tolist(), [0x1000, 0x1080])
+        self.assertEqual(stats.window_entropy.tolist(), [7.0, 7.0])
+        self.assertEqual(stats.window_printable.tolist(), [100 / 128, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import copy
+import pickle
+import random
+import unittest
+
+from gtirb.util import (
+    ObservedAttribute,
+    ObservedDict,
+    ObservedSet,
+    SortedList,
+)
+
+
+class Point:
+    x = ObservedAttribute("x")
+
+    def __init__(self, x):
+        self.x = x
+
+
+class Recorder:
+    def __init__(self):
+        self.changes = []
+
+    def attribute_changed(self, instance, name, old_value):
+        self.changes.append((instance, name, old_value))
+
+
+class ObservedAttributeTest(unittest.TestCase):
+    def test_observers(self):
+        first, second = Point(1), Point(2)
+        recorder = Recorder()
+        ObservedAttribute.observe(first, recorder)
+        first.x = 3
+        first.x = 3
+        second.x = 4
+        self.assertEqual(recorder.changes, [(first, "x", 1)])
+        self.assertEqual((first.x, second.x), (3, 4))
+        self.assertEqual(vars(second), {"x": 4})
+
+        ObservedAttribute.unobserve(first, recorder)
+        first.x = 5
+        self.assertEqual(len(recorder.changes), 1)
+        self.assertEqual(vars(first), {"x": 5})
+
+        # Observers are weakly referenced
+        ObservedAttribute.observe(second, Recorder())
+        second.x = 6
+        self.assertEqual(ObservedAttribute.observers(second), [])
+
+        # Registrations are neither copied nor pickled with instances
+        ObservedAttribute.observe(first, recorder)
+        self.assertEqual(ObservedAttribute.observers(first), [recorder])
+        for clone in (copy.copy(first), pickle.loads(pickle.dumps(first))):
+            self.assertEqual(vars(clone), {"x": 5})
+            self.assertEqual(ObservedAttribute.observers(clone), [])
+            clone.x = 7
+        self.assertEqual(len(recorder.changes), 1)
+
+
+class ObservedDictTest(unittest.TestCase):
+    def test_changes(self):
+        changes = []
+        items = ObservedDict(
+            {1: "a"}, on_change=lambda *change: changes.append(change)
+        )
+        items[1] = "b"
+        items[2] = "c"
+        items.update({2: "d", 3: "e"})
+        items.setdefault(3, "f")
+        items.setdefault(4, "g")
+        del items[1]
+        items.pop(5, None)
+        items.pop(2)
+        items.clear()
+        self.assertEqual(items, {})
+        self.assertEqual(
+            [(set(added), set(removed)) for added, removed in changes],
+            [
+                ({2}, set()),
+                ({3}, set()),
+                ({4}, set()),
+                (set(), {1}),
+                (set(), {2}),
+                (set(), {3, 4}),
+            ],
+        )
+        self.assertEqual(repr(ObservedDict({1: 2})), repr({1: 2}))
+
+
+class ObservedSetTest(unittest.TestCase):
+    def test_changes(self):
+        changes = []
+        values = ObservedSet(
+            [1, 2], on_change=lambda *change: changes.append(change)
+        )
+        values.add(2)
+        values.add(3)
+        values.update([3, 4])
+        values.discard(5)
+        values -= {1, 5}
+        values ^= {4, 6}
+        values.intersection_update([2, 6, 7])
+        self.assertEqual(values, {2, 6})
+        self.assertEqual(
+            [(set(added), set(removed)) for added, removed in changes],
+            [
+                ({3}, set()),
+                ({4}, set()),
+                (set(), {1}),
+                ({6}, {4}),
+                (set(), {3}),
+            ],
+        )
+        self.assertEqual(repr(values), repr({2, 6}))
+
+
+class SmallSortedList(SortedList):
+    """Splits into many sublists even when holding few values."""
+
+    load = 4
+
+
+class SortedListTest(unittest.TestCase):
+    def test_operations(self):
+        rng = random.Random(0)
+        values = SmallSortedList([5, 3, 3, 9])
+        expected = [3, 5, 9]
+        self.assertEqual(values, expected)
+        for _ in range(2000):
+            value = rng.randrange(100)
+            if rng.random() < 0.5:
+                values.add(value)
+                if value not in expected:
+                    expected.append(value)
+                    expected.sort()
+            elif value in expected:
+                values.remove(value)
+                expected.remove(value)
+            else:
+                with self.assertRaises(ValueError):
+                    values.remove(value)
+            self.assertEqual(values, expected)
+            self.assertEqual(len(values), len(expected))
+            self.assertEqual(value in values, value in expected)
+            below = [v for v in expected if v <= value]
+            self.assertEqual(values.floor(value), max(below, default=None))
+            self.assertEqual(
+                list(values.irange(value, value + 10)),
+                [v for v in expected if value <= v <= value + 10],
+            )
+        self.assertEqual(list(values.irange()), expected)
+        self.assertTrue(all(values._lists))
+
+    def test_structure(self):
+        values = SmallSortedList()
+        load = values.load
+
+        def check():
+            lists = values._lists
+            self.assertEqual(values._maxes, [s[-1] for s in lists])
+            self.assertEqual(sum(map(len, lists)), len(values))
+            self.assertTrue(all(0 < len(s) <= 2 * load for s in lists))
+
+        # Inserting and removing at the front is the worst case for a flat
+        # list, where every update moves every other value. Sublists stay
+        # within their bounds, so updates only move the values of one.
+        n = 50 * load
+        for value in range(n, 0, -1):
+            values.add(value)
+            check()
+        self.assertGreaterEqual(len(values._lists), n // (2 * load))
+        for value in range(1, n + 1, 2):
+            values.remove(value)
+            check()
+        self.assertEqual(list(values), list(range(2, n + 1, 2)))
+        for value in range(2, n + 1, 2):
+            values.remove(value)
+            check()
+        self.assertEqual(values._lists, [])
+
+
+if __name__ == "__main__":
+    unittest.main()